@@ -4,12 +4,15 @@ from sqlalchemy import pool
 from alembic import context
 
 # ✅ MODELLERİNİ EKLE
-from app.database.database import Base
+from app.database.database import Base, SQLALCHEMY_DATABASE_URL
 from app.models import *
 
 # 🔧 Alembic config nesnesi
 config = context.config
 
+# 🔗 Uygulamayla aynı veritabanı (DATABASE_URL); alembic.ini'deki url yalnızca yedek
+config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL.replace("%", "%%"))
+
 # 📜 Logging ayarı
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
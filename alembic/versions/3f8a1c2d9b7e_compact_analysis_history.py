@@ -0,0 +1,217 @@
+"""compact analysis history storage
+
+Revision ID: 3f8a1c2d9b7e
+Revises: 52950fbd576b
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import json
+import zlib
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a1c2d9b7e'
+down_revision: Union[str, None] = '52950fbd576b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH = 5000
+
+# --- Bu revizyondaki history codec'in dondurulmuş kopyası ---
+# app.services.history_codec sonradan değişse de bu göç aynı satırları üretir.
+
+JSON_ZLIB = 1
+
+INDICATOR_BITS = [
+    "sma", "ema", "rsi", "macd", "z_score", "bollinger",
+    "cci", "adx", "stochastic", "williams", "obv", "atr",
+]
+
+LATEST_COLUMNS = [
+    "close", "sma", "ema", "rsi", "macd", "macd_signal",
+    "z_score", "bollinger_upper", "bollinger_lower",
+]
+
+
+def _encode_indicators(indicators: list) -> int:
+    mask = 0
+    for name in indicators:
+        if name in INDICATOR_BITS:
+            mask |= 1 << INDICATOR_BITS.index(name)
+    return mask
+
+
+def _decode_indicators(mask: Optional[int]) -> list:
+    return [name for i, name in enumerate(INDICATOR_BITS) if mask and mask & (1 << i)]
+
+
+def _pack(obj) -> bytes:
+    return bytes([JSON_ZLIB]) + zlib.compress(json.dumps(obj, separators=(",", ":")).encode())
+
+
+def _unpack(blob: Optional[bytes]):
+    if not blob:
+        return {}
+    if blob[0] != JSON_ZLIB:
+        raise ValueError(f"Unknown history payload format: {blob[0]}")
+    return json.loads(zlib.decompress(blob[1:]))
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+DECISION_TYPES = {"signal": lambda v: isinstance(v, str), "confidence": _is_number}
+LATEST_TYPES = {column: _is_number for column in LATEST_COLUMNS}
+
+
+def _split(part, types: dict):
+    # (tipli alanlar, geri kalanı); sütun tipine uymayan değerler blob'da kalır
+    if not isinstance(part, dict):
+        return {}, part
+    typed = {k: v for k, v in part.items() if k in types and types[k](v)}
+    rest = {k: v for k, v in part.items() if k not in typed}
+    return typed, rest
+
+
+def _decision(signal, confidence, rest: dict) -> dict:
+    decision = {"signal": signal}
+    if confidence is not None:
+        decision["confidence"] = confidence
+    return {**decision, **rest}
+
+
+def _encode_result(symbol: str, result: dict) -> dict:
+    latest, latest_rest = _split(result.get("latest", {}), LATEST_TYPES)
+    decision, decision_rest = _split(result.get("final_decision", {}), DECISION_TYPES)
+    ai, ai_rest = _split(result.get("ai"), DECISION_TYPES)
+    # Karar sütunu boşsa güven de blob'da tutulur (tek başına okunamaz)
+    if "signal" not in decision:
+        decision, decision_rest = {}, result.get("final_decision", {})
+    if "signal" not in ai:
+        ai, ai_rest = {}, result.get("ai")
+
+    rest = {k: v for k, v in result.items() if k not in ("symbol", "latest", "final_decision", "ai")}
+    if result.get("symbol") != symbol:
+        rest["symbol"] = result.get("symbol")
+    if latest_rest:
+        rest["latest"] = latest_rest
+    if "final_decision" in result and (decision_rest or not decision):
+        rest["final_decision"] = decision_rest
+    if "ai" in result and (ai_rest or not ai):
+        rest["ai"] = ai_rest
+
+    return {
+        **{column: latest.get(column) for column in LATEST_COLUMNS},
+        "decision": decision.get("signal"),
+        "confidence": decision.get("confidence"),
+        "ai_decision": ai.get("signal"),
+        "ai_confidence": ai.get("confidence"),
+        "payload": _pack(rest) if rest else None,
+    }
+
+
+def _decode_latest(row) -> dict:
+    latest = {}
+    for column in LATEST_COLUMNS:
+        value = getattr(row, column)
+        if value is not None:
+            latest[column] = value
+    return latest
+
+
+def _decode_result(row) -> dict:
+    rest = _unpack(row.payload)
+    result = {"symbol": rest.pop("symbol", row.symbol)}
+    result["latest"] = {**_decode_latest(row), **rest.pop("latest", {})}
+    for key, value in rest.items():
+        if key not in ("final_decision", "ai"):
+            result[key] = value
+
+    if row.decision is not None:
+        result["final_decision"] = _decision(row.decision, row.confidence, rest.get("final_decision", {}))
+    elif "final_decision" in rest:
+        result["final_decision"] = rest["final_decision"]
+
+    if row.ai_decision is not None:
+        result["ai"] = _decision(row.ai_decision, row.ai_confidence, rest.get("ai", {}))
+    elif "ai" in rest:
+        result["ai"] = rest["ai"]
+    return result
+
+# --- Göç ---
+
+TYPED_COLUMNS = [
+    sa.Column('indicators_mask', sa.Integer(), nullable=True),
+    sa.Column('decision', sa.String(), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=True),
+    sa.Column('ai_decision', sa.String(), nullable=True),
+    sa.Column('ai_confidence', sa.Float(), nullable=True),
+    *[sa.Column(name, sa.Float(), nullable=True) for name in LATEST_COLUMNS],
+    sa.Column('payload', sa.LargeBinary(), nullable=True),
+]
+
+
+def _table(*columns):
+    return sa.table('analysis_history', sa.column('id', sa.Integer()), *[sa.column(c.name, c.type) for c in columns])
+
+
+def _batches(bind, select):
+    # id sırasıyla parça parça okunur; büyük tablolar belleğe tek seferde alınmaz
+    last_id = 0
+    while True:
+        rows = bind.execute(select.where(sa.column('id') > last_id).order_by(sa.column('id')).limit(BATCH)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('analysis_history') as batch_op:
+        for column in TYPED_COLUMNS:
+            batch_op.add_column(column.copy())
+
+    bind = op.get_bind()
+    new = _table(*TYPED_COLUMNS)
+    update = new.update().where(new.c.id == sa.bindparam('_id'))
+    select = sa.select(sa.column('id'), sa.column('symbol'), sa.column('indicators'), sa.column('result')).select_from(sa.table('analysis_history'))
+    for rows in _batches(bind, select):
+        values = []
+        for r in rows:
+            result = json.loads(r.result) if r.result else {}
+            indicators = r.indicators.split(",") if r.indicators else []
+            values.append({'_id': r.id, 'indicators_mask': _encode_indicators(indicators), **_encode_result(r.symbol, result)})
+        bind.execute(update, values)
+
+    with op.batch_alter_table('analysis_history') as batch_op:
+        batch_op.drop_column('result')
+        batch_op.drop_column('indicators')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('analysis_history') as batch_op:
+        batch_op.add_column(sa.Column('indicators', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('result', sa.String(), nullable=True))
+
+    bind = op.get_bind()
+    old = _table(sa.Column('indicators', sa.String()), sa.Column('result', sa.String()))
+    update = old.update().where(old.c.id == sa.bindparam('_id'))
+    select = sa.select(
+        sa.column('id'), sa.column('symbol'), *[sa.column(c.name) for c in TYPED_COLUMNS]
+    ).select_from(sa.table('analysis_history'))
+    for rows in _batches(bind, select):
+        bind.execute(update, [
+            {'_id': r.id, 'indicators': ",".join(_decode_indicators(r.indicators_mask)), 'result': json.dumps(_decode_result(r))}
+            for r in rows
+        ])
+
+    with op.batch_alter_table('analysis_history') as batch_op:
+        for column in reversed(TYPED_COLUMNS):
+            batch_op.drop_column(column.name)
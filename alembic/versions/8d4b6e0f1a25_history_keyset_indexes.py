@@ -0,0 +1,40 @@
+"""history keyset indexes
+
+Revision ID: 8d4b6e0f1a25
+Revises: 3f8a1c2d9b7e
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4b6e0f1a25'
+down_revision: Union[str, None] = '3f8a1c2d9b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sembol filtresi birebir eşleşme ile indeksi kullanır
+    op.execute("UPDATE analysis_history SET symbol = upper(symbol) WHERE symbol != upper(symbol)")
+    if op.get_bind().dialect.name == 'sqlite':
+        # CURRENT_TIMESTAMP ile yazılmış eski kayıtlar uygulamanın biçimine (mikrosaniyeli) getirilir;
+        # aksi halde metin karşılaştırmasında cursor aynı saniyedeki kaydı tekrar döndürür
+        op.execute("UPDATE analysis_history SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+    op.create_index('ix_analysis_history_username_created_at', 'analysis_history', ['username', 'created_at'], unique=False)
+    op.create_index('ix_analysis_history_username_symbol_created_at', 'analysis_history', ['username', 'symbol', 'created_at'], unique=False)
+    # (username, created_at) indeksinin öneki
+    op.drop_index('ix_analysis_history_username', table_name='analysis_history')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_analysis_history_username', 'analysis_history', ['username'], unique=False)
+    op.drop_index('ix_analysis_history_username_symbol_created_at', table_name='analysis_history')
+    op.drop_index('ix_analysis_history_username_created_at', table_name='analysis_history')
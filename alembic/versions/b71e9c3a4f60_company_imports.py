@@ -0,0 +1,41 @@
+"""companies table and data import hashes
+
+Revision ID: b71e9c3a4f60
+Revises: 8d4b6e0f1a25
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71e9c3a4f60'
+down_revision: Union[str, None] = '8d4b6e0f1a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # companies daha önce db_setup.py (create_all) ile oluşturuluyordu; mevcutsa dokunulmaz
+    if not sa.inspect(op.get_bind()).has_table('companies'):
+        op.create_table('companies',
+        sa.Column('symbol', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('symbol')
+        )
+    op.create_table('data_imports',
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('content_hash', sa.String(), nullable=False),
+    sa.Column('rows', sa.Integer(), nullable=True),
+    sa.Column('loaded_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('source')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('data_imports')
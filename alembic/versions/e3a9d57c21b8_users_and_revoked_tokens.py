@@ -0,0 +1,54 @@
+"""users and revoked tokens
+
+Revision ID: e3a9d57c21b8
+Revises: b71e9c3a4f60
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9d57c21b8'
+down_revision: Union[str, None] = 'b71e9c3a4f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    users = op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('password_hash', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('revoked_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token_hash', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+
+    # Önceki bellek içi kullanıcılar (app/auth/users.py); özetler önceden hesaplanmış PBKDF2-SHA256
+    op.bulk_insert(users, [
+        {'username': 'admin', 'password_hash': 'pbkdf2_sha256$120000$24f095d1f3425f3cbbbde64f1e1ab313$14cfd6c806176f6bb4b1beaa1e6cde9646bebc33a77e5f813306cd443eae7a66', 'role': 'premium'},
+        {'username': 'demo', 'password_hash': 'pbkdf2_sha256$120000$777e1816633eabde2bd43c354a444e8a$bbeaf91b65aca295b7a34196b810675bf243d3d096f399bf910509e06ba85852', 'role': 'free'},
+        {'username': 'alp', 'password_hash': 'pbkdf2_sha256$120000$5c9565898ad9ef94d0fc8666a30b3ecf$9ff09dca0e302abd2de98a5a30b743411c5faf8b0131f180282a37095302e1be', 'role': 'premium'},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_table('users')
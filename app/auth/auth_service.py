@@ -1,51 +1,91 @@
 # app/auth/auth_service.py
 
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Optional
-import jwt
 
-from app.auth.users import fake_users_db
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
 
-SECRET_KEY = "very-secret-key"
+from app.auth import user_store
+from app.auth.token_cache import RevocationList, TokenCache, token_hash
+from app.config import settings
+from app.services.executors import run_io
+
+SECRET_KEY = settings.jwt_secret_key
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+
+token_cache = TokenCache(max_entries=settings.token_cache_max_entries)
+revocations = RevocationList(sync_interval=settings.token_revocation_sync_seconds)
 
 def authenticate_user(username: str, password: str) -> Optional[dict]:
-    user = fake_users_db.get(username)
-    if not user or user["password"] != password:
-        return None
-    return user
+    return user_store.authenticate(username, password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
-from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends, HTTPException, status
-from jose import JWTError, jwt
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def verify_token(token: str, key: str) -> dict:
+    # İmza/exp kontrolü; sonuç önbelleğe girer
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise InvalidToken()
+    if claims.get("sub") is None or claims.get("role") is None:
+        raise InvalidToken()
+    # Silinmiş kullanıcının token'ı önbelleğe girmez
+    if user_store.get_user(claims["sub"]) is None:
+        raise InvalidToken()
+    token_cache.put(key, claims)
+    return claims
+
+
+def decode_token(token: str) -> dict:
+    # Tüm token doğrulamaları buradan geçer; imza kontrolü token başına bir kez yapılır
+    key = token_hash(token)
+    claims = token_cache.get(key) or verify_token(token, key)
+    if revocations.is_revoked(key):
+        raise InvalidToken()
+    return claims
+
+
+def revoke_token(token: str):
+    key = token_hash(token)
+    claims = decode_token(token)
+    revocations.revoke(key, claims.get("exp"))
+    token_cache.discard(key)
+
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # Önbellekteki token için veritabanına ya da thread'e gidilmez
+    if revocations.due():
+        await run_io(revocations.sync)
+    key = token_hash(token)
+    claims = token_cache.get(key)
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        role: str = payload.get("role")
-        if username is None or role is None:
-            raise credentials_exception
-    except JWTError:
+        if claims is None:
+            claims = await run_io(verify_token, token, key)
+    except InvalidToken:
         raise credentials_exception
-
-    user = fake_users_db.get(username)
-    if user is None:
+    if revocations.is_revoked(key):
         raise credentials_exception
 
-    return {"username": username, "role": role}
+    return {"username": claims["sub"], "role": claims["role"]}
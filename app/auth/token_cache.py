@@ -0,0 +1,124 @@
+# app/auth/token_cache.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.database.database import SessionLocal
+from app.logging_config import get_logger
+from app.models.revoked_token import RevokedToken
+
+logger = get_logger(__name__)
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# Doğrulanmış token'ların claim'leri; anahtar sha256(token), token'ın exp'inde düşer.
+# İmza doğrulaması yalnızca ilk görüşte yapılır.
+class TokenCache:
+    def __init__(self, max_entries: int = 10000, default_ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, key: str, claims: dict):
+        exp = claims.get("exp")
+        expires_at = float(exp) if exp is not None else time.time() + self.default_ttl
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# İptal edilen token'lar: veritabanında (tüm süreçler paylaşır), süreçte bir küme.
+# Kontrol bellekte yapılır; küme en fazla sync_interval saniyede bir yalnızca yeni kayıtlarla güncellenir.
+class RevocationList:
+    def __init__(self, sync_interval: float = 5.0):
+        self.sync_interval = sync_interval
+        self._revoked: dict = {}  # token_hash -> expires_at (epoch)
+        self._last_id = 0
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    def due(self) -> bool:
+        return time.monotonic() - self._last_sync >= self.sync_interval
+
+    def sync(self):
+        with self._lock:
+            if not self.due():
+                return
+            db = SessionLocal()
+            try:
+                rows = db.query(RevokedToken.id, RevokedToken.token_hash, RevokedToken.expires_at)\
+                         .filter(RevokedToken.id > self._last_id)\
+                         .order_by(RevokedToken.id).all()
+            except Exception as e:
+                logger.warning(f"Revocation list sync failed: {e}")
+                rows = []
+            finally:
+                db.close()
+            for row in rows:
+                self._revoked[row.token_hash] = _epoch(row.expires_at)
+                self._last_id = row.id
+            now = time.time()
+            self._revoked = {k: v for k, v in self._revoked.items() if v > now}
+            self._last_sync = time.monotonic()
+
+    def is_revoked(self, key: str) -> bool:
+        return key in self._revoked
+
+    def revoke(self, key: str, expires_at: Optional[float]):
+        expires = datetime.fromtimestamp(expires_at or time.time() + 86400, tz=timezone.utc)
+        db = SessionLocal()
+        try:
+            if not db.query(RevokedToken.id).filter(RevokedToken.token_hash == key).first():
+                db.add(RevokedToken(token_hash=key, expires_at=expires))
+            # Süresi geçmiş kayıtlar artık gerekmez
+            db.query(RevokedToken).filter(RevokedToken.expires_at < datetime.now(timezone.utc)).delete()
+            db.commit()
+        finally:
+            db.close()
+        self._revoked[key] = expires.timestamp()
+
+    def stats(self) -> dict:
+        return {"revoked": len(self._revoked), "last_id": self._last_id}
+
+
+def _epoch(value) -> float:
+    if value is None:
+        return time.time() + 86400
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
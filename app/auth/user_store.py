@@ -0,0 +1,74 @@
+# app/auth/user_store.py
+
+import hashlib
+import hmac
+import os
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.database.database import SessionLocal
+from app.models.user import User
+
+# Kullanıcılar veritabanında (users tablosu); şifreler PBKDF2-SHA256 ile saklanır
+PBKDF2_ITERATIONS = 120_000
+
+
+def hash_password(password: str, iterations: int = PBKDF2_ITERATIONS) -> str:
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    try:
+        algorithm, iterations, salt, expected = encoded.split("$")
+    except ValueError:
+        return False
+    if algorithm != "pbkdf2_sha256":
+        return False
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+def _as_dict(user: User) -> dict:
+    return {"username": user.username, "role": user.role}
+
+
+def get_user(username: str) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+        return _as_dict(user) if user else None
+    finally:
+        db.close()
+
+
+def authenticate(username: str, password: str) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+    finally:
+        db.close()
+    if user is None:
+        # Var olmayan kullanıcıda da aynı süre harcanır
+        verify_password(password, _DUMMY_HASH)
+        return None
+    return _as_dict(user) if verify_password(password, user.password_hash) else None
+
+
+def create_user(username: str, password: str, role: str = "free") -> dict:
+    db = SessionLocal()
+    try:
+        user = User(username=username, password_hash=hash_password(password), role=role)
+        db.add(user)
+        db.commit()
+        return _as_dict(user)
+    except IntegrityError:
+        db.rollback()
+        raise ValueError("User already exists")
+    finally:
+        db.close()
+
+
+_DUMMY_HASH = hash_password("dummy-password")
@@ -1,4 +1,5 @@
 # app/auth/users.py
+# Yalnızca ilk kullanıcıların kaynağı (users tablosu migration ile doldurulur)
 
 fake_users_db = {
     "admin": {
@@ -1,9 +1,96 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     app_name: str = "FinanceProject"
     debug: bool = True
 
+    # Gösterge önbelleği
+    indicator_cache_max_entries: int = 512
+    indicator_cache_max_mb: int = 256
+    indicator_cache_market_ttl: float = 60.0
+
+    # AI modeli: "r" ile numpy dizileri mmap edilir (sıkıştırılmamış joblib dosyası gerekir)
+    model_mmap_mode: Optional[str] = None
+    model_reload_check_seconds: float = 2.0
+    # Toplu tahminde orman ağaçlarının paralel değerlendirilmesi (-1: tüm çekirdekler)
+    model_n_jobs: int = -1
+    ai_batch_max_symbols: int = 500
+
+    # Bloklayan işler için executor'lar; kuyruk dolunca 503 döner
+    io_executor_workers: int = 32
+    io_executor_max_pending: int = 256
+    cpu_executor_workers: int = 0  # 0: çekirdek sayısı
+    cpu_executor_max_pending: int = 64
+    # Bar deposu / sağlayıcı çağrıları; bütçe beklemeleri io executor'ı tıkamasın diye ayrı havuz
+    market_executor_workers: int = 16
+    market_executor_max_pending: int = 128
+    executor_queue_timeout: float = 5.0
+
+    # Grafik çizimi (süreç havuzu) ve PNG önbelleği
+    chart_render_workers: int = 2  # 0: süreç havuzu yerine thread
+    chart_render_max_pending: int = 32
+    chart_cache_max_mb: int = 64
+    chart_disk_cache_max_mb: int = 256
+
+    # PDF raporları: (semboller, son bar) başına önbellek
+    report_cache_max_entries: int = 64
+    report_max_symbols: int = 25
+
+    # Yanıtlara Server-Timing başlığı (aşama süreleri) eklensin mi
+    server_timing_enabled: bool = True
+
+    # Loglama: JSON satırları, kuyruk + arka plan yazıcı
+    log_level: str = "INFO"
+    log_levels: str = ""  # modül bazında: "app.services.bar_store=DEBUG,app.access=WARNING"
+    log_file: str = "logs/app.log"
+    log_json: bool = True
+    log_to_console: bool = False
+    log_queue_size: int = 10000
+    log_request_sample_rate: float = 0.1  # 5xx ve yavaş istekler her zaman loglanır
+    log_slow_request_seconds: float = 2.0
+
+    # Veritabanı: boşsa app/database/finance.db (SQLite)
+    database_url: str = ""
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800  # saniye; sunucu tarafı kapanan bağlantılar için
+    sqlite_busy_timeout_ms: int = 5000
+    # Async motor (aiosqlite / asyncpg gerekir); URL boşsa database_url'den türetilir
+    database_async: bool = False
+    database_async_url: Optional[str] = None
+
+    # Kimlik doğrulama: doğrulanmış token claim'leri önbellekte, iptaller süreçler arası DB'den
+    jwt_secret_key: str = "very-secret-key"
+    access_token_expire_minutes: int = 30
+    token_cache_max_entries: int = 10000
+    token_revocation_sync_seconds: float = 5.0
+
+    # İstek sınırı (token bucket): "istek/saniye"; rol app/auth/users.py'deki role göre
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # memory | sqlite (aynı makinedeki worker'lar paylaşır)
+    rate_limit_sqlite_path: str = "app/data/rate_limits.db"
+    rate_limit_anonymous: str = "20/60"
+    rate_limit_free: str = "60/60"
+    rate_limit_premium: str = "600/60"
+    rate_limit_global: str = "3000/60"  # boş: global sınır yok
+    rate_limit_screener_cost: float = 10.0
+
+    # Dış veri sağlayıcısı bütçesi (sembol başına bir istek sayılır)
+    upstream_requests_per_second: float = 5.0
+    upstream_burst: float = 50.0
+    upstream_max_queue: int = 8  # bekleyen çağrı sayısı; market executor işçi sayısından küçük tutulur
+    upstream_max_wait: float = 30.0
+
+    # Zamanlanmış analiz sembolleri; "*" = companies tablosundaki tüm evren
+    scheduler_symbols: str = "AAPL,MSFT,GOOGL"
+
+    # Analiz geçmişi toplu yazımı (write-behind)
+    history_batch_size: int = 200
+    history_flush_seconds: float = 1.0
+    history_queue_size: int = 10000
+
     class Config:
         env_file = ".env"
 
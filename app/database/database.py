@@ -1,14 +1,53 @@
 import os
-from sqlalchemy import create_engine
+from typing import Callable
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.config import settings
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'finance.db')}"
+# DATABASE_URL ortam değişkeni/.env ile değiştirilebilir (ör. postgresql+psycopg2://...)
+SQLALCHEMY_DATABASE_URL = settings.database_url or f"sqlite:///{os.path.join(BASE_DIR, 'finance.db')}"
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _engine_options(url: str) -> dict:
+    if _is_sqlite(url):
+        options = {"connect_args": {"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000}}
+        if make_url(url).database in (None, "", ":memory:"):
+            # Bellek içi veritabanı tek bağlantıda yaşar
+            options["poolclass"] = StaticPool
+            return options
+    else:
+        options = {"pool_pre_ping": True}
+    options.update(
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+    )
+    return options
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL: okuyucular yazarı beklemez; NORMAL: WAL ile güvenli, her commit'te fsync yok;
+    # busy_timeout: kilitli veritabanında hemen "database is locked" yerine bekle
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.close()
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_engine_options(SQLALCHEMY_DATABASE_URL))
+if _is_sqlite(SQLALCHEMY_DATABASE_URL):
+    event.listen(engine, "connect", _sqlite_pragmas)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -19,3 +58,48 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# 🔌 Async motor (isteğe bağlı): DATABASE_ASYNC=true ve sürücü kurulu olmalı (aiosqlite / asyncpg)
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.database_async:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _url = make_url(settings.database_async_url or SQLALCHEMY_DATABASE_URL)
+    if not settings.database_async_url:
+        _url = _url.set(drivername=ASYNC_DRIVERS.get(_url.get_backend_name(), _url.drivername))
+    _async_options = _engine_options(SQLALCHEMY_DATABASE_URL)
+    _async_options.pop("connect_args", None)
+    async_engine = create_async_engine(_url, **_async_options)
+    if _url.get_backend_name() == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database engine is disabled (set DATABASE_ASYNC=true)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_db(fn: Callable, *args, **kwargs):
+    # fn(db, ...) senkron Session koduyla yazılır; async motor açıksa olay döngüsünde
+    # (sürücü G/Ç'si await edilir), değilse io executor'da yeni bir oturumla çalışır
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(fn, *args, **kwargs)
+
+    from app.services.executors import run_io
+
+    def call():
+        db = SessionLocal()
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.close()
+    return await run_io(call)
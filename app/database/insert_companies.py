@@ -1,28 +1,95 @@
+import csv
+import hashlib
 import os
 import sys
-import csv
+import time
+from typing import List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from app.database.database import SessionLocal
+from app.logging_config import get_logger
 from app.models.company import Company
+from app.models.data_import import DataImport
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+logger = get_logger(__name__)
 
 CSV_FILE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "../data/companylist.csv"))
 
-def insert_companies():
+# Tek INSERT ... ON CONFLICT ifadesinde gönderilen satır sayısı
+CHUNK_SIZE = 5000
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_listing(path: str = CSV_FILE_PATH) -> List[Tuple[str, str]]:
+    # (sembol, ad); aynı sembol tekrar ederse ilk satır geçerli
+    companies = {}
+    with open(path, newline='', encoding="utf-8") as csvfile:
+        for row in csv.DictReader(csvfile):
+            symbol = (row.get("Symbol") or "").strip()
+            name = (row.get("Name") or "").strip()
+            if symbol and name and symbol not in companies:
+                companies[symbol] = name
+    return list(companies.items())
+
+
+def _upsert(db: Session, rows: List[dict]):
+    dialects = {"sqlite": sqlite, "postgresql": postgresql}
+    dialect = dialects.get(db.get_bind().dialect.name)
+    if dialect is None:
+        # ON CONFLICT desteklemeyen veritabanı: merge (satır başına)
+        for row in rows:
+            db.merge(Company(**row))
+        return
+    stmt = dialect.insert(Company)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Company.symbol],
+        set_={"name": stmt.excluded.name},
+        where=Company.name != stmt.excluded.name,
+    )
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.execute(stmt, rows[start:start + CHUNK_SIZE])
+
+
+def insert_companies(path: str = CSV_FILE_PATH, force: bool = False) -> dict:
+    started = time.perf_counter()
+    source = os.path.basename(path)
+    content_hash = file_hash(path)
+
     db: Session = SessionLocal()
-    with open(CSV_FILE_PATH, newline='', encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            symbol = row["Symbol"].strip()
-            name = row["Name"].strip()
-            if symbol and name:
-                exists = db.query(Company).filter_by(symbol=symbol).first()
-                if not exists:
-                    db.add(Company(symbol=symbol, name=name))
+    try:
+        previous = db.get(DataImport, source)
+        if not force and previous is not None and previous.content_hash == content_hash:
+            return {"source": source, "status": "unchanged", "rows": previous.rows}
+
+        companies = parse_listing(path)
+        _upsert(db, [{"symbol": symbol, "name": name} for symbol, name in companies])
+        db.merge(DataImport(source=source, content_hash=content_hash, rows=len(companies)))
         db.commit()
-    db.close()
-    print("✅ Şirketler başarıyla eklendi.")
+    finally:
+        db.close()
+
+    # Aynı süreçteki önbellekler yenilenir (uygulama içinden çağrıldıysa)
+    from app.services.company_search import company_index
+    from app.services.universe import invalidate_universe
+    invalidate_universe()
+    if company_index.stats()["companies"]:
+        company_index.refresh()
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Companies loaded from {source}: {len(companies)} rows in {elapsed:.2f}s")
+    return {"source": source, "status": "loaded", "rows": len(companies), "seconds": round(elapsed, 3)}
+
 
 if __name__ == "__main__":
-    insert_companies()
+    result = insert_companies(force="--force" in sys.argv)
+    print(f"✅ Şirketler: {result}")
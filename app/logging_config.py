@@ -1,18 +1,148 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from app.config import settings
 
 # Create logs/ folder if it doesn't exist
-os.makedirs("logs", exist_ok=True)
+os.makedirs(os.path.dirname(settings.log_file) or ".", exist_ok=True)
+
+# Kayıtlar istek thread'inde yalnızca kuyruğa atılır; dosya/konsol yazımı arka plandaki dinleyicide yapılır.
+# Kuyruk dolarsa kayıt bekletilmeden düşürülür (dropped sayacı).
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        # logger.info("...", extra={...}) alanları
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    # Yüksek hacimli kayıtlardan yalnızca rate oranında geçirir; WARNING ve üstü her zaman geçer
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or self.rate >= 1.0 or random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Mesaj ve traceback burada metne çevrilir; extra alanlar korunur
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_levels(spec: str) -> dict:
+    # "app.services.bar_store=DEBUG,app.access=WARNING"
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _build_handlers() -> list:
+    if settings.log_json:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+    # Rotating file handler: 1MB max, 5 backups
+    file_handler = RotatingFileHandler(settings.log_file, maxBytes=1_000_000, backupCount=5, encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+    if settings.log_to_console:
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+    return handlers
+
+
+log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+queue_handler = NonBlockingQueueHandler(log_queue)
+listener = QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+_listening = False
+_listener_lock = threading.Lock()
+
+# Eski kod "finance_logger" kullanır; modüller get_logger(__name__) ile "app.*" altında kayıt açar
+for _root_name in ("finance_logger", "app"):
+    _root = logging.getLogger(_root_name)
+    _root.setLevel(settings.log_level.upper())
+    _root.addHandler(queue_handler)
+    _root.propagate = False
+
+for _name, _level in _parse_levels(settings.log_levels).items():
+    logging.getLogger(_name).setLevel(_level)
+
+# İstek kayıtları (main.py middleware) örneklenir
+access_logger = logging.getLogger("app.access")
+access_logger.addFilter(SamplingFilter(settings.log_request_sample_rate))
 
-# Create logger
 logger = logging.getLogger("finance_logger")
-logger.setLevel(logging.INFO)
 
-# Rotating file handler: 1MB max, 5 backups
-file_handler = RotatingFileHandler("logs/app.log", maxBytes=1_000_000, backupCount=5)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
 
-# Add handler to logger
-logger.addHandler(file_handler)
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+
+def start_logging():
+    global _listening
+    with _listener_lock:
+        if not _listening:
+            listener.start()
+            _listening = True
+
+
+def stop_logging():
+    # Kuyrukta kalan kayıtlar yazılır
+    global _listening
+    with _listener_lock:
+        if _listening:
+            listener.stop()
+            _listening = False
+
+
+def logging_stats() -> dict:
+    return {"queued": log_queue.qsize(), "dropped": queue_handler.dropped}
+
+
+start_logging()
+atexit.register(stop_logging)
@@ -1,35 +1,37 @@
 # app/ml/ai_utils.py
 
-import os
-import joblib
+from typing import Dict
+
+import numpy as np
 import pandas as pd
+from joblib import parallel_config
 
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "ai_stock_model.joblib")
+from app.config import settings
+from app.ml.model_registry import MODEL_PATH, get_model
+from app.services.metrics import span
 
-def predict_ai_decision(df: pd.DataFrame):
-    # Modeli yükle
-    if not os.path.exists(MODEL_PATH):
-        raise FileNotFoundError("AI modeli bulunamadı.")
+# Modelin eğitildiği sütunlar (train_ai_model.py ile aynı sıra)
+AI_FEATURES = [
+    "Close", "SMA_14", "RSI_14", "MACD", "Signal", "Upper_BB", "Lower_BB",
+    "CCI", "ADX", "Stochastic_K", "Stochastic_D", "Williams_%R", "OBV", "ATR"
+]
 
-    model = joblib.load(MODEL_PATH)
+def predict_ai_decision(df: pd.DataFrame):
+    # Model süreç başına bir kez yüklenir (dosya değişirse yeniden)
+    model = get_model(MODEL_PATH)
 
     # Tahmin için en son satırı al
     latest_row = df.iloc[[-1]]
 
-    # Label yoksa sadece X sütunlarını al
-    features = [
-        "Close", "SMA_14", "RSI_14", "MACD", "Signal", "Upper_BB", "Lower_BB",
-        "CCI", "ADX", "Stochastic_K", "Stochastic_D", "Williams_%R", "OBV", "ATR"
-    ]
-
     # Eksik sütun var mı kontrol et
-    missing = [col for col in features if col not in latest_row.columns]
+    missing = [col for col in AI_FEATURES if col not in latest_row.columns]
     if missing:
         raise ValueError(f"Eksik sütunlar: {missing}")
 
-    # Tahmin yap
-    prediction = model.predict(latest_row[features])[0]
-    proba = model.predict_proba(latest_row[features])[0]
+    # Tahmin yap (predict = en yüksek olasılıklı sınıf; orman tek geçişte değerlendirilir)
+    with span("predict"):
+        proba = model.predict_proba(latest_row[AI_FEATURES])[0]
+    prediction = model.classes_[int(np.argmax(proba))]
 
     confidence = round(max(proba), 2)
 
@@ -37,3 +39,38 @@ def predict_ai_decision(df: pd.DataFrame):
         "signal": prediction,
         "confidence": confidence
     }
+
+def predict_ai_decisions(frames: Dict[str, pd.DataFrame]) -> Dict[str, dict]:
+    # Her sembolün son satırı tek bir matriste; model bir kez çağrılır
+    model = get_model(MODEL_PATH)
+
+    results = {}
+    symbols = []
+    rows = []
+    for symbol, df in frames.items():
+        if df.empty:
+            results[symbol] = {"error": "No data found."}
+            continue
+        missing = [col for col in AI_FEATURES if col not in df.columns]
+        if missing:
+            results[symbol] = {"error": f"Eksik sütunlar: {missing}"}
+            continue
+        row = df[AI_FEATURES].iloc[-1].to_numpy(dtype="float64")
+        if not np.isfinite(row).all():
+            results[symbol] = {"error": "Not enough history for AI features."}
+            continue
+        symbols.append(symbol)
+        rows.append(row)
+
+    if rows:
+        X = pd.DataFrame(np.vstack(rows), columns=AI_FEATURES)
+        with span("predict"), parallel_config(n_jobs=settings.model_n_jobs):
+            proba = model.predict_proba(X)
+        best = proba.argmax(axis=1)
+        for i, symbol in enumerate(symbols):
+            results[symbol] = {
+                "signal": str(model.classes_[best[i]]),
+                "confidence": round(float(proba[i, best[i]]), 2),
+            }
+
+    return results
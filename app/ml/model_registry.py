@@ -0,0 +1,103 @@
+# app/ml/model_registry.py
+
+import os
+import threading
+import time
+from typing import Optional
+
+import joblib
+
+from app.config import settings
+from app.services.metrics import span
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "ai_stock_model.joblib")
+
+
+def _estimate_nbytes(model) -> int:
+    # Orman modellerinde asıl bellek ağaç düğüm/değer dizileridir
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None:
+        tree = getattr(model, "tree_", None)
+        if tree is None:
+            return 0
+        estimators = [model]
+    total = 0
+    for estimator in estimators:
+        tree = getattr(estimator, "tree_", None)
+        if tree is None:
+            continue
+        state = tree.__getstate__()
+        total += state["nodes"].nbytes + state["values"].nbytes
+    return total
+
+
+# Modeller süreç başına bir kez yüklenir; dosyanın mtime'ı değişince yeniden yüklenir.
+class ModelRegistry:
+    def __init__(self, mmap_mode: Optional[str] = None, check_interval: float = 2.0):
+        self.mmap_mode = mmap_mode
+        self.check_interval = check_interval
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str = MODEL_PATH):
+        path = os.path.abspath(path)
+        entry = self._entries.get(path)
+        now = time.monotonic()
+        if entry is not None and now - entry["checked_at"] < self.check_interval:
+            return entry["model"]
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError("AI modeli bulunamadı.")
+
+        if entry is not None and entry["mtime"] == mtime:
+            entry["checked_at"] = now
+            return entry["model"]
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry["mtime"] == mtime:
+                return entry["model"]
+
+            started = time.perf_counter()
+            with span("model_load"):
+                model = joblib.load(path, mmap_mode=self.mmap_mode)
+            load_seconds = time.perf_counter() - started
+
+            self._entries[path] = {
+                "model": model,
+                "mtime": mtime,
+                "checked_at": time.monotonic(),
+                "loaded_at": time.time(),
+                "load_seconds": load_seconds,
+                "file_bytes": os.path.getsize(path),
+                "model_bytes": _estimate_nbytes(model),
+                "loads": (entry["loads"] + 1) if entry is not None else 1,
+            }
+            return model
+
+    def info(self) -> list:
+        return [
+            {
+                "path": path,
+                "model_type": type(entry["model"]).__name__,
+                "loaded_at": entry["loaded_at"],
+                "load_seconds": round(entry["load_seconds"], 4),
+                "file_bytes": entry["file_bytes"],
+                "model_bytes": entry["model_bytes"],
+                "loads": entry["loads"],
+                "mmap_mode": self.mmap_mode,
+            }
+            for path, entry in list(self._entries.items())
+        ]
+
+
+model_registry = ModelRegistry(
+    mmap_mode=settings.model_mmap_mode,
+    check_interval=settings.model_reload_check_seconds,
+)
+
+
+def get_model(path: str = MODEL_PATH):
+    return model_registry.get(path)
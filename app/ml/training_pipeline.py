@@ -0,0 +1,156 @@
+# app/ml/training_pipeline.py
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.logging_config import get_logger
+from app.ml.ai_utils import AI_FEATURES
+from app.services.bar_store import bar_store
+from app.services.indicators import add_technical_indicators
+
+logger = get_logger(__name__)
+
+# Sembol başına özellik parçaları (sütun başına bir .npy) ve birleştirilmiş eğitim seti
+SHARD_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "training", "shards")
+DATASET_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "training", "dataset")
+
+# Etiket: 5 bar sonraki kapanışa göre ±%3
+LABELS = ["Buy", "Neutral", "Sell"]
+HORIZON = 5
+THRESHOLD = 0.03
+
+# Özellik/etiket tanımı değişirse artırılır; eski parçalar yeniden üretilir
+FEATURE_VERSION = 1
+
+
+def label_codes(close: pd.Series) -> np.ndarray:
+    future = close.shift(-HORIZON)
+    pct = ((future - close) / close).to_numpy()
+    codes = np.select([pct > THRESHOLD, pct < -THRESHOLD], [LABELS.index("Buy"), LABELS.index("Sell")],
+                      LABELS.index("Neutral"))
+    # Gelecek kapanışı olmayan satırlar etiketlenmez
+    return np.where(np.isnan(pct), -1, codes).astype("int8")
+
+
+def featurize(bars: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    df = add_technical_indicators(bars)
+    codes = label_codes(df["Close"])
+    features = df[AI_FEATURES].to_numpy(dtype="float64")
+    keep = (codes >= 0) & ~np.isnan(features).any(axis=1)
+    return features[keep], codes[keep]
+
+
+def fingerprint(bars: pd.DataFrame) -> str:
+    digest = hashlib.sha1(pd.util.hash_pandas_object(bars, index=True).to_numpy().tobytes())
+    digest.update(json.dumps([FEATURE_VERSION, AI_FEATURES, LABELS, HORIZON, THRESHOLD]).encode())
+    return digest.hexdigest()
+
+
+def _shard_meta(shard_dir: str, symbol: str) -> dict:
+    path = os.path.join(shard_dir, symbol, "meta.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_shard(shard_dir: str, symbol: str, features: np.ndarray, codes: np.ndarray, meta: dict):
+    directory = os.path.join(shard_dir, symbol)
+    os.makedirs(directory, exist_ok=True)
+    # meta.json en son yazılır; yarım kalan parça bir sonraki çalıştırmada yeniden üretilir
+    meta_path = os.path.join(directory, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    for i, column in enumerate(AI_FEATURES):
+        np.save(os.path.join(directory, f"{_column_file(column)}.npy"), np.ascontiguousarray(features[:, i]))
+    np.save(os.path.join(directory, "label.npy"), codes)
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(meta_path + ".tmp", meta_path)
+
+
+def _column_file(column: str) -> str:
+    return column.replace("%", "pct")
+
+
+# Süreç havuzunda çalışır: barlar bar deposundan (diskte varsa ağ yok), özellikler parçaya yazılır
+def build_shard(symbol: str, start: str, end: str, shard_dir: str = SHARD_DIR, force: bool = False) -> dict:
+    bars = bar_store.get_bars(symbol, interval="1d", period=None, start=start, end=end)
+    if bars.empty or "Close" not in bars.columns:
+        return {"symbol": symbol, "status": "no_data", "rows": 0}
+
+    key = fingerprint(bars)
+    meta = _shard_meta(shard_dir, symbol)
+    if not force and meta.get("fingerprint") == key:
+        return {"symbol": symbol, "status": "unchanged", "rows": meta["rows"]}
+
+    features, codes = featurize(bars)
+    _write_shard(shard_dir, symbol, features, codes, {
+        "fingerprint": key,
+        "rows": int(len(codes)),
+        "columns": AI_FEATURES,
+        "start": start,
+        "end": end,
+    })
+    return {"symbol": symbol, "status": "built", "rows": int(len(codes))}
+
+
+def build_shards(
+    symbols: List[str],
+    start: str,
+    end: str,
+    shard_dir: str = SHARD_DIR,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, dict]:
+    results = {}
+    # bar_store/logging thread'leri açıkken fork edilen süreç kilitlenebilir; forkserver ile temiz süreçler açılır
+    context = multiprocessing.get_context("forkserver")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {executor.submit(build_shard, s, start, end, shard_dir, force): s for s in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                # Başarısız sembol diğerlerini durdurmaz; tekrar çalıştırınca yalnızca o yeniden denenir
+                logger.error(f"[{symbol}] Training shard failed: {e}")
+                results[symbol] = {"symbol": symbol, "status": "error", "rows": 0, "error": str(e)}
+    return results
+
+
+def build_dataset(symbols: List[str], shard_dir: str = SHARD_DIR, out_dir: str = DATASET_DIR):
+    # Parçalar tek bir (satır x özellik) .npy dosyasına kopyalanır ve mmap ile açılır
+    metas = [(s, _shard_meta(shard_dir, s)) for s in symbols]
+    metas = [(s, m) for s, m in metas if m.get("rows")]
+    total = sum(m["rows"] for _, m in metas)
+    if total == 0:
+        return np.empty((0, len(AI_FEATURES))), np.empty(0, dtype=object)
+
+    os.makedirs(out_dir, exist_ok=True)
+    x_path = os.path.join(out_dir, "X.npy")
+    y_path = os.path.join(out_dir, "y.npy")
+    X = np.lib.format.open_memmap(x_path + ".tmp", mode="w+", dtype="float64", shape=(total, len(AI_FEATURES)))
+    y = np.empty(total, dtype="int8")
+
+    row = 0
+    for symbol, meta in metas:
+        directory = os.path.join(shard_dir, symbol)
+        rows = meta["rows"]
+        for i, column in enumerate(AI_FEATURES):
+            X[row:row + rows, i] = np.load(os.path.join(directory, f"{_column_file(column)}.npy"), mmap_mode="r")
+        y[row:row + rows] = np.load(os.path.join(directory, "label.npy"))
+        row += rows
+    X.flush()
+    del X
+    os.replace(x_path + ".tmp", x_path)
+    np.save(y_path, y)
+
+    return np.load(x_path, mmap_mode="r"), np.asarray(LABELS)[np.load(y_path)]
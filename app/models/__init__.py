@@ -1,4 +1,8 @@
 # app/models/__init__.py
 
 from .analysis_history import AnalysisHistory
+from .company import Company
+from .data_import import DataImport
+from .user import User
+from .revoked_token import RevokedToken
 # varsa diğer modellerin importları da burada olsun
@@ -1,15 +1,39 @@
 # app/models/analysis_history.py
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Float, LargeBinary, Index
 from sqlalchemy.sql import func
 from app.database.database import Base
 
 class AnalysisHistory(Base):
     __tablename__ = "analysis_history"
+    __table_args__ = (
+        # Kullanıcı geçmişi created_at'e göre sıralı okunur (keyset sayfalama); sembol filtresi de kullanıcıya bağlı
+        Index("ix_analysis_history_username_created_at", "username", "created_at"),
+        Index("ix_analysis_history_username_symbol_created_at", "username", "symbol", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, index=True)  # JWT token'dan alınacak
-    symbol = Column(String)
-    indicators = Column(String)  # "sma,ema,rsi"
-    result = Column(String)  # JSON formatta string olarak saklanacak
+    username = Column(String)  # JWT token'dan alınacak
+    symbol = Column(String)  # büyük harf
+    indicators_mask = Column(Integer)  # history_codec.INDICATOR_BITS bit maskesi
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Sonucun sık okunan alanları tipli sütunlarda
+    decision = Column(String)
+    confidence = Column(Float)
+    ai_decision = Column(String)
+    ai_confidence = Column(Float)
+
+    # Son gösterge değerleri
+    close = Column(Float)
+    sma = Column(Float)
+    ema = Column(Float)
+    rsi = Column(Float)
+    macd = Column(Float)
+    macd_signal = Column(Float)
+    z_score = Column(Float)
+    bollinger_upper = Column(Float)
+    bollinger_lower = Column(Float)
+
+    # Geri kalan alanlar (sinyaller vb.), sıkıştırılmış; bkz. history_codec
+    payload = Column(LargeBinary)
@@ -0,0 +1,13 @@
+# app/models/data_import.py
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+class DataImport(Base):
+    __tablename__ = "data_imports"
+
+    source = Column(String, primary_key=True)  # ör. "companylist.csv"
+    content_hash = Column(String, nullable=False)  # sha256; aynıysa yükleme atlanır
+    rows = Column(Integer)
+    loaded_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,11 @@
+# app/models/revoked_token.py
+
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database.database import Base
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True)  # süreçler yalnızca son gördükleri id'den sonrasını okur
+    token_hash = Column(String, unique=True, nullable=False)  # sha256(token)
+    expires_at = Column(DateTime(timezone=True), index=True)  # bu tarihten sonra kayıt silinebilir
@@ -0,0 +1,14 @@
+# app/models/user.py
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    username = Column(String, unique=True, index=True, nullable=False)
+    password_hash = Column(String, nullable=False)  # pbkdf2_sha256$iterasyon$tuz$özet
+    role = Column(String, nullable=False, default="free")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import pandas as pd
+
+from app.config import settings
+from app.plot.plot_utils import CHART_RENDERERS
+from app.services.executors import BoundedExecutor, run_io
+from app.services.metrics import span
+from app.services.single_flight import AsyncSingleFlight, SingleFlight
+
+# /plots statik olarak sunulduğu için önbellek onun dışında tutulur
+CHART_CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "charts"))
+
+
+def data_fingerprint(data: Optional[pd.DataFrame]) -> str:
+    if data is None:
+        return "-"
+    hashed = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    digest = hashlib.sha1(hashed.tobytes())
+    digest.update(",".join(map(str, data.columns)).encode())
+    return digest.hexdigest()
+
+
+def chart_key(chart_type: str, data: Optional[pd.DataFrame], symbol: str, size: Optional[Tuple[float, float]] = None) -> str:
+    # (sembol, veri özeti, grafik tipi, boyut) -> ETag olarak da kullanılan anahtar
+    raw = f"{symbol.upper()}|{data_fingerprint(data)}|{chart_type}|{size}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _render(chart_type: str, data, symbol: str, size) -> bytes:
+    return CHART_RENDERERS[chart_type](data, symbol, size)
+
+
+# Bellekte bayt sınırlı LRU + diskte PNG dosyaları.
+# Disk katmanı da max_disk_bytes ile sınırlıdır: aşılınca en eski (mtime) dosyalar silinir.
+class ChartCache:
+    def __init__(
+        self,
+        directory: str = CHART_CACHE_DIR,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._disk_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return png
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                png = f.read()
+            # Kullanılan dosya budamada en sona kalsın
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        self._remember(key, png)
+        with self._lock:
+            self.disk_hits += 1
+        return png
+
+    def put(self, key: str, png: bytes):
+        self._remember(key, png)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(png)
+        os.replace(tmp_path, self._path(key))
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk()[1]
+            else:
+                self._disk_bytes += len(png)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+
+    def _scan_disk(self):
+        files, total = [], 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        return files, total
+
+    def _prune_disk(self):
+        # Diğer süreçlerin yazdıkları da sayılsın diye dizin yeniden taranır; sınırın %90'ına inilir
+        files, total = self._scan_disk()
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._disk_bytes = total
+
+    def _remember(self, key: str, png: bytes):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = png
+            self._bytes += len(png)
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "disk_bytes": self._disk_bytes or 0,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+            }
+
+
+chart_cache = ChartCache(
+    max_bytes=settings.chart_cache_max_mb * 1024 * 1024,
+    max_disk_bytes=settings.chart_disk_cache_max_mb * 1024 * 1024,
+)
+
+# Çizim CPU ağırlıklı; GIL'i paylaşmamak için ayrı süreçlerde yapılır.
+# chart_render_workers=0 ise süreç açılmaz, thread havuzunda çizilir.
+# Bu noktada log/zamanlayıcı/executor thread'leri çalıştığından fork yerine forkserver kullanılır
+# (kilit tutan thread'lerle fork edilen süreç kilitlenebilir).
+render_executor = BoundedExecutor(
+    "render",
+    max_workers=settings.chart_render_workers or 2,
+    max_pending=settings.chart_render_max_pending,
+    queue_timeout=settings.executor_queue_timeout,
+    executor=ProcessPoolExecutor(
+        max_workers=settings.chart_render_workers,
+        mp_context=multiprocessing.get_context("forkserver"),
+    ) if settings.chart_render_workers > 0 else None,
+)
+
+_async_flight = AsyncSingleFlight("chart")
+_sync_flight = SingleFlight("chart_sync")
+
+
+async def _render_and_store(key: str, chart_type: str, data, symbol: str, size) -> bytes:
+    with span("plot"):
+        png = await render_executor.run(_render, chart_type, data, symbol, size)
+    await run_io(chart_cache.put, key, png)
+    return png
+
+
+async def render_chart(chart_type: str, data, symbol: str, size: Optional[Tuple[float, float]] = None):
+    key = chart_key(chart_type, data, symbol, size)
+    png = await run_io(chart_cache.get, key)
+    if png is None:
+        png = await _async_flight.do(key, _render_and_store, key, chart_type, data, symbol, size)
+    return png, key
+
+
+def _render_and_store_sync(key: str, chart_type: str, data, symbol: str, size) -> bytes:
+    with span("plot"):
+        png = render_executor.submit(_render, chart_type, data, symbol, size).result()
+    chart_cache.put(key, png)
+    return png
+
+
+# Thread içinden (ör. rapor üretimi) çağrılabilen senkron sürüm
+def render_chart_sync(chart_type: str, data, symbol: str, size: Optional[Tuple[float, float]] = None):
+    key = chart_key(chart_type, data, symbol, size)
+    png = chart_cache.get(key)
+    if png is None:
+        png = _sync_flight.do(key, _render_and_store_sync, key, chart_type, data, symbol, size)
+    return png, key
+
+
+def shutdown_renderer():
+    render_executor.shutdown()
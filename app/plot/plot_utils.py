@@ -1,9 +1,24 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from io import BytesIO
+from typing import Optional, Tuple
 import pandas as pd
 
-def plot_stock_chart(data: pd.DataFrame, symbol: str) -> BytesIO:
-    fig, ax = plt.subplots(figsize=(10, 5))
+# pyplot'un global durumu thread-safe değil; her çizim kendi Figure/Agg canvas'ını kullanır.
+# render_* fonksiyonları süreç havuzunda çalışabilmesi için modül seviyesinde ve saf tutulur.
+
+PRICE_CHART_SIZE = (10, 5)
+SAMPLE_CHART_SIZE = (6, 4)
+
+def _to_png(fig: Figure, **savefig_kwargs) -> bytes:
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', **savefig_kwargs)
+    return buffer.getvalue()
+
+def render_price_chart(data: pd.DataFrame, symbol: str, size: Optional[Tuple[float, float]] = None) -> bytes:
+    fig = Figure(figsize=size or PRICE_CHART_SIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
 
     ax.plot(data['date'], data['close'], label='Close Price')
     ax.plot(data['date'], data['sma'], label='SMA', linestyle='--')
@@ -17,31 +32,49 @@ def plot_stock_chart(data: pd.DataFrame, symbol: str) -> BytesIO:
     ax.grid(True)
     fig.tight_layout()
 
-    buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    plt.close(fig)
-    buffer.seek(0)
-    return buffer
-
-import matplotlib.pyplot as plt
-import os
+    return _to_png(fig)
 
-def generate_sample_plot(symbol: str):
+def render_sample_chart(data: Optional[pd.DataFrame], symbol: str, size: Optional[Tuple[float, float]] = None) -> bytes:
     # Örnek veri
     x = [1, 2, 3, 4, 5]
     y = [10, 20, 15, 25, 30]
 
-    plt.figure(figsize=(6, 4))
-    plt.plot(x, y, label="Sample Data")
-    plt.title(f"{symbol} Stock Sample Plot")
-    plt.xlabel("X Axis")
-    plt.ylabel("Y Axis")
-    plt.legend()
-    plt.grid(True)
+    fig = Figure(figsize=size or SAMPLE_CHART_SIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.plot(x, y, label="Sample Data")
+    ax.set_title(f"{symbol} Stock Sample Plot")
+    ax.set_xlabel("X Axis")
+    ax.set_ylabel("Y Axis")
+    ax.legend()
+    ax.grid(True)
+
+    return _to_png(fig, bbox_inches="tight")
+
+CHART_RENDERERS = {
+    "price": render_price_chart,
+    "sample": render_sample_chart,
+}
+
+def plot_stock_chart(data: pd.DataFrame, symbol: str) -> BytesIO:
+    return BytesIO(render_price_chart(data, symbol))
+
+import os
+
+def generate_sample_plot(symbol: str):
+    from app.plot.chart_renderer import render_chart_sync
 
     # Kayıt yolu
     save_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "plots", f"{symbol}.png"))
     os.makedirs(os.path.dirname(save_path), exist_ok=True)
-    plt.savefig(save_path, bbox_inches="tight")
-    plt.close()
 
+    # Önbellekte varsa yeniden çizilmez; dosya yalnızca içerik değiştiyse yazılır
+    png, _ = render_chart_sync("sample", None, symbol)
+    if os.path.exists(save_path) and os.path.getsize(save_path) == len(png):
+        with open(save_path, "rb") as f:
+            if f.read() == png:
+                return
+    tmp_path = f"{save_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(png)
+    os.replace(tmp_path, save_path)
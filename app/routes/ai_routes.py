@@ -1,17 +1,59 @@
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
 from app.auth.auth_service import get_current_user
-from app.services.ai_model import predict_ai_signal
+from app.config import settings
+from app.services.ai_model import predict_ai_signal, predict_ai_signals_batch
+from app.services.bar_store import valid_symbol
+from app.ml.model_registry import model_registry, get_model
+from app.services.executors import RateLimited, ServerBusy, run_io, run_market
+from app.services.rate_limiter import rate_limit
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
-@router.get("/predict")
-def get_ai_prediction(symbol: str, user=Depends(get_current_user)):
+@router.get("/model")
+async def get_model_info(user=Depends(get_current_user)):
     try:
-        prediction, confidence = predict_ai_signal(symbol)
+        await run_io(get_model)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"models": model_registry.info()}
+
+@router.get("/predict", dependencies=[Depends(rate_limit())])
+async def get_ai_prediction(symbol: str, user=Depends(get_current_user)):
+    try:
+        prediction, confidence = await run_market(predict_ai_signal, symbol)
         return {
             "symbol": symbol.upper(),
             "ai_prediction": prediction,
             "confidence": confidence
         }
+    except (ServerBusy, RateLimited):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+class BatchPredictRequest(BaseModel):
+    symbols: List[str]
+
+@router.post("/predict/batch", dependencies=[Depends(rate_limit())])
+async def get_ai_predictions(request: BatchPredictRequest, user=Depends(get_current_user)):
+    if not request.symbols:
+        raise HTTPException(status_code=400, detail="No symbols given.")
+    if len(request.symbols) > settings.ai_batch_max_symbols:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.ai_batch_max_symbols} symbols per request."
+        )
+    invalid = [s for s in request.symbols if not valid_symbol(s.upper())]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid symbols: {', '.join(invalid[:10])}")
+    try:
+        predictions = await run_market(predict_ai_signals_batch, request.symbols)
+    except (ServerBusy, RateLimited):
+        raise
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+    return {"count": len(predictions), "predictions": predictions}
@@ -1,14 +1,13 @@
 # routes/analyze_routes.py
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+import asyncio
 import io
 import csv
-from reportlab.pdfgen import canvas
-from sqlalchemy.orm import Session
-from fastapi import Depends
-from app.database.database import get_db
+from app.database.database import run_db
 from app.services.company_service import get_symbol_by_company_name
+from app.services.company_search import company_index
 
 router = APIRouter()
 
@@ -25,47 +24,39 @@ mock_result = {
 }
 
 
-from app.plot.plot_utils import generate_sample_plot
+from app.services.bar_store import bar_store
+from app.services.indicator_cache import cached_indicators
+from app.services.executors import run_cpu, run_market
+from app.services.async_data import analysis_flight
+from app.logging_config import get_logger
 
-import yfinance as yf
-import numpy as np
-import pandas as pd
-from app.plot.plot_utils import generate_sample_plot
+logger = get_logger(__name__)
+
+ANALYSIS_INDICATORS = ["sma", "ema", "rsi", "macd", "z_score", "bollinger"]
 
 def get_analysis_result(symbol: str):
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="6mo", interval="1d")
+        hist = bar_store.get_bars(symbol, interval="1d", period="6mo")
 
         if hist.empty:
             return None
 
-        close = hist["Close"]
-        latest_close = round(close.iloc[-1], 2)
-
-        # Teknik Göstergeler
-        sma = round(close.rolling(window=20).mean().iloc[-1], 2)
-        ema = round(close.ewm(span=20, adjust=False).mean().iloc[-1], 2)
-
-        delta = close.diff()
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-        avg_gain = pd.Series(gain).rolling(window=14).mean()
-        avg_loss = pd.Series(loss).rolling(window=14).mean()
-        rs = avg_gain / avg_loss
-        rsi = round(100 - (100 / (1 + rs.iloc[-1])), 2)
+        # Teknik Göstergeler (önbellekten; aynı son bar için yeniden hesaplanmaz)
+        hist = cached_indicators(symbol, "1d", hist, ANALYSIS_INDICATORS)
+        latest_row = hist.iloc[-1]
 
-        exp1 = close.ewm(span=12, adjust=False).mean()
-        exp2 = close.ewm(span=26, adjust=False).mean()
-        macd = round((exp1 - exp2).iloc[-1], 4)
-        macd_signal = round((exp1 - exp2).ewm(span=9, adjust=False).mean().iloc[-1], 4)
+        latest_close = round(latest_row["Close"], 2)
+        sma = round(latest_row["SMA_20"], 2)
+        ema = round(latest_row["EMA_20"], 2)
+        rsi = round(latest_row["RSI_14"], 2)
+        macd = round(latest_row["MACD"], 4)
+        macd_signal = round(latest_row["MACD_signal"], 4)
+        upper = round(latest_row["Bollinger_Upper"], 2)
+        lower = round(latest_row["Bollinger_Lower"], 2)
 
-        mean = close.rolling(window=20).mean()
-        std = close.rolling(window=20).std()
-        upper = round(mean.iloc[-1] + 2 * std.iloc[-1], 2)
-        lower = round(mean.iloc[-1] - 2 * std.iloc[-1], 2)
-
-        z_score = round((latest_close - mean.iloc[-1]) / std.iloc[-1], 2)
+        mean = latest_row["Bollinger_Mid"]
+        std = (latest_row["Bollinger_Upper"] - mean) / 2
+        z_score = round((latest_close - mean) / std, 2)
 
         # Sinyal üretimi
         signals = {
@@ -90,9 +81,6 @@ def get_analysis_result(symbol: str):
             decision = "Neutral"
             confidence = 0.5
 
-        # Grafik üretimi
-        generate_sample_plot(symbol)
-
         return {
             "symbol": symbol.upper(),
             "latest": {
@@ -111,19 +99,26 @@ def get_analysis_result(symbol: str):
                 "signal": decision,
                 "confidence": confidence
             },
-            "chart_url": f"/plots/{symbol}.png"
+            # Grafik diske yazılmaz; /plot/{symbol} isteğe göre çizer (önbellekli)
+            "chart_url": f"/plot/{symbol.upper()}",
+            "as_of": str(hist.index[-1])
         }
 
     except Exception as e:
-        print(f"[ERROR] Analysis failed for {symbol}: {e}")
+        logger.exception(f"Analysis failed for {symbol}: {e}")
         return None
 
 
 
 
+async def analysis_result(symbol: str):
+    # Aynı sembol için eşzamanlı rapor istekleri tek analizi paylaşır
+    return await analysis_flight.do(("report", symbol.upper()), run_market, get_analysis_result, symbol)
+
+
 @router.get("/download/csv/{symbol}")
-def download_csv(symbol: str):
-    result = get_analysis_result(symbol)
+async def download_csv(symbol: str):
+    result = await analysis_result(symbol)
     if not result:
         raise HTTPException(status_code=404, detail="No analysis result found.")
 
@@ -141,64 +136,62 @@ def download_csv(symbol: str):
     )
 
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.utils import ImageReader
-import os
-from app.plot.plot_utils import generate_sample_plot
+from app.config import settings
+from app.services.report_service import get_report_pdf
 
 
-@router.get("/download/pdf/{symbol}")
-def download_pdf(symbol: str):
-    generate_sample_plot(symbol)  # PNG üret
+def _pdf_response(pdf: bytes, filename: str):
+    return StreamingResponse(
+        io.BytesIO(pdf),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 
-    result = get_analysis_result(symbol)
+@router.get("/download/pdf/{symbol}")
+async def download_pdf(symbol: str):
+    result = await analysis_result(symbol)
     if not result:
         raise HTTPException(status_code=404, detail="No analysis result found.")
 
-    file_path = f"{symbol}_analysis.pdf"
-    plot_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "plots", f"{symbol}.png"))
+    pdf = await run_cpu(get_report_pdf, [result])
+    return _pdf_response(pdf, f"{symbol}_analysis.pdf")
 
-    c = canvas.Canvas(file_path, pagesize=letter)
-    c.setFont("Helvetica", 12)
-
-    # Başlık
-    c.drawString(100, 750, f"Analysis Report for {symbol}")
-
-    # Yazılar
-    y = 720
-    for key, value in result["latest"].items():
-        c.drawString(100, y, f"{key}: {value}")
-        y -= 20
-
-    # Grafik en alta
-    if os.path.exists(plot_path):
-        c.drawImage(ImageReader(plot_path), 100, 100, width=400, preserveAspectRatio=True)
-
-    c.save()
-    return FileResponse(path=file_path, filename=file_path, media_type="application/pdf")
 
+# 📄 Çoklu sembol raporu: /download/pdf?symbols=AAPL,MSFT (her sembol bir sayfa)
+@router.get("/download/pdf")
+async def download_pdf_multi(symbols: str):
+    symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="No symbols given.")
+    if len(symbol_list) > settings.report_max_symbols:
+        raise HTTPException(status_code=400, detail=f"At most {settings.report_max_symbols} symbols per report.")
 
+    results = await asyncio.gather(*(analysis_result(s) for s in symbol_list))
+    results = [r for r in results if r]
+    if not results:
+        raise HTTPException(status_code=404, detail="No analysis result found.")
 
+    pdf = await run_cpu(get_report_pdf, results)
+    return _pdf_response(pdf, "analysis_report.pdf")
 
 
 @router.get("/analyze_by_name")
-def analyze_by_name(company: str, db: Session = Depends(get_db)):
-    result = get_symbol_by_company_name(db, company)
+async def analyze_by_name(company: str):
+    result = await run_db(get_symbol_by_company_name, company)
     if not result:
         raise HTTPException(status_code=404, detail="Company not found.")
 
     symbol = result.symbol
-    analysis = get_analysis_result(symbol)
+    analysis = await analysis_result(symbol)
     if not analysis:
         raise HTTPException(status_code=404, detail="No analysis result found.")
 
     return analysis
 
+# ⚡ Otomatik tamamlama: bellek içi indeks, veritabanına gitmez
 @router.get("/suggest_companies")
-def suggest_companies(q: str, db: Session = Depends(get_db)):
-    from app.models.company import Company
-    results = db.query(Company).filter(Company.name.ilike(f"%{q}%")).limit(5).all()
-    return [{"symbol": r.symbol, "name": r.name} for r in results]
+async def suggest_companies(q: str, limit: int = Query(5, ge=1, le=50)):
+    return [{"symbol": r["symbol"], "name": r["name"]} for r in company_index.search(q, limit)]
 
 
@@ -3,8 +3,11 @@ from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from datetime import timedelta
 
-from app.auth.auth_service import authenticate_user, create_access_token, get_current_user
-from app.auth.users import fake_users_db
+from app.auth import user_store
+from app.auth.auth_service import (
+    InvalidToken, authenticate_user, create_access_token, get_current_user, oauth2_scheme, revoke_token
+)
+from app.services.executors import run_io
 
 router = APIRouter(
     prefix="/auth",
@@ -14,7 +17,8 @@ router = APIRouter(
 # 🔐 LOGIN
 @router.post("/login")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = authenticate_user(form_data.username, form_data.password)
+    # PBKDF2 bilerek yavaştır; olay döngüsünü bloklamasın
+    user = await run_io(authenticate_user, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
 
@@ -25,6 +29,15 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
+# 🚪 LOGOUT: token iptal edilir (tüm worker süreçlerinde en geç revocation sync süresi içinde)
+@router.post("/logout")
+async def logout(token: str = Depends(oauth2_scheme)):
+    try:
+        await run_io(revoke_token, token)
+    except InvalidToken:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    return {"message": "Logged out"}
+
 # 📝 REGISTER
 class RegisterForm(BaseModel):
     username: str
@@ -32,14 +45,11 @@ class RegisterForm(BaseModel):
 
 @router.post("/register")
 async def register(form: RegisterForm):
-    if form.username in fake_users_db:
+    try:
+        # Yeni kayıt olanlar free başlar
+        await run_io(user_store.create_user, form.username, form.password, "free")
+    except ValueError:
         raise HTTPException(status_code=400, detail="User already exists")
-
-    fake_users_db[form.username] = {
-        "username": form.username,
-        "password": form.password,
-        "role": "free"  # Yeni kayıt olanlar free başlar
-    }
     return {"message": "User registered successfully"}
 
 # ⭐ PREMIUM-ONLY ENDPOINT
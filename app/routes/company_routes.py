@@ -1,10 +1,28 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Query, Response
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from app.database.database import run_db
 from app.models.company import Company
 
 router = APIRouter()
 
+
+def list_companies(db: Session, limit: int, cursor: Optional[str]):
+    query = db.query(Company.symbol, Company.name)
+    if cursor:
+        query = query.filter(Company.symbol > cursor)
+    return query.order_by(Company.symbol).limit(limit + 1).all()
+
+
 @router.get("/companies", tags=["Companies"])
-def get_all_companies(db: Session = Depends(get_db)):
-    return db.query(Company).limit(1000).all()
+async def get_all_companies(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None  # önceki yanıtın X-Next-Cursor başlığı (son sembol)
+):
+    rows = await run_db(list_companies, limit, cursor)
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = rows[-1].symbol
+    return [{"symbol": r.symbol, "name": r.name} for r in rows]
@@ -1,15 +1,33 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database.database import get_db
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.database.database import run_db
 from app.auth.auth_service import get_current_user
 from app.services.history_service import get_user_history
 
 router = APIRouter()
 
 @router.get("/history")
-def get_history(
-    db: Session = Depends(get_db),
+async def get_history(
+    response: Response,
     current_user: dict = Depends(get_current_user),
-    limit: int = 10
+    limit: int = Query(10, ge=1, le=500),
+    fields: Optional[str] = None,  # ör. "symbol,created_at,decision"
+    cursor: Optional[str] = None,  # önceki yanıtın X-Next-Cursor başlığı
+    symbol: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
 ):
-    return get_user_history(db, current_user["username"], limit)
+    # Write-behind tampondaki kayıtlar en geç history_flush_seconds sonra görünür
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        records, next_cursor = await run_db(
+            get_user_history, current_user["username"], limit, selected,
+            cursor=cursor, symbol=symbol, start_date=start_date, end_date=end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return records
@@ -0,0 +1,53 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.auth.auth_service import token_cache
+from app.plot.chart_renderer import chart_cache, render_executor
+from app.logging_config import logging_stats
+from app.services.executors import cpu_executor, io_executor, market_executor
+from app.services.history_writer import history_writer
+from app.services.indicator_cache import indicator_cache
+from app.services.rate_limiter import rate_limiter
+from app.services.upstream_budget import upstream_budget
+from app.services.metrics import gauge_lines, request_duration, stage_duration
+from app.services.single_flight import single_flight_stats
+from app.services.streaming_indicators import streaming_indicators
+
+router = APIRouter()
+
+# 📈 Prometheus metin formatı
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    caches = {
+        "indicators": indicator_cache.stats(),
+        "charts": chart_cache.stats(),
+        "streaming": streaming_indicators.stats(),
+        "auth_tokens": token_cache.stats(),
+    }
+    executors = [io_executor, market_executor, cpu_executor, render_executor]
+
+    lines = stage_duration.render() + request_duration.render()
+    lines += gauge_lines("finance_cache", "Cache statistics.", [
+        ({"cache": cache, "stat": stat}, value)
+        for cache, stats in caches.items() for stat, value in stats.items()
+    ])
+    lines += gauge_lines("finance_single_flight", "Single-flight call statistics.", [
+        ({"flight": flight, "stat": stat}, value)
+        for flight, stats in single_flight_stats().items() for stat, value in stats.items()
+    ])
+    lines += gauge_lines("finance_executor", "Bounded executor queue statistics.", [
+        ({"executor": executor.name, "stat": stat}, value)
+        for executor in executors for stat, value in executor.stats().items()
+    ])
+    lines += gauge_lines("finance_history_writer", "Write-behind history buffer.", [
+        ({"stat": stat}, value) for stat, value in history_writer.stats().items()
+    ])
+    lines += gauge_lines("finance_rate_limiter", "Per-user and global rate limiter decisions.", [
+        ({"stat": stat}, value) for stat, value in rate_limiter.stats().items()
+    ])
+    lines += gauge_lines("finance_upstream_budget", "Upstream provider request budget and queue depth.", [
+        ({"stat": stat}, value) for stat, value in upstream_budget.stats().items()
+    ])
+    lines += gauge_lines("finance_log_queue", "Log queue depth and dropped records.", [
+        ({"stat": stat}, value) for stat, value in logging_stats().items()
+    ])
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
@@ -1,16 +1,46 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from app.plot.plot_utils import plot_stock_chart
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+from app.plot.chart_renderer import chart_key, render_chart
+from app.plot.plot_utils import PRICE_CHART_SIZE
 from app.services.data_service import get_stock_data_for_plot
+from app.services.executors import run_market
 
 router = APIRouter()
 
+def _chart_size(width: Optional[float], height: Optional[float]):
+    if width is None and height is None:
+        return None
+    return (width or PRICE_CHART_SIZE[0], height or PRICE_CHART_SIZE[1])
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match: "a", W/"b" ya da *; zayıf karşılaştırma (W/ öneki yok sayılır)
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag == "*" or tag.removeprefix("W/") == etag for tag in tags)
+
 @router.get("/plot/{symbol}")
-async def plot_symbol(symbol: str):
-    data = get_stock_data_for_plot(symbol.upper())
+async def plot_symbol(
+    symbol: str,
+    request: Request,
+    width: Optional[float] = Query(None, ge=2, le=20),
+    height: Optional[float] = Query(None, ge=2, le=12),
+):
+    symbol = symbol.upper()
+    data = await run_market(get_stock_data_for_plot, symbol)
 
     if data is None or data.empty:
         raise HTTPException(status_code=404, detail="No data available for this symbol.")
 
-    buffer = plot_stock_chart(data, symbol.upper())
-    return StreamingResponse(buffer, media_type="image/png")
+    # Veri değişmediyse tarayıcıdaki kopya geçerli
+    size = _chart_size(width, height)
+    etag = f'"{chart_key("price", data, symbol, size)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    # Aynı grafik için eşzamanlı istekler tek çizimi paylaşır (chart_renderer)
+    png, _ = await render_chart("price", data, symbol, size)
+    return Response(content=png, media_type="image/png", headers=headers)
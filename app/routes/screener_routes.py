@@ -1,58 +1,58 @@
-from fastapi import APIRouter
+import asyncio
+import threading
+from fastapi import APIRouter, Depends, Request, Response
 from typing import Optional
-import yfinance as yf
-import pandas as pd
-import os
-from app.services.stock_analysis import calculate_all_indicators
+from app.config import settings
+from app.services.screener_engine import run_screen
+from app.services.bar_store import bar_store_provider
+from app.services.executors import run_io, run_market
+from app.services.rate_limiter import rate_limit
+from app.services.universe import universe_symbols
 
 router = APIRouter(prefix="/screener", tags=["Screener"])
 
-# 🔽 CSV'den sembol listesi çek
-def load_symbols_from_csv():
-    csv_path = os.path.join(os.path.dirname(__file__), "../data/companylist.csv")
-    df = pd.read_csv(csv_path)
-    return df["Symbol"].dropna().unique().tolist()
-
-STOCK_SYMBOLS = load_symbols_from_csv()
-
-@router.get("/")
-def screener(
+# Tarama çok sayıda sembole dokunduğu için kotadan daha fazla jeton düşer
+@router.get("/", dependencies=[Depends(rate_limit(settings.rate_limit_screener_cost))])
+async def screener(
+    request: Request,
+    response: Response,
     rsi_lt: Optional[float] = None,
     macd_gt: Optional[float] = None,
     sma_lt: Optional[float] = None,
     sma_gt: Optional[float] = None,
+    deadline: float = 30.0,
 ):
-    results = []
-
-    for symbol in STOCK_SYMBOLS:
-        try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period="3mo", interval="1d")
-
-            if df.empty:
-                continue
-
-            df = calculate_all_indicators(df, selected_indicators=["sma", "rsi", "macd"])
-            latest = df.iloc[-1]
-
-            if rsi_lt is not None and latest.get("RSI_14", 100) >= rsi_lt:
-                continue
-            if macd_gt is not None and latest.get("MACD", -999) <= macd_gt:
-                continue
-            if sma_lt is not None and latest.get("SMA_14", 9999) >= sma_lt:
-                continue
-            if sma_gt is not None and latest.get("SMA_14", -1) <= sma_gt:
-                continue
-
-            results.append({
-                "symbol": symbol,
-                "rsi": round(latest.get("RSI_14", 0), 2),
-                "macd": round(latest.get("MACD", 0), 2),
-                "sma": round(latest.get("SMA_14", 0), 2),
-                "close": round(latest.get("Close", 0), 2)
-            })
-
-        except Exception:
-            continue
-
-    return results
+    cancel_event = threading.Event()
+
+    # İstemci bağlantıyı koparırsa taramayı durdur
+    async def watch_disconnect():
+        while not cancel_event.is_set():
+            if await request.is_disconnected():
+                cancel_event.set()
+                return
+            await asyncio.sleep(0.5)
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        # 🔽 Sembol evreni (companies tablosu, süreç başına bir kez okunur)
+        symbols = await run_io(universe_symbols)
+        report = await run_market(
+            run_screen,
+            symbols,
+            rsi_lt=rsi_lt,
+            macd_gt=macd_gt,
+            sma_lt=sma_lt,
+            sma_gt=sma_gt,
+            provider=bar_store_provider,
+            deadline=deadline,
+            cancel_event=cancel_event,
+        )
+    finally:
+        cancel_event.set()
+        watcher.cancel()
+
+    # Sağlayıcı bütçesi süre içinde yetmediyse kısmi rapor döner (skipped_reasons.rate_limited);
+    # çekilen barlar depoda kaldığı için Retry-After sonrası tekrar tarama kaldığı yerden devam eder
+    if report.retry_after is not None:
+        response.headers["Retry-After"] = str(report.retry_after)
+    return report.to_dict()
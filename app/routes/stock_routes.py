@@ -1,13 +1,20 @@
 from typing import Optional
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-import yfinance as yf
-
 from app.services import stock_analysis
+from app.services.async_data import analysis_flight, compute_indicators, fetch_bars
+from app.services.single_flight import single_flight_stats
+from app.services.executors import RateLimited, ServerBusy, run_cpu
+from app.services.indicator_cache import indicator_cache
+from app.plot.chart_renderer import chart_cache
+from app.services.streaming_indicators import streaming_indicators
+from app.services.company_search import company_index
 from app.auth.auth_service import get_current_user
-from app.database.database import get_db
-from app.services.history_service import save_analysis
+from app.services.history_writer import history_writer
+from app.services.rate_limiter import rate_limit
 from app.ml.ai_utils import predict_ai_decision
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter(
     prefix="/stocks",
@@ -15,94 +22,111 @@ router = APIRouter(
 )
 
 # Tüm göstergeler burada
-ALL_INDICATORS = [
-    "sma", "ema", "rsi", "macd", "z_score", "bollinger",
-    "cci", "adx", "stochastic", "williams", "obv", "atr"
-]
+ALL_INDICATORS = stock_analysis.ALL_INDICATORS
+
+# 📊 Gösterge önbelleği istatistikleri
+@router.get("/cache/stats")
+def cache_stats():
+    return {
+        "indicators": indicator_cache.stats(),
+        "charts": chart_cache.stats(),
+        "streaming": streaming_indicators.stats(),
+        "company_search": company_index.stats(),
+        "single_flight": single_flight_stats()
+    }
+
 
 # ✅ Hafif analiz için - sadece frontend grafik veya hızlı veri gösterimi için
-@router.get("/{symbol}")
-def get_stock_data(
+@router.get("/{symbol}", dependencies=[Depends(rate_limit())])
+async def get_stock_data(
     symbol: str,
     period: Optional[str] = "1y",
     interval: Optional[str] = "1d"
 ):
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=period, interval=interval)
+        hist = await fetch_bars(symbol, interval=interval, period=period)
 
         if hist.empty:
             return {"error": "No data found for this symbol."}
 
+        hist = await compute_indicators(symbol, interval, hist, ["sma", "ema", "rsi", "macd"])
         hist.reset_index(inplace=True)
         hist["Date"] = hist["Date"].astype(str)
 
-        hist = stock_analysis.calculate_sma(hist)
-        hist = stock_analysis.calculate_ema(hist)
-        hist = stock_analysis.calculate_rsi(hist)
-        hist = stock_analysis.calculate_macd(hist)
-
         return hist[[
             "Date", "Close", "SMA_20", "EMA_20", "RSI_14", "MACD", "MACD_signal"
         ]].dropna().to_dict(orient="records")
 
+    except (ServerBusy, RateLimited):
+        raise
     except Exception as e:
         return {"error": str(e)}
 
 
+def build_analysis(symbol: str, hist) -> dict:
+    hist.reset_index(inplace=True)
+    hist["Date"] = hist["Date"].astype(str)
+    latest_values = stock_analysis.extract_latest_values(hist)
+    signals = stock_analysis.generate_signals(latest_values)
+    decision = stock_analysis.calculate_weighted_decision(signals)
+
+    result = {
+        "symbol": symbol.upper(),
+        "latest": latest_values,
+        "signals": signals,
+        "final_decision": decision
+    }
+
+    # AI tahmini
+    try:
+        ai_result = predict_ai_decision(hist)
+        result["ai"] = ai_result
+
+    except Exception as ai_error:
+        logger.warning(f"AI tahmini başarısız: {ai_error}", extra={"symbol": symbol.upper()})
+        result["ai"] = {
+            "error": "AI prediction failed"
+        }
+
+    return result
+
+
+async def run_analysis(symbol: str, interval: str, period: str, start_date: Optional[str], end_date: Optional[str]):
+    if start_date and end_date:
+        hist = await fetch_bars(symbol, interval=interval, start=start_date, end=end_date)
+    else:
+        hist = await fetch_bars(symbol, interval=interval, period=period)
+
+    if hist.empty:
+        return None
+
+    logger.debug("Manuel analiz çağrısı", extra={"symbol": symbol.upper()})
+
+    # Tüm teknik göstergeleri hesapla (aynı son bar için önbellekten)
+    hist = await compute_indicators(symbol, interval, hist, ALL_INDICATORS)
+    return await run_cpu(build_analysis, symbol, hist)
+
+
 # ✅ Tüm göstergelerle AI destekli tam analiz
-@router.get("/analyze/{symbol}")
-def analyze(
+@router.get("/analyze/{symbol}", dependencies=[Depends(rate_limit())])
+async def analyze(
     symbol: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     period: Optional[str] = "6mo",
     interval: Optional[str] = "1d",
-    db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        ticker = yf.Ticker(symbol)
-        if start_date and end_date:
-            hist = ticker.history(start=start_date, end=end_date, interval=interval)
-        else:
-            hist = ticker.history(period=period, interval=interval)
+        # Aynı sembol/aralık için eşzamanlı analizler tek hesaplamayı paylaşır
+        key = (symbol.upper(), interval, period, start_date, end_date)
+        result = await analysis_flight.do(key, run_analysis, symbol, interval, period, start_date, end_date)
 
-        if hist.empty:
+        if result is None:
             return {"error": "No data found."}
 
-        hist.reset_index(inplace=True)
-        hist["Date"] = hist["Date"].astype(str)
-
-        print(" MANUEL ANALIZ ÇAĞRISI:", symbol)
-
-        # Tüm teknik göstergeleri hesapla
-        hist = stock_analysis.calculate_all_indicators(hist, selected_indicators=ALL_INDICATORS)
-        latest_values = stock_analysis.extract_latest_values(hist)
-        signals = stock_analysis.generate_signals(latest_values)
-        decision = stock_analysis.calculate_weighted_decision(signals)
-
-        result = {
-            "symbol": symbol.upper(),
-            "latest": latest_values,
-            "signals": signals,
-            "final_decision": decision
-        }
-
-        # AI tahmini
-        try:
-            ai_result = predict_ai_decision(hist)
-            result["ai"] = ai_result
-
-        except Exception as ai_error:
-            print(f" AI tahmini başarısız: {ai_error}")
-            result["ai"] = {
-                "error": "AI prediction failed"
-            }
-
-        # Veritabanına analiz kaydı
-        save_analysis(
-            db=db,
+        # Veritabanına analiz kaydı (arka planda toplu yazılır; istek beklemez)
+        history_writer.enqueue(
             username=current_user["username"],
             symbol=symbol,
             indicators=ALL_INDICATORS,
@@ -111,6 +135,8 @@ def analyze(
 
         return result
 
+    except (ServerBusy, RateLimited):
+        raise
     except Exception as e:
-        print(" HATA:", str(e))
+        logger.exception(f"Analysis failed for {symbol}: {e}")
         return {"error": str(e)}
@@ -1,13 +1,13 @@
-import yfinance as yf
 import pandas as pd
-import joblib
-import os
-from sklearn.ensemble import RandomForestClassifier
-from typing import Tuple
+from typing import List, Tuple
+from app.services.bar_store import bar_store
+from app.services.indicator_cache import cached_indicators
+from app.services.stock_analysis import ALL_INDICATORS
+from app.ml.model_registry import MODEL_PATH, get_model
+from app.ml.ai_utils import predict_ai_decisions
+from app.logging_config import get_logger
 
-#  Eğitimli modeli yükle
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "ml", "ai_stock_model.joblib")
-model: RandomForestClassifier = joblib.load(MODEL_PATH)
+logger = get_logger(__name__)
 
 def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df["SMA_14"] = df["Close"].rolling(window=14).mean()
@@ -27,7 +27,7 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 def predict_ai_signal(symbol: str) -> Tuple[str, float]:
-    df = yf.download(symbol, period="6mo", interval="1d", auto_adjust=True)
+    df = bar_store.get_bars(symbol, interval="1d", period="6mo")
 
     if df.empty or "Close" not in df.columns:
         return "Unknown", 0.0
@@ -36,11 +36,41 @@ def predict_ai_signal(symbol: str) -> Tuple[str, float]:
     df = df.dropna().copy()
 
     try:
+        #  Eğitimli model (paylaşılan kayıt defterinden)
+        model = get_model(MODEL_PATH)
         latest = df.iloc[-1][["Close", "SMA_14", "RSI_14", "MACD", "Signal", "Upper_BB", "Lower_BB"]]
         input_data = latest.values.reshape(1, -1)
         prediction = model.predict(input_data)[0]
         confidence = max(model.predict_proba(input_data)[0])
         return prediction, round(confidence, 2)
     except Exception as e:
-        print(f" Prediction error: {e}")
+        logger.warning(f"Prediction error for {symbol}: {e}")
         return "Error", 0.0
+
+def predict_ai_signals_batch(symbols: List[str]) -> List[dict]:
+    # Tüm semboller tek seferde depodan okunur, özellikler tek matriste skorlanır
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    frames = bar_store.get_many(symbols, interval="1d", period="6mo")
+
+    features = {}
+    for symbol in symbols:
+        df = frames.get(symbol)
+        if df is None or df.empty:
+            features[symbol] = pd.DataFrame()
+            continue
+        features[symbol] = cached_indicators(symbol, "1d", df, ALL_INDICATORS)
+
+    decisions = predict_ai_decisions(features)
+
+    results = []
+    for symbol in symbols:
+        decision = decisions[symbol]
+        if "error" in decision:
+            results.append({"symbol": symbol, "error": decision["error"]})
+        else:
+            results.append({
+                "symbol": symbol,
+                "ai_prediction": decision["signal"],
+                "confidence": decision["confidence"]
+            })
+    return results
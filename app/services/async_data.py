@@ -0,0 +1,46 @@
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.services.bar_store import bar_store
+from app.services.executors import run_cpu, run_market
+from app.services.indicator_cache import cached_indicators, indicator_cache
+from app.services.single_flight import AsyncSingleFlight
+
+
+# Route'lar için asenkron veri erişimi: bar deposu/sağlayıcı G/Ç market executor'da,
+# gösterge hesabı cpu executor'da çalışır; event loop hiç bloklanmaz.
+# Aynı anahtar için eşzamanlı istekler tek bir işi bekler (single-flight).
+
+bars_flight = AsyncSingleFlight("bars")
+indicators_flight = AsyncSingleFlight("indicators")
+analysis_flight = AsyncSingleFlight("analysis")
+
+async def fetch_bars(
+    symbol: str,
+    interval: str = "1d",
+    period: Optional[str] = "6mo",
+    start=None,
+    end=None,
+) -> pd.DataFrame:
+    key = (symbol.upper(), interval, period, str(start), str(end))
+    return await bars_flight.do(
+        key, run_market, bar_store.get_bars, symbol, interval=interval, period=period, start=start, end=end
+    )
+
+
+async def fetch_many(
+    symbols: List[str],
+    interval: str = "1d",
+    period: Optional[str] = "6mo",
+) -> Dict[str, pd.DataFrame]:
+    return await run_market(bar_store.get_many, symbols, interval=interval, period=period)
+
+
+async def compute_indicators(symbol: str, interval: str, hist: pd.DataFrame, selected_indicators: List[str]) -> pd.DataFrame:
+    if hist.empty:
+        return await run_cpu(cached_indicators, symbol, interval, hist, selected_indicators)
+    key = indicator_cache.make_key(symbol, interval, hist, selected_indicators)
+    result = await indicators_flight.do(key, run_cpu, cached_indicators, symbol, interval, hist, selected_indicators)
+    # Paylaşılan sonuç; her çağıran kendi sığ kopyasını alır
+    return result.copy(deep=False)
@@ -0,0 +1,293 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.logging_config import get_logger
+from app.services.market_data import DataProvider, OHLCV_COLUMNS, default_provider
+from app.services.upstream_budget import PacedProvider, upstream_budget
+from app.services.metrics import span, timed
+from app.services.single_flight import SingleFlight
+
+logger = get_logger(__name__)
+
+BAR_STORE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "bars"))
+
+# Son bar bu süreden eskiyse sağlayıcıdan yalnızca eksik kuyruk çekilir (saniye)
+DEFAULT_REFRESH_AFTER = {
+    "1m": 30,
+    "2m": 60,
+    "5m": 120,
+    "15m": 300,
+    "30m": 300,
+    "60m": 300,
+    "1h": 300,
+    "1d": 900,
+    "5d": 3600,
+    "1wk": 3600,
+    "1mo": 3600,
+}
+
+# Sağlayıcı boş yanıt döndürdüğünde (hatalı/delist sembol) bu süre boyunca tekrar sorulmaz (saniye)
+EMPTY_TTL = 900
+
+# period="max" ile çekilen seriler tüm geçmişi kapsar
+_ALL_HISTORY = -(2 ** 62)
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+# Sembol dizin adı olarak kullanıldığı için yalnızca ticker karakterlerine izin verilir ("BRK-B", "^GSPC", "EURUSD=X")
+_SYMBOL_RE = re.compile(r"^[A-Z0-9^][A-Z0-9.\-^=]{0,14}$")
+
+
+def valid_symbol(symbol: str) -> bool:
+    return bool(_SYMBOL_RE.match(symbol))
+
+
+def period_start(period: Optional[str], now: pd.Timestamp) -> Optional[pd.Timestamp]:
+    if period is None or period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz="UTC")
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    amount, unit = int(match.group(1)), match.group(2)
+    return (now - pd.DateOffset(**{_PERIOD_UNITS[unit]: amount})).normalize()
+
+
+def _to_utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+def _to_seconds(ts: Optional[pd.Timestamp]) -> int:
+    return _ALL_HISTORY if ts is None else int(ts.value // 1_000_000_000)
+
+
+def _frame_to_array(df: pd.DataFrame) -> np.ndarray:
+    index = df.index
+    if index.tz is not None:
+        index = index.tz_convert("UTC")
+    seconds = index.as_unit("s").asi8.astype("float64")
+    values = df.reindex(columns=OHLCV_COLUMNS).to_numpy(dtype="float64")
+    return np.column_stack([seconds, values])
+
+
+def _array_to_frame(array: np.ndarray, tz: Optional[str]) -> pd.DataFrame:
+    index = pd.to_datetime(array[:, 0].astype("int64"), unit="s", utc=True)
+    index = index.tz_convert(tz) if tz else index.tz_localize(None)
+    index.name = "Date"
+    return pd.DataFrame(np.array(array[:, 1:]), index=index, columns=OHLCV_COLUMNS)
+
+
+def _merge(existing: Optional[np.ndarray], fresh: np.ndarray) -> np.ndarray:
+    # Çakışan zaman damgalarında yeni gelen bar geçerlidir (gün içi kısmi barlar güncellenir)
+    if existing is None or len(existing) == 0:
+        merged = fresh
+    else:
+        keep = ~np.isin(existing[:, 0], fresh[:, 0])
+        merged = np.concatenate([existing[keep], fresh])
+    return merged[np.argsort(merged[:, 0], kind="stable")]
+
+
+# (symbol, interval) başına diskte tek bir bars.npy: [ts_saniye, Open, High, Low, Close, Volume].
+# Okumalar mmap ile yapılır, istenen aralık dışındaki satırlar belleğe kopyalanmaz.
+class BarStore:
+    def __init__(
+        self,
+        root: str = BAR_STORE_DIR,
+        provider: Optional[DataProvider] = None,
+        refresh_after: Optional[Dict[str, int]] = None,
+        fetch_chunk: int = 50,
+        empty_ttl: int = EMPTY_TTL,
+    ):
+        self.root = os.path.realpath(root)
+        # Varsayılan sağlayıcı ortak dış istek bütçesiyle sıraya sokulur
+        self.provider = provider or PacedProvider(default_provider, upstream_budget)
+        self.refresh_after = {**DEFAULT_REFRESH_AFTER, **(refresh_after or {})}
+        self.fetch_chunk = fetch_chunk
+        self.empty_ttl = empty_ttl
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._flight = SingleFlight("bar_store_refresh")
+
+    # --- Disk ---
+
+    def _dir(self, symbol: str, interval: str) -> str:
+        directory = os.path.realpath(os.path.join(self.root, interval, symbol))
+        if os.path.commonpath([self.root, directory]) != self.root or directory == self.root:
+            raise ValueError(f"Invalid bar store path: {interval}/{symbol}")
+        return directory
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    def _load(self, symbol: str, interval: str, mmap: bool = True):
+        directory = self._dir(symbol, interval)
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return None, {}
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        bars_path = os.path.join(directory, "bars.npy")
+        array = np.load(bars_path, mmap_mode="r" if mmap else None) if os.path.exists(bars_path) else None
+        return array, meta
+
+    def _save(self, symbol: str, interval: str, array: Optional[np.ndarray], meta: dict):
+        directory = self._dir(symbol, interval)
+        os.makedirs(directory, exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        # array None ise yalnızca meta.json yazılır (negatif kayıt), mevcut bars.npy korunur
+        if array is not None:
+            bars_tmp = os.path.join(directory, "bars.npy" + suffix)
+            with open(bars_tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(array, dtype="float64"))
+            os.replace(bars_tmp, os.path.join(directory, "bars.npy"))
+
+        meta_tmp = os.path.join(directory, "meta.json" + suffix)
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_tmp, os.path.join(directory, "meta.json"))
+
+    # --- Okuma / yenileme ---
+
+    def _plan(self, array, meta, interval: str, want_from: int, want_until: Optional[int], now: float):
+        if meta.get("empty_until", 0) > now:
+            return None
+        fresh = now - meta.get("refreshed_at", 0) < self.refresh_after.get(interval, 900)
+        covered = meta.get("covered_from", None) is not None and meta["covered_from"] <= want_from
+
+        if not covered:
+            return ("full", None)
+        if array is None or len(array) == 0:
+            return None if fresh else ("full", None)
+
+        last = int(array[-1, 0])
+        if want_until is not None and want_until <= last:
+            return None
+        if fresh:
+            return None
+        return ("tail", last)
+
+    def _store_fetched(self, symbol, interval, fetched, kind, want_from, now):
+        with self._lock(symbol, interval):
+            # Üzerine yazılacak dosya mmap ile açık tutulmasın
+            array, meta = self._load(symbol, interval, mmap=False)
+            if fetched is None or fetched.empty:
+                # Boş tam çekim (hatalı/delist sembol) seriye dokunmadan kısa süreli negatif kayıt bırakır;
+                # boş kuyruk (tatil, piyasa kapalı) mevcut seriyi yalnızca tazelenmiş sayar
+                if kind == "full" or array is None:
+                    meta["interval"] = interval
+                    meta["empty_until"] = now + self.empty_ttl
+                    self._save(symbol, interval, None, meta)
+                    return
+            else:
+                meta.pop("empty_until", None)
+                if kind == "full":
+                    array = None
+                meta["tz"] = str(fetched.index.tz) if fetched.index.tz is not None else None
+                array = _merge(array, _frame_to_array(fetched))
+
+            if kind == "full":
+                meta["covered_from"] = want_from
+            meta["interval"] = interval
+            meta["refreshed_at"] = now
+            self._save(symbol, interval, array, meta)
+
+    def _refresh(self, group, interval, kind, last, want_start, want_from, now):
+        # Büyük gruplar parça parça çekilip yazılır; bütçe (RateLimited) ortada keserse önceki parçalar kalır
+        for i in range(0, len(group), self.fetch_chunk):
+            self._refresh_chunk(group[i:i + self.fetch_chunk], interval, kind, last, want_start, want_from, now)
+
+    def _refresh_chunk(self, group, interval, kind, last, want_start, want_from, now):
+        if kind == "full":
+            with span("fetch"):
+                if want_start is None:
+                    fetched = self.provider.fetch(group, period="max", interval=interval)
+                else:
+                    fetched = self.provider.fetch(group, interval=interval, start=want_start)
+        else:
+            # Kuyruk yenilenemezse eldeki (bayat) veriyle devam edilir
+            since = pd.Timestamp(last, unit="s", tz="UTC")
+            try:
+                with span("fetch"):
+                    fetched = self.provider.fetch(group, interval=interval, start=since)
+            except Exception as e:
+                logger.warning(f"Bar store tail refresh failed for {len(group)} symbols ({interval}): {e}")
+                return
+        for symbol in group:
+            self._store_fetched(symbol, interval, fetched.get(symbol), kind, want_from, now)
+
+    @timed("bars")
+    def get_many(
+        self,
+        symbols: List[str],
+        interval: str = "1d",
+        period: Optional[str] = "6mo",
+        start=None,
+        end=None,
+    ) -> Dict[str, pd.DataFrame]:
+        if interval not in self.refresh_after:
+            raise ValueError(f"Unsupported interval: {interval}")
+        symbols = [s.upper() for s in symbols]
+        invalid = [s for s in symbols if not valid_symbol(s)]
+        if invalid:
+            logger.warning(f"Bar store skipped {len(invalid)} invalid symbols: {invalid[:5]}")
+            symbols = [s for s in symbols if valid_symbol(s)]
+        now_ts = pd.Timestamp.now(tz="UTC")
+        now = time.time()
+        want_start = _to_utc(start) if start is not None else period_start(period, now_ts)
+        want_end = _to_utc(end) if end is not None else None
+        want_from = _to_seconds(want_start)
+        want_until = None if want_end is None else _to_seconds(want_end)
+
+        # Aynı başlangıca ihtiyaç duyan semboller tek istekte çekilir
+        groups = defaultdict(list)
+        for symbol in symbols:
+            array, meta = self._load(symbol, interval)
+            plan = self._plan(array, meta, interval, want_from, want_until, now)
+            if plan is not None:
+                groups[plan].append(symbol)
+
+        # Aynı yenilemeyi eşzamanlı isteyen çağrılar tek sağlayıcı isteğini paylaşır
+        for (kind, last), group in groups.items():
+            key = (interval, kind, last if kind == "tail" else want_from, tuple(group))
+            self._flight.do(key, self._refresh, group, interval, kind, last, want_start, want_from, now)
+
+        frames = {}
+        for symbol in symbols:
+            array, meta = self._load(symbol, interval)
+            if array is None or len(array) == 0:
+                continue
+            lo = np.searchsorted(array[:, 0], want_from, side="left")
+            hi = len(array) if want_until is None else np.searchsorted(array[:, 0], want_until, side="left")
+            if hi > lo:
+                frames[symbol] = _array_to_frame(array[lo:hi], meta.get("tz"))
+        return frames
+
+    def get_bars(self, symbol: str, interval: str = "1d", period: Optional[str] = "6mo", start=None, end=None) -> pd.DataFrame:
+        frames = self.get_many([symbol], interval=interval, period=period, start=start, end=end)
+        return frames.get(symbol.upper(), pd.DataFrame(columns=OHLCV_COLUMNS))
+
+
+# Ekran tarayıcısı gibi DataProvider bekleyen kodlar için bar deposunu sağlayıcı olarak sunar
+class BarStoreProvider(DataProvider):
+    def __init__(self, store: BarStore):
+        self.store = store
+
+    def fetch(self, symbols, period="3mo", interval="1d", start=None, end=None):
+        return self.store.get_many(symbols, interval=interval, period=period, start=start, end=end)
+
+
+bar_store = BarStore()
+bar_store_provider = BarStoreProvider(bar_store)
@@ -0,0 +1,169 @@
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, List, Optional
+
+from app.database.database import SessionLocal
+from app.logging_config import get_logger
+from app.models.company import Company
+
+logger = get_logger(__name__)
+
+# Şirket adı/sembol araması için bellek içi indeks (companies tablosundan kurulur):
+#   - sembol öneki ve ad kelimesi öneki: sıralı listelerde bisect
+#   - bulanık eşleşme: kelime trigram'ları üzerinde ters indeks (pg_trgm benzeri), Dice benzerliği
+# Sonuçlar katmanlı puanla sıralanır: tam sembol > ad öneki > sembol öneki > kelime öneki > alt dize > bulanık.
+
+MIN_FUZZY_SIMILARITY = 0.4
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def trigrams(text: str) -> set:
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _prefix_range(keys: list, prefix: str) -> range:
+    start = bisect_left(keys, prefix)
+    end = bisect_left(keys, prefix + "￿", lo=start)
+    return range(start, end)
+
+
+class _Snapshot:
+    def __init__(self, rows: list):
+        self.symbols = [symbol for symbol, _ in rows]
+        self.names = [name for _, name in rows]
+        self.normalized = [normalize(name) for name in self.names]
+
+        by_symbol = sorted((symbol.upper(), i) for i, symbol in enumerate(self.symbols))
+        self.symbol_keys = [s for s, _ in by_symbol]
+        self.symbol_ids = [i for _, i in by_symbol]
+
+        by_name = sorted((name, i) for i, name in enumerate(self.normalized))
+        self.name_keys = [n for n, _ in by_name]
+        self.name_ids = [i for _, i in by_name]
+
+        words = sorted({(word, i) for i, name in enumerate(self.normalized) for word in name.split()})
+        self.word_keys = [w for w, _ in words]
+        self.word_ids = [i for _, i in words]
+
+        self.gram_counts = []
+        postings = defaultdict(list)
+        for i, name in enumerate(self.normalized):
+            grams = trigrams(name)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(i)
+        self.postings = dict(postings)
+
+
+class CompanySearchIndex:
+    def __init__(self, loader: Optional[Callable[[], list]] = None):
+        self.loader = loader or _load_companies
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = threading.Lock()
+        self.build_seconds = 0.0
+        self.queries = 0
+
+    def refresh(self, rows: Optional[list] = None):
+        # Yeni indeks kurulup tek atamayla devreye girer; aramalar kilitsiz devam eder
+        started = time.perf_counter()
+        snapshot = _Snapshot(rows if rows is not None else self.loader())
+        self._snapshot = snapshot
+        self.build_seconds = time.perf_counter() - started
+        logger.info(f"Company search index built: {len(snapshot.symbols)} companies in {self.build_seconds * 1e3:.1f} ms")
+
+    def _ready(self) -> _Snapshot:
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self.refresh()
+        return self._snapshot
+
+    def search(self, query: str, limit: int = 5) -> List[dict]:
+        index = self._ready()
+        self.queries += 1
+        q = normalize(query)
+        symbol_q = query.strip().upper()
+        if not q and not symbol_q:
+            return []
+
+        scores = {}
+
+        def score(i: int, value: float):
+            if value > scores.get(i, 0.0):
+                scores[i] = value
+
+        for k in _prefix_range(index.symbol_keys, symbol_q):
+            i = index.symbol_ids[k]
+            # Kısa semboller önce (AAPL araması "AAPL" > "AAPLX")
+            score(i, 100.0 if index.symbol_keys[k] == symbol_q else 80.0 - min(len(index.symbol_keys[k]) - len(symbol_q), 9))
+
+        if q:
+            for k in _prefix_range(index.name_keys, q):
+                score(index.name_ids[k], 90.0)
+
+        # Üst katmanlardan en az limit kadar sonuç varsa alt katmanlar sıralamaya giremez
+        if q and len(scores) < limit:
+            for k in _prefix_range(index.word_keys, q.split()[0]):
+                i = index.word_ids[k]
+                if q in index.normalized[i]:
+                    score(i, 70.0)
+
+            # Bulanık: ortak trigram sayısı (yazım hataları, kelime ortası eşleşmeler)
+            grams = trigrams(q)
+            if len(q) >= 3 and grams and sum(1 for v in scores.values() if v > 60.0) < limit:
+                shared = defaultdict(int)
+                for gram in grams:
+                    for i in index.postings.get(gram, ()):
+                        shared[i] += 1
+                for i, count in shared.items():
+                    if q in index.normalized[i]:
+                        score(i, 60.0)
+                        continue
+                    similarity = 2.0 * count / (len(grams) + index.gram_counts[i])
+                    if similarity >= MIN_FUZZY_SIMILARITY:
+                        score(i, 50.0 * similarity)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], len(index.names[item[0]]), index.symbols[item[0]]))
+        return [
+            {"symbol": index.symbols[i], "name": index.names[i], "score": round(value, 2)}
+            for i, value in ranked[:limit]
+        ]
+
+    def best_match(self, query: str) -> Optional[dict]:
+        matches = self.search(query, limit=1)
+        return matches[0] if matches else None
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "companies": len(snapshot.symbols) if snapshot else 0,
+            "trigrams": len(snapshot.postings) if snapshot else 0,
+            "build_ms": round(self.build_seconds * 1e3, 2),
+            "queries": self.queries,
+        }
+
+
+def _load_companies() -> list:
+    db = SessionLocal()
+    try:
+        return db.query(Company.symbol, Company.name).all()
+    finally:
+        db.close()
+
+
+company_index = CompanySearchIndex()
@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from app.models.company import Company
+from app.services.company_search import company_index
 
 def get_symbol_by_company_name(db: Session, name: str):
-    return db.query(Company).filter(Company.name.ilike(f"%{name}%")).first()
+    # En iyi eşleşme bellek içi indeksten; kayıt veritabanından
+    match = company_index.best_match(name)
+    return db.get(Company, match["symbol"]) if match else None
@@ -18,6 +18,7 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from app.models.stock_model import TechnicalAnalysisResponse
+from app.services.bar_store import bar_store
 
 def calculate_rsi(close_prices: pd.Series, period: int = 14) -> float:
     delta = close_prices.diff()
@@ -32,8 +33,7 @@ def calculate_rsi(close_prices: pd.Series, period: int = 14) -> float:
     return round(rsi.iloc[-1], 2)
 
 def fetch_technical_analysis(symbol: str) -> TechnicalAnalysisResponse:
-    ticker = yf.Ticker(symbol)
-    hist = ticker.history(period="30d")
+    hist = bar_store.get_bars(symbol, interval="1d", period="30d")
 
     close_prices = hist["Close"]
 
@@ -48,11 +48,10 @@ def fetch_technical_analysis(symbol: str) -> TechnicalAnalysisResponse:
         moving_average_14=round(ma_14, 2),
         close_prices=[round(p, 2) for p in close_prices[-14:]]  # Son 14 günü listele
     )
-import yfinance as yf
 import pandas as pd
 
 def get_stock_data_for_plot(symbol: str) -> pd.DataFrame:
-    df = yf.download(symbol, period="6mo")
+    df = bar_store.get_bars(symbol, interval="1d", period="6mo")
 
     if df.empty:
         return None
@@ -0,0 +1,135 @@
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.config import settings
+
+
+# Kuyruk doluysa istek beklemek yerine 503 ile reddedilir (main.py'deki handler)
+class ServerBusy(Exception):
+    def __init__(self, executor_name: str, retry_after: int = 1):
+        super().__init__(f"{executor_name} executor is saturated")
+        self.executor_name = executor_name
+        self.retry_after = retry_after
+
+
+# Kullanıcı/global kovası ya da dış sağlayıcı bütçesi tükendi: 429 + Retry-After (main.py)
+class RateLimited(Exception):
+    def __init__(self, retry_after: float, scope: str = "user"):
+        self.retry_after = max(1, int(retry_after + 0.999))
+        self.scope = scope
+        super().__init__(f"Rate limit exceeded ({scope}), retry after {self.retry_after}s")
+
+
+# Bloklayan işleri event loop dışında çalıştırır; aynı anda en fazla max_pending iş kabul edilir.
+class BoundedExecutor:
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_pending: int,
+        queue_timeout: float,
+        executor: Optional[Executor] = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        # Süreç havuzunda contextvars taşınamaz (pickle edilemez)
+        self._in_process = isinstance(self._executor, ProcessPoolExecutor)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        slots = self._semaphore()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServerBusy(self.name)
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            if self._in_process:
+                call = functools.partial(fn, *args, **kwargs)
+            else:
+                # contextvars (istek bağlamı) işçi thread'ine taşınır
+                context = contextvars.copy_context()
+                call = functools.partial(context.run, fn, *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            self.in_flight -= 1
+            slots.release()
+
+    # Event loop dışından (thread içinden) doğrudan iş göndermek için; kuyruk sınırı uygulanmaz
+    def submit(self, fn: Callable, *args, **kwargs):
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Sağlayıcı / disk / veritabanı G/Ç
+io_executor = BoundedExecutor(
+    "io",
+    max_workers=settings.io_executor_workers,
+    max_pending=settings.io_executor_max_pending,
+    queue_timeout=settings.executor_queue_timeout,
+)
+
+# Bar deposu üzerinden dış sağlayıcıya gidebilen işler (bütçe beklemesi burada uyur)
+market_executor = BoundedExecutor(
+    "market",
+    max_workers=settings.market_executor_workers,
+    max_pending=settings.market_executor_max_pending,
+    queue_timeout=settings.executor_queue_timeout,
+)
+
+# Gösterge hesaplama ve grafik çizimi
+cpu_executor = BoundedExecutor(
+    "cpu",
+    max_workers=settings.cpu_executor_workers or os.cpu_count() or 4,
+    max_pending=settings.cpu_executor_max_pending,
+    queue_timeout=settings.executor_queue_timeout,
+)
+
+
+async def run_io(fn: Callable, *args, **kwargs):
+    return await io_executor.run(fn, *args, **kwargs)
+
+
+async def run_market(fn: Callable, *args, **kwargs):
+    return await market_executor.run(fn, *args, **kwargs)
+
+
+async def run_cpu(fn: Callable, *args, **kwargs):
+    return await cpu_executor.run(fn, *args, **kwargs)
+
+
+def shutdown_executors():
+    io_executor.shutdown()
+    market_executor.shutdown()
+    cpu_executor.shutdown()
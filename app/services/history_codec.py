@@ -0,0 +1,129 @@
+# app/services/history_codec.py
+
+import json
+import zlib
+from typing import Optional
+
+# Analiz sonucu satırda parçalanır: karar/güven ve son gösterge değerleri tipli sütunlara,
+# geri kalanı (sinyaller, hata mesajları ...) sıkıştırılmış tek bir blob'a yazılır.
+# Blob'un ilk baytı biçimi belirtir (şimdilik yalnızca JSON+zlib).
+
+JSON_ZLIB = 1
+
+# Bit sırası sabittir (yalnızca sona eklenir); eski kayıtların maskeleri bununla çözülür
+INDICATOR_BITS = [
+    "sma", "ema", "rsi", "macd", "z_score", "bollinger",
+    "cci", "adx", "stochastic", "williams", "obv", "atr",
+]
+
+LATEST_COLUMNS = [
+    "close", "sma", "ema", "rsi", "macd", "macd_signal",
+    "z_score", "bollinger_upper", "bollinger_lower",
+]
+
+
+def encode_indicators(indicators: list) -> int:
+    mask = 0
+    for name in indicators:
+        if name in INDICATOR_BITS:
+            mask |= 1 << INDICATOR_BITS.index(name)
+    return mask
+
+
+def decode_indicators(mask: Optional[int]) -> list:
+    return [name for i, name in enumerate(INDICATOR_BITS) if mask and mask & (1 << i)]
+
+
+def pack(obj) -> bytes:
+    return bytes([JSON_ZLIB]) + zlib.compress(json.dumps(obj, separators=(",", ":")).encode())
+
+
+def unpack(blob: Optional[bytes]):
+    if not blob:
+        return {}
+    if blob[0] != JSON_ZLIB:
+        raise ValueError(f"Unknown history payload format: {blob[0]}")
+    return json.loads(zlib.decompress(blob[1:]))
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+DECISION_TYPES = {"signal": lambda v: isinstance(v, str), "confidence": _is_number}
+LATEST_TYPES = {column: _is_number for column in LATEST_COLUMNS}
+
+
+def _split(part, types: dict):
+    # (tipli alanlar, geri kalanı); sütun tipine uymayan değerler blob'da kalır
+    if not isinstance(part, dict):
+        return {}, part
+    typed = {k: v for k, v in part.items() if k in types and types[k](v)}
+    rest = {k: v for k, v in part.items() if k not in typed}
+    return typed, rest
+
+
+def _decision(signal, confidence, rest: dict) -> dict:
+    decision = {"signal": signal}
+    if confidence is not None:
+        decision["confidence"] = confidence
+    return {**decision, **rest}
+
+
+def encode_result(symbol: str, result: dict) -> dict:
+    latest, latest_rest = _split(result.get("latest", {}), LATEST_TYPES)
+    decision, decision_rest = _split(result.get("final_decision", {}), DECISION_TYPES)
+    ai, ai_rest = _split(result.get("ai"), DECISION_TYPES)
+    # Karar sütunu boşsa güven de blob'da tutulur (tek başına okunamaz)
+    if "signal" not in decision:
+        decision, decision_rest = {}, result.get("final_decision", {})
+    if "signal" not in ai:
+        ai, ai_rest = {}, result.get("ai")
+
+    rest = {k: v for k, v in result.items() if k not in ("symbol", "latest", "final_decision", "ai")}
+    if result.get("symbol") != symbol:
+        rest["symbol"] = result.get("symbol")
+    if latest_rest:
+        rest["latest"] = latest_rest
+    if "final_decision" in result and (decision_rest or not decision):
+        rest["final_decision"] = decision_rest
+    if "ai" in result and (ai_rest or not ai):
+        rest["ai"] = ai_rest
+
+    return {
+        **{column: latest.get(column) for column in LATEST_COLUMNS},
+        "decision": decision.get("signal"),
+        "confidence": decision.get("confidence"),
+        "ai_decision": ai.get("signal"),
+        "ai_confidence": ai.get("confidence"),
+        "payload": pack(rest) if rest else None,
+    }
+
+
+def decode_latest(row) -> dict:
+    latest = {}
+    for column in LATEST_COLUMNS:
+        value = getattr(row, column)
+        if value is not None:
+            latest[column] = value
+    return latest
+
+
+def decode_result(row) -> dict:
+    rest = unpack(row.payload)
+    result = {"symbol": rest.pop("symbol", row.symbol)}
+    result["latest"] = {**decode_latest(row), **rest.pop("latest", {})}
+    for key, value in rest.items():
+        if key not in ("final_decision", "ai"):
+            result[key] = value
+
+    if row.decision is not None:
+        result["final_decision"] = _decision(row.decision, row.confidence, rest.get("final_decision", {}))
+    elif "final_decision" in rest:
+        result["final_decision"] = rest["final_decision"]
+
+    if row.ai_decision is not None:
+        result["ai"] = _decision(row.ai_decision, row.ai_confidence, rest.get("ai", {}))
+    elif "ai" in rest:
+        result["ai"] = rest["ai"]
+    return result
@@ -1,39 +1,109 @@
 # app/services/history_service.py
 
+import base64
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from app.models.analysis_history import AnalysisHistory
-import json
+from app.services.history_codec import LATEST_COLUMNS, decode_indicators, decode_latest, decode_result, encode_indicators, encode_result
+from app.services.metrics import timed
 
+def history_row(username: str, symbol: str, indicators: list, result: dict, created_at=None) -> dict:
+    # created_at uygulamada atanır; sunucu varsayılanı mikrosaniyesiz yazdığından keyset karşılaştırması bozulurdu
+    symbol = symbol.upper()
+    return {
+        "username": username,
+        "symbol": symbol,
+        "indicators_mask": encode_indicators(indicators),
+        "created_at": created_at or datetime.now(timezone.utc),
+        **encode_result(symbol, result),
+    }
+
+@timed("db_write")
 def save_analysis(db: Session, username: str, symbol: str, indicators: list, result: dict):
-    history = AnalysisHistory(
-        username=username,
-        symbol=symbol,
-        indicators=",".join(indicators),
-        result=json.dumps(result)
-    )
+    history = AnalysisHistory(**history_row(username, symbol, indicators, result))
     db.add(history)
     db.commit()
     db.refresh(history)
     return history
 
-import json
-from sqlalchemy.orm import Session
-from app.models.analysis_history import AnalysisHistory
+# Okunabilir alan -> gereken sütunlar; yalnızca istenen alanların sütunları sorgulanır
+HISTORY_FIELDS = {
+    "id": ["id"],
+    "username": ["username"],
+    "symbol": ["symbol"],
+    "indicators": ["indicators_mask"],
+    "created_at": ["created_at"],
+    "decision": ["decision", "confidence"],
+    "ai": ["ai_decision", "ai_confidence"],
+    "latest": LATEST_COLUMNS,
+    "result": ["symbol", "decision", "confidence", "ai_decision", "ai_confidence", *LATEST_COLUMNS, "payload"],
+}
+DEFAULT_FIELDS = ["id", "username", "symbol", "indicators", "created_at", "result"]
+
+
+def _field_value(row, field: str):
+    if field == "indicators":
+        return ",".join(decode_indicators(row.indicators_mask))
+    if field == "decision":
+        return {"signal": row.decision, "confidence": row.confidence} if row.decision is not None else None
+    if field == "ai":
+        return {"signal": row.ai_decision, "confidence": row.ai_confidence} if row.ai_decision is not None else None
+    if field == "latest":
+        return decode_latest(row)
+    if field == "result":
+        return decode_result(row)
+    return getattr(row, field)
+
+
+def encode_cursor(created_at: datetime, record_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{record_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, record_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(record_id)
+    except Exception:
+        raise ValueError("Invalid history cursor")
+
+
+def get_user_history(
+    db: Session,
+    username: str,
+    limit: int = 10,
+    fields: Optional[list] = None,
+    cursor: Optional[str] = None,
+    symbol: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    # -> (kayıtlar, sonraki sayfanın cursor'ı ya da None)
+    fields = fields or DEFAULT_FIELDS
+    unknown = [f for f in fields if f not in HISTORY_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown history fields: {unknown}")
+
+    # Sıralama (created_at, id) üzerinden; cursor için bu iki sütun her zaman okunur
+    columns = list(dict.fromkeys(["id", "created_at", *(c for f in fields for c in HISTORY_FIELDS[f])]))
+    query = db.query(*[getattr(AnalysisHistory, c) for c in columns])\
+              .filter(AnalysisHistory.username == username)
+    if symbol:
+        query = query.filter(AnalysisHistory.symbol == symbol.upper())
+    if start_date:
+        query = query.filter(AnalysisHistory.created_at >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        query = query.filter(AnalysisHistory.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+    if cursor:
+        query = query.filter(tuple_(AnalysisHistory.created_at, AnalysisHistory.id) < decode_cursor(cursor))
+
+    records = query.order_by(AnalysisHistory.created_at.desc(), AnalysisHistory.id.desc())\
+                   .limit(limit + 1).all()
 
-def get_user_history(db: Session, username: str, limit: int = 10):
-    records = db.query(AnalysisHistory)\
-                .filter_by(username=username)\
-                .order_by(AnalysisHistory.created_at.desc())\
-                .limit(limit).all()
-
-    return [
-        {
-            "id": r.id,
-            "username": r.username,
-            "symbol": r.symbol,
-            "indicators": r.indicators,
-            "created_at": r.created_at,
-            "result": json.loads(r.result) if r.result else None
-        }
-        for r in records
-    ]
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_cursor(records[-1].created_at, records[-1].id)
+    return [{field: _field_value(r, field) for field in fields} for r in records], next_cursor
@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.database.database import SessionLocal
+from app.logging_config import get_logger
+from app.models.analysis_history import AnalysisHistory
+from app.services.history_service import history_row
+from app.services.metrics import span
+
+logger = get_logger(__name__)
+
+
+# Analiz geçmişi için write-behind tampon: istek kaydı kuyruğa bırakıp hemen döner,
+# arka plandaki thread kayıtları boyut (max_batch) ya da süre (flush_interval) dolunca tek transaction'da yazar.
+# created_at kuyruğa alındığı an atanır; kapanışta kuyrukta kalanlar yazılır.
+class HistoryWriter:
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        max_batch: int = 200,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, username: str, symbol: str, indicators: list, result: dict) -> bool:
+        # Tampon doluysa kayıt düşürülür (rejected); analiz yanıtı geçmiş yazımı yüzünden başarısız olmaz
+        row = history_row(username, symbol, indicators, result, created_at=datetime.now(timezone.utc))
+        self._ensure_started()
+        with self._idle:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._idle:
+                self._pending -= 1
+            self.rejected += 1
+            logger.warning(f"History buffer full, dropped record ({username}, {symbol})")
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+            with self._idle:
+                self._pending -= len(batch)
+                if self._pending == 0:
+                    self._idle.notify_all()
+
+    def _write(self, rows: List[dict]):
+        db = self.session_factory()
+        try:
+            with span("db_write"):
+                db.execute(insert(AnalysisHistory), rows)
+                db.commit()
+            self.written += len(rows)
+            self.batches += 1
+        except Exception as e:
+            db.rollback()
+            logger.error(f"History batch of {len(rows)} failed, retrying row by row: {e}")
+            # Hatalı tek kayıt tüm partiyi kaybettirmesin
+            for row in rows:
+                try:
+                    db.execute(insert(AnalysisHistory), [row])
+                    db.commit()
+                    self.written += 1
+                except Exception as row_error:
+                    db.rollback()
+                    self.failed += 1
+                    logger.error(f"History row dropped ({row.get('username')}, {row.get('symbol')}): {row_error}")
+        finally:
+            db.close()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # Kuyruktaki tüm kayıtlar yazılana kadar bekler
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def stop(self, timeout: float = 10.0):
+        if self._thread is None:
+            return
+        self.flush(timeout=timeout)
+        self._stopping.set()
+        self._thread.join(timeout=self.flush_interval + 1)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "pending": self._pending,
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+history_writer = HistoryWriter(
+    max_batch=settings.history_batch_size,
+    flush_interval=settings.history_flush_seconds,
+    max_queue=settings.history_queue_size,
+)
@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from app.config import settings
+from app.services import stock_analysis
+from app.services.metrics import span
+
+MARKET_TZ = "America/New_York"
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 0)
+
+
+def is_market_open(now: Optional[pd.Timestamp] = None) -> bool:
+    # Hafta içi 09:30-16:00 (New York); resmi tatiller dikkate alınmaz
+    local = (now or pd.Timestamp.now(tz="UTC")).tz_convert(MARKET_TZ)
+    if local.weekday() >= 5:
+        return False
+    minutes = local.hour * 60 + local.minute
+    return MARKET_OPEN[0] * 60 + MARKET_OPEN[1] <= minutes < MARKET_CLOSE[0] * 60 + MARKET_CLOSE[1]
+
+
+def seconds_until_open(now: Optional[pd.Timestamp] = None) -> float:
+    now = now or pd.Timestamp.now(tz="UTC")
+    local = now.tz_convert(MARKET_TZ)
+    candidate = local.normalize() + pd.Timedelta(hours=MARKET_OPEN[0], minutes=MARKET_OPEN[1])
+    if candidate <= local:
+        candidate += pd.Timedelta(days=1)
+    while candidate.weekday() >= 5:
+        candidate += pd.Timedelta(days=1)
+    return (candidate - local).total_seconds()
+
+
+def _last_bar(hist: pd.DataFrame):
+    # Index tarih değilse (reset_index sonrası) "Date" sütununa bak
+    if isinstance(hist.index, pd.DatetimeIndex):
+        first, last = hist.index[0], hist.index[-1]
+    elif "Date" in hist.columns:
+        first, last = hist["Date"].iloc[0], hist["Date"].iloc[-1]
+    else:
+        first, last = hist.index[0], hist.index[-1]
+    row = hist.iloc[-1]
+    # Gün içinde son bar aynı zaman damgasıyla güncellenir; fiyat/hacim de anahtara girer
+    return str(first), str(last), float(row.get("Close", 0.0)), float(row.get("Volume", 0.0))
+
+
+# Gösterge sonuçları için LRU + TTL önbellek.
+# Anahtar (sembol, aralık, ilk/son bar, bar sayısı, gösterge seti); yeni bar gelince anahtar değişir.
+class IndicatorCache:
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 256 * 1024 * 1024,
+        market_ttl: float = 60.0,
+        closed_ttl: float = 6 * 3600.0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.market_ttl = market_ttl
+        self.closed_ttl = closed_ttl
+
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _ttl(self) -> float:
+        # Piyasa açıkken kısa, kapalıyken bir sonraki açılışa kadar
+        if is_market_open():
+            return self.market_ttl
+        return max(self.market_ttl, min(self.closed_ttl, seconds_until_open()))
+
+    def make_key(self, symbol: str, interval: str, hist: pd.DataFrame, selected_indicators: List[str]) -> tuple:
+        return (symbol.upper(), interval, len(hist), *_last_bar(hist), tuple(sorted(set(selected_indicators))))
+
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: pd.DataFrame):
+        size = int(value.memory_usage(index=True, deep=False).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic() + self._ttl())
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: tuple):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get_or_compute(
+        self,
+        symbol: str,
+        interval: str,
+        hist: pd.DataFrame,
+        selected_indicators: List[str],
+        compute: Optional[Callable[[pd.DataFrame, List[str]], pd.DataFrame]] = None,
+    ) -> pd.DataFrame:
+        if hist.empty:
+            return (compute or stock_analysis.calculate_all_indicators)(hist, selected_indicators)
+
+        key = self.make_key(symbol, interval, hist, selected_indicators)
+        cached = self.get(key)
+        if cached is None:
+            with span("indicators"):
+                cached = (compute or stock_analysis.calculate_all_indicators)(hist, selected_indicators)
+            self.put(key, cached)
+        # Çağıranlar reset_index / sütun ekleme yapabilir; önbellekteki nesne korunur
+        return cached.copy(deep=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+indicator_cache = IndicatorCache(
+    max_entries=settings.indicator_cache_max_entries,
+    max_bytes=settings.indicator_cache_max_mb * 1024 * 1024,
+    market_ttl=settings.indicator_cache_market_ttl,
+)
+
+
+def cached_indicators(symbol: str, interval: str, hist: pd.DataFrame, selected_indicators: List[str]) -> pd.DataFrame:
+    return indicator_cache.get_or_compute(symbol, interval, hist, selected_indicators)
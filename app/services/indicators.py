@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from app.services.stock_analysis import on_balance_volume, rolling_mean_deviation
 
 def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
@@ -29,7 +30,7 @@ def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     # CCI (Commodity Channel Index)
     tp = (df['High'] + df['Low'] + df['Close']) / 3
     sma_tp = tp.rolling(window=20).mean()
-    mad = tp.rolling(window=20).apply(lambda x: np.mean(np.abs(x - np.mean(x))), raw=True)
+    mad = rolling_mean_deviation(tp, 20)
     df['CCI'] = (tp - sma_tp) / (0.015 * mad)
 
     # ADX (Average Directional Index)
@@ -56,15 +57,7 @@ def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df['Williams_%R'] = -100 * ((high_14 - df['Close']) / (high_14 - low_14))
 
     # OBV (On-Balance Volume)
-    obv = [0]
-    for i in range(1, len(df)):
-        if df['Close'].iloc[i] > df['Close'].iloc[i - 1]:
-            obv.append(obv[-1] + df['Volume'].iloc[i])
-        elif df['Close'].iloc[i] < df['Close'].iloc[i - 1]:
-            obv.append(obv[-1] - df['Volume'].iloc[i])
-        else:
-            obv.append(obv[-1])
-    df['OBV'] = obv
+    df['OBV'] = on_balance_volume(df['Close'], df['Volume'])
 
     # ATR (Average True Range)
     df['ATR'] = df['TR'].rolling(window=14).mean()
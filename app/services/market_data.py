@@ -0,0 +1,85 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import pandas as pd
+import yfinance as yf
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+# Her sembol için bir OHLCV tablosu döner; verisi olmayan semboller sözlükte yer almaz.
+# start verilirse [start, end) aralığı, verilmezse period kullanılır.
+class DataProvider(ABC):
+    @abstractmethod
+    def fetch(
+        self,
+        symbols: List[str],
+        period: str = "3mo",
+        interval: str = "1d",
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        ...
+
+
+class YFinanceProvider(DataProvider):
+    def fetch(self, symbols, period="3mo", interval="1d", start=None, end=None):
+        if start is not None:
+            window = {"start": start, "end": end}
+        else:
+            window = {"period": period}
+
+        raw = yf.download(
+            symbols, interval=interval, group_by="ticker",
+            auto_adjust=True, threads=False, progress=False, **window
+        )
+        if raw is None or raw.empty:
+            return {}
+
+        frames = {}
+        if isinstance(raw.columns, pd.MultiIndex):
+            available = set(raw.columns.get_level_values(0))
+            for symbol in symbols:
+                if symbol not in available:
+                    continue
+                df = raw[symbol].dropna(how="all")
+                if not df.empty:
+                    frames[symbol] = df
+        elif len(symbols) == 1:
+            df = raw.dropna(how="all")
+            if not df.empty:
+                frames[symbols[0]] = df
+        return frames
+
+
+# Offline testler için: <directory>/<SYMBOL>.csv (Date index + OHLCV sütunları)
+class LocalFixtureProvider(DataProvider):
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def fetch(self, symbols, period="3mo", interval="1d", start=None, end=None):
+        frames = {}
+        for symbol in symbols:
+            path = os.path.join(self.directory, f"{symbol}.csv")
+            if not os.path.exists(path):
+                continue
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            if start is not None:
+                df = df[df.index >= _align(start, df.index)]
+            if end is not None:
+                df = df[df.index < _align(end, df.index)]
+            if not df.empty:
+                frames[symbol] = df
+        return frames
+
+
+def _align(ts, index: pd.DatetimeIndex) -> pd.Timestamp:
+    # Karşılaştırma için zaman dilimini index ile eşitle
+    ts = pd.Timestamp(ts)
+    if index.tz is None:
+        return ts.tz_convert(None) if ts.tz is not None else ts
+    return ts.tz_localize("UTC").tz_convert(index.tz) if ts.tz is None else ts.tz_convert(index.tz)
+
+
+default_provider: DataProvider = YFinanceProvider()
@@ -0,0 +1,120 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+# Aşama süreleri (fetch, indicators, model_load, predict, plot, db_write ...) için hafif span API'si.
+# Her span Prometheus histogramına yazılır; istek içindeyse Server-Timing başlığı için de toplanır.
+# Executor'lar contextvars'ı işçi thread'ine taşıdığı için thread içindeki span'ler de isteğe düşer.
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # [bucket sayıları..., toplam, adet]
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+            prefix = f"{base}," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-1]}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+stage_duration = Histogram(
+    "finance_stage_duration_seconds", "Time spent in a processing stage.", ("stage",)
+)
+request_duration = Histogram(
+    "finance_http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")
+)
+
+# İstek başına {aşama: [toplam süre, adet]}; middleware her istekte yeni bir sözlük kurar
+_request_timings: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def span(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+
+def record(stage: str, seconds: float):
+    stage_duration.observe(seconds, stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        entry = timings.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+
+def timed(stage: str):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_request() -> contextvars.Token:
+    return _request_timings.set({})
+
+
+def finish_request(token: contextvars.Token) -> dict:
+    timings = _request_timings.get() or {}
+    _request_timings.reset(token)
+    return timings
+
+
+def server_timing_header(timings: dict, total: float) -> str:
+    parts = [f"{stage};dur={seconds * 1e3:.1f}" for stage, (seconds, _) in timings.items()]
+    parts.append(f"total;dur={total * 1e3:.1f}")
+    return ", ".join(parts)
+
+
+def gauge_lines(name: str, help_text: str, samples: List[Tuple[dict, float]]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for labels, value in samples:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        lines.append(f"{name}{{{label_text}}} {value}")
+    return lines
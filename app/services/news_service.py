@@ -2,7 +2,9 @@
 
 import requests
 from bs4 import BeautifulSoup
-import traceback
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 def get_latest_news():
     try:
@@ -14,7 +16,7 @@ def get_latest_news():
         response = requests.get(url, headers=headers)
         soup = BeautifulSoup(response.content, "xml")
         items = soup.find_all("item")
-        print(f" Google News item sayısı: {len(items)}")
+        logger.debug(f"Google News item sayısı: {len(items)}")
 
         news_list = []
         for item in items[:5]:  # sadece ilk 5 haber
@@ -32,8 +34,7 @@ def get_latest_news():
         return news_list
 
     except Exception as e:
-        print(" HATA:", e)
-        traceback.print_exc()
+        logger.exception(f"News fetch failed: {e}")
         return [{"error": str(e)}]
 
 # Test etmek için
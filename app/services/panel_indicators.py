@@ -0,0 +1,140 @@
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.market_data import OHLCV_COLUMNS
+from app.services.stock_analysis import _evaluate, _plan_outputs
+
+
+# N sembol için göstergeler tek geçişte: her OHLCV alanı (bar x sembol) geniş bir tablo,
+# stock_analysis'teki hat sütun bazında aynen çalışır (rolling/ewm/diff sütun başına).
+# Sütun isimleri calculate_all_indicators ile aynıdır.
+#
+# Farklı uzunluktaki serileri NaN ile hizalamak pencereleri bozar (ör. RSI'da where(delta > 0, 0)
+# dolguyu 0'a çevirir); bu yüzden semboller bar sayısına göre gruplanır ve her grup boşluksuz
+# bir blok olarak hesaplanır. Her sütun tek sembollük hesapla birebir aynıdır.
+
+
+class _Block:
+    def __init__(self, frames: Dict[str, pd.DataFrame], symbols: List[str]):
+        self.symbols = symbols
+        self.fields = {}
+        for field in OHLCV_COLUMNS:
+            columns = [
+                frames[s][field].to_numpy(dtype="float64") if field in frames[s].columns
+                else np.full(len(frames[s]), np.nan)
+                for s in symbols
+            ]
+            self.fields[field] = pd.DataFrame(np.column_stack(columns), columns=symbols)
+
+    def __getitem__(self, field: str) -> pd.DataFrame:
+        return self.fields[field]
+
+
+def _compute(frames: Dict[str, pd.DataFrame], symbols: List[str], outputs: list) -> np.ndarray:
+    # (bar, sembol, sütun) bloğu
+    block = _Block(frames, symbols)
+    result = np.empty((len(frames[symbols[0]]), len(symbols), len(outputs)), dtype="float64")
+    for i, values in enumerate(_evaluate(block, outputs)):
+        result[:, :, i] = np.asarray(values, dtype="float64")
+    return result
+
+
+def _resolve_jobs(n_jobs: Optional[int]) -> int:
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def compute_panel(
+    frames: Dict[str, pd.DataFrame], selected_indicators: List[str], n_jobs: Optional[int] = 1
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    # -> (sütun isimleri, sembol -> (bar x sütun) dizi)
+    outputs = _plan_outputs(selected_indicators or ["sma", "ema", "rsi", "macd", "bollinger", "z_score"])
+    names = [column for column, _, _ in outputs]
+
+    groups = defaultdict(list)
+    for symbol, hist in frames.items():
+        if len(hist):
+            groups[len(hist)].append(symbol)
+
+    # Gruplar sembol parçalarına bölünür; pandas/NumPy çekirdekleri GIL'i bıraktığı için thread yeterli
+    jobs = _resolve_jobs(n_jobs)
+    tasks = []
+    for symbols in groups.values():
+        parts = min(jobs, len(symbols))
+        tasks.extend(list(chunk) for chunk in np.array_split(np.array(symbols, dtype=object), parts))
+
+    arrays: Dict[str, np.ndarray] = {}
+    if not names or not tasks:
+        return names, arrays
+    if jobs == 1:
+        results = [_compute(frames, chunk, outputs) for chunk in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+            results = list(executor.map(lambda chunk: _compute(frames, chunk, outputs), tasks))
+    for chunk, block in zip(tasks, results):
+        for j, symbol in enumerate(chunk):
+            arrays[symbol] = block[:, j, :]
+    return names, arrays
+
+
+def panel_indicators(
+    frames: Dict[str, pd.DataFrame], selected_indicators: List[str], n_jobs: Optional[int] = 1
+) -> Dict[str, pd.DataFrame]:
+    # Gösterge sütunu -> (zaman x sembol) tablo; index tüm sembollerin zamanlarının birleşimi
+    names, arrays = compute_panel(frames, selected_indicators, n_jobs)
+    symbols = [s for s in frames if s in arrays]
+    if not symbols:
+        return {name: pd.DataFrame() for name in names}
+
+    indexes = [frames[s].index for s in symbols]
+    union = indexes[0]
+    for index in indexes[1:]:
+        if not union.equals(index):
+            union = union.union(index)
+    positions = [union.get_indexer(index) for index in indexes]
+
+    result = {}
+    for k, name in enumerate(names):
+        wide = np.full((len(union), len(symbols)), np.nan)
+        for i, rows in enumerate(positions):
+            wide[rows, i] = arrays[symbols[i]][:, k]
+        result[name] = pd.DataFrame(wide, index=union, columns=symbols)
+    return result
+
+
+def calculate_indicators_many(
+    frames: Dict[str, pd.DataFrame], selected_indicators: List[str], n_jobs: Optional[int] = 1
+) -> Dict[str, pd.DataFrame]:
+    # Sembol başına calculate_all_indicators(hist, selected) ile aynı tablolar
+    names, arrays = compute_panel(frames, selected_indicators, n_jobs)
+    result = {}
+    for symbol, hist in frames.items():
+        if symbol not in arrays:
+            result[symbol] = hist
+            continue
+        out = pd.DataFrame(arrays[symbol], index=hist.index, columns=names)
+        overlap = hist.columns.intersection(names)
+        result[symbol] = pd.concat([hist.drop(columns=overlap) if len(overlap) else hist, out], axis=1)
+    return result
+
+
+def latest_indicators(
+    frames: Dict[str, pd.DataFrame], selected_indicators: List[str], n_jobs: Optional[int] = 1
+) -> pd.DataFrame:
+    # Sembol başına son barın değerleri; satır = sembol
+    names, arrays = compute_panel(frames, selected_indicators, n_jobs)
+    symbols = [s for s in frames if s in arrays]
+    latest = pd.DataFrame(
+        np.array([arrays[s][-1] for s in symbols]).reshape(len(symbols), len(names)),
+        index=symbols, columns=names,
+    )
+    latest.insert(0, "Close", [float(frames[s]["Close"].iloc[-1]) for s in symbols])
+    return latest
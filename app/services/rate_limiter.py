@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordBearer
+
+from app.auth.auth_service import get_current_user
+from app.config import settings
+from app.logging_config import get_logger
+from app.services.executors import RateLimited, run_io
+
+logger = get_logger(__name__)
+
+# Token bucket: kapasite kadar ani istek, sonra saniyede rate kadar dolar.
+# Anahtar kullanıcı (token yoksa IP) ve rol; ayrıca tüm istekler için tek bir global kova vardır.
+# Arka uç bellek içi (süreç başına) ya da SQLite (aynı makinedeki tüm worker'lar paylaşır).
+
+
+def parse_limit(spec: str) -> Tuple[float, float]:
+    # "30/60" -> (kapasite 30, saniyede 0.5 jeton)
+    count, seconds = spec.split("/")
+    return float(count), float(count) / float(seconds)
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, rate: float) -> float:
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+class MemoryBucketStore:
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        # -> 0 ise izin verildi, değilse beklenecek saniye
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            tokens = capacity if bucket is None else _refill(bucket[0], bucket[1], now, capacity, rate)
+            if tokens < cost:
+                self._buckets[key] = [tokens, now]
+                return (cost - tokens) / rate
+            self._buckets[key] = [tokens - cost, now]
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return 0.0
+
+    def refund(self, key: str, capacity: float, cost: float = 1.0):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[0] = min(capacity, bucket[0] + cost)
+
+    def _prune(self, now: float):
+        # Uzun süredir dokunulmamış (dolmuş) kovalar tutulmaz
+        idle = [k for k, (_, updated) in self._buckets.items() if now - updated > 3600]
+        for k in idle:
+            del self._buckets[k]
+
+    def stats(self) -> dict:
+        return {"keys": len(self._buckets)}
+
+
+class SqliteBucketStore:
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float, cost: float = 1.0) -> float:
+        # Süreçler arası saat: time.time(); okuma-yazma tek yazma kilidi altında
+        now = self.clock()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else _refill(row[0], row[1], now, capacity, rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if wait == 0.0:
+                tokens -= cost
+            conn.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    def refund(self, key: str, capacity: float, cost: float = 1.0):
+        self._connect().execute("UPDATE buckets SET tokens = MIN(?, tokens + ?) WHERE key = ?", (capacity, cost, key))
+
+    def stats(self) -> dict:
+        count = self._connect().execute("SELECT count(*) FROM buckets").fetchone()[0]
+        return {"keys": count}
+
+
+class RateLimiter:
+    def __init__(self, store, limits: Dict[str, str], global_limit: Optional[str] = None):
+        self.store = store
+        self.limits = {role: parse_limit(spec) for role, spec in limits.items()}
+        self.global_limit = parse_limit(global_limit) if global_limit else None
+        self.allowed = 0
+        self.rejected = 0
+
+    def check(self, identity: str, role: str, cost: float = 1.0):
+        capacity, rate = self.limits.get(role, self.limits["anonymous"])
+        key = f"{role}:{identity}"
+        wait = self.store.take(key, capacity, rate, cost)
+        if wait > 0:
+            self.rejected += 1
+            raise RateLimited(wait, "user")
+        if self.global_limit is not None:
+            wait = self.store.take("global", *self.global_limit, cost)
+            if wait > 0:
+                # Sunulmayan istek kullanıcının kotasından düşmez
+                self.store.refund(key, capacity, cost)
+                self.rejected += 1
+                raise RateLimited(wait, "global")
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {"allowed": self.allowed, "rejected": self.rejected, **self.store.stats()}
+
+
+def _build_store():
+    if settings.rate_limit_backend == "sqlite":
+        return SqliteBucketStore(settings.rate_limit_sqlite_path)
+    return MemoryBucketStore()
+
+
+rate_limiter = RateLimiter(
+    _build_store(),
+    {
+        "anonymous": settings.rate_limit_anonymous,
+        "free": settings.rate_limit_free,
+        "premium": settings.rate_limit_premium,
+    },
+    settings.rate_limit_global or None,
+)
+
+_optional_token = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
+
+
+def rate_limit(cost: float = 1.0):
+    # Route bağımlılığı: Depends(rate_limit(10)); token geçerliyse kullanıcı, değilse IP anahtarı
+    async def dependency(request: Request, token: Optional[str] = Depends(_optional_token)):
+        if not settings.rate_limit_enabled:
+            return
+        identity, role = request.client.host if request.client else "unknown", "anonymous"
+        if token:
+            try:
+                user = await get_current_user(token)
+                identity, role = user["username"], user["role"]
+            except HTTPException:
+                pass
+        if isinstance(rate_limiter.store, SqliteBucketStore):
+            await run_io(rate_limiter.check, identity, role, cost)
+        else:
+            rate_limiter.check(identity, role, cost)
+    return dependency
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import List
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from app.config import settings
+from app.plot.chart_renderer import render_chart_sync
+from app.services.metrics import span
+
+
+# Analiz sonuçlarından PDF üretir; dosya yazılmaz, grafik bellekteki PNG'den gömülür.
+# Her sembol bir sayfa, tüm sayfalar tek canvas geçişinde çizilir.
+def render_report_pdf(results: List[dict]) -> bytes:
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+
+    for result in results:
+        symbol = result["symbol"]
+        c.setFont("Helvetica", 12)
+
+        # Başlık
+        c.drawString(100, 750, f"Analysis Report for {symbol}")
+
+        # Yazılar
+        y = 720
+        for key, value in result["latest"].items():
+            c.drawString(100, y, f"{key}: {value}")
+            y -= 20
+
+        # Grafik en alta
+        png, _ = render_chart_sync("sample", None, symbol)
+        c.drawImage(ImageReader(BytesIO(png)), 100, 100, width=400, preserveAspectRatio=True)
+        c.showPage()
+
+    c.save()
+    return buffer.getvalue()
+
+
+class ReportCache:
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is not None:
+                self._entries.move_to_end(key)
+            return pdf
+
+    def put(self, key: tuple, pdf: bytes):
+        with self._lock:
+            self._entries[key] = pdf
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+report_cache = ReportCache(max_entries=settings.report_cache_max_entries)
+
+
+def report_key(results: List[dict]) -> tuple:
+    # Yeni bar (ya da gün içi son bar güncellemesi) gelene kadar aynı rapor yeniden üretilmez
+    return tuple((r["symbol"], r.get("as_of"), r["latest"]["close"]) for r in results)
+
+
+def get_report_pdf(results: List[dict]) -> bytes:
+    key = report_key(results)
+    pdf = report_cache.get(key)
+    if pdf is None:
+        with span("report"):
+            pdf = render_report_pdf(results)
+        report_cache.put(key, pdf)
+    return pdf
@@ -1,46 +1,43 @@
-import yfinance as yf
 from apscheduler.schedulers.background import BackgroundScheduler
+from app.config import settings
 from app.services import stock_analysis
-from app.logging_config import logger
-from app.services.stock_analysis import calculate_all_indicators
+from app.logging_config import get_logger
+from app.services.bar_store import bar_store
+from app.services.streaming_indicators import streaming_indicators
+from app.services.universe import universe_symbols
+
+
+logger = get_logger(__name__)
 
 
 def run_scheduled_analysis():
-    print(" run_scheduled_analysis() tetiklendi")
     logger.info("Running scheduled analysis...")
 
-    symbols = ["AAPL", "MSFT", "GOOGL"]
-    all_indicators = ["sma", "ema", "rsi", "macd", "z_score", "bollinger"]
+    if settings.scheduler_symbols.strip() == "*":
+        symbols = universe_symbols()
+    else:
+        symbols = [s.strip().upper() for s in settings.scheduler_symbols.split(",") if s.strip()]
 
     for symbol in symbols:
         try:
-            print(f" Analiz başlatılıyor: {symbol}")
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="6mo", interval="1d")
+            logger.debug("Analiz başlatılıyor", extra={"symbol": symbol})
+            hist = bar_store.get_bars(symbol, interval="1d", period="6mo")
             if hist.empty:
-                warning_msg = f"No data for {symbol}"
-                print(f" {warning_msg}")
-                logger.warning(warning_msg)
+                logger.warning(f"No data for {symbol}", extra={"symbol": symbol})
                 continue
 
-            hist.reset_index(inplace=True)
-            hist = stock_analysis.calculate_all_indicators(hist, selected_indicators=all_indicators)
-            latest = stock_analysis.extract_latest_values(hist)
-            signals = stock_analysis.generate_signals(latest)
+            # Yalnızca yeni (ya da güncellenen son) barlar işlenir; tam yeniden hesap yok
+            state = streaming_indicators.sync(symbol, "1d", hist)
+            signals = stock_analysis.generate_signals(state)
             decision = stock_analysis.calculate_weighted_decision(signals)
 
-            log_msg = f"[{symbol}] Final Decision: {decision}"
-            print(f" {log_msg}")
-            logger.info(log_msg)
+            logger.info(f"[{symbol}] Final Decision: {decision}", extra={"symbol": symbol, "decision": decision})
 
         except Exception as e:
-            err_msg = f"[{symbol}] Error during scheduled analysis: {e}"
-            print(f" {err_msg}")
-            logger.error(err_msg)
+            logger.exception(f"[{symbol}] Error during scheduled analysis: {e}", extra={"symbol": symbol})
 
 
 def start_scheduler():
-    print(" start_scheduler() çağrıldı")
     scheduler = BackgroundScheduler()
     scheduler.add_job(run_scheduled_analysis, 'interval', minutes=10)
     scheduler.start()
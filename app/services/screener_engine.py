@@ -0,0 +1,160 @@
+import math
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from app.services.executors import RateLimited
+from app.services.market_data import DataProvider, default_provider
+from app.services.metrics import span
+from app.services.panel_indicators import latest_indicators
+
+# --- Tarama ---
+
+@dataclass
+class ScreenReport:
+    results: List[dict] = field(default_factory=list)
+    scanned: int = 0
+    skipped: Counter = field(default_factory=Counter)
+    timed_out: bool = False
+    cancelled: bool = False
+    # Dış sağlayıcı bütçesi tükendiyse tekrar denemeden önce beklenecek saniye
+    retry_after: Optional[int] = None
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "results": self.results,
+            "scanned": self.scanned,
+            "matched": len(self.results),
+            "skipped": sum(self.skipped.values()),
+            "skipped_reasons": dict(self.skipped),
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "retry_after": self.retry_after,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+def _panel_latest(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    # Tüm semboller panel API ile tek geçişte; her sembolün kendi son barı
+    latest = latest_indicators(frames, ["sma", "rsi", "macd"])
+    return latest.rename(columns={"Close": "close", "SMA_20": "sma", "RSI_14": "rsi", "MACD": "macd"})[
+        ["close", "sma", "rsi", "macd"]
+    ]
+
+
+def _apply_filters(latest: pd.DataFrame, rsi_lt=None, macd_gt=None, sma_lt=None, sma_gt=None) -> pd.DataFrame:
+    mask = pd.Series(True, index=latest.index)
+    if rsi_lt is not None:
+        mask &= latest["rsi"] < rsi_lt
+    if macd_gt is not None:
+        mask &= latest["macd"] > macd_gt
+    if sma_lt is not None:
+        mask &= latest["sma"] < sma_lt
+    if sma_gt is not None:
+        mask &= latest["sma"] > sma_gt
+    return latest[mask]
+
+
+def run_screen(
+    symbols: List[str],
+    rsi_lt: Optional[float] = None,
+    macd_gt: Optional[float] = None,
+    sma_lt: Optional[float] = None,
+    sma_gt: Optional[float] = None,
+    provider: Optional[DataProvider] = None,
+    period: str = "3mo",
+    interval: str = "1d",
+    batch_size: int = 200,
+    max_workers: int = 8,
+    deadline: Optional[float] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> ScreenReport:
+    provider = provider or default_provider
+    report = ScreenReport(scanned=len(symbols))
+    started = time.monotonic()
+    expires_at = started + deadline if deadline else None
+
+    batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+    frames: Dict[str, pd.DataFrame] = {}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {executor.submit(provider.fetch, batch, period, interval): batch for batch in batches}
+    # Sağlayıcı bütçesine takılan partiler Retry-After kadar sonra yeniden kuyruğa girer: [(zaman, parti)]
+    throttled: List[tuple] = []
+    try:
+        while pending or throttled:
+            if cancel_event is not None and cancel_event.is_set():
+                report.cancelled = True
+                break
+            now = time.monotonic()
+            timeout = 0.25
+            if expires_at is not None:
+                remaining = expires_at - now
+                if remaining <= 0:
+                    report.timed_out = True
+                    break
+                timeout = min(timeout, remaining)
+
+            for item in [t for t in throttled if t[0] <= now]:
+                throttled.remove(item)
+                pending[executor.submit(provider.fetch, item[1], period, interval)] = item[1]
+            if not pending:
+                time.sleep(max(0.0, min(timeout, min(t[0] for t in throttled) - now)))
+                continue
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                try:
+                    fetched = future.result()
+                except RateLimited as e:
+                    # Çekilen parçalar bar deposunda kaldığı için yeniden deneme yalnızca eksikleri ister
+                    throttled.append((time.monotonic() + e.retry_after, batch))
+                    continue
+                except Exception:
+                    report.skipped["fetch_error"] += len(batch)
+                    continue
+                for symbol in batch:
+                    df = fetched.get(symbol)
+                    if df is None or df.empty or "Close" not in df.columns:
+                        report.skipped["no_data"] += 1
+                    else:
+                        frames[symbol] = df
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    if pending:
+        reason = "cancelled" if report.cancelled else "deadline"
+        report.skipped[reason] += sum(len(batch) for batch in pending.values())
+    if throttled:
+        report.skipped["rate_limited"] += sum(len(batch) for _, batch in throttled)
+        report.retry_after = max(1, math.ceil(max(at for at, _ in throttled) - time.monotonic()))
+
+    if frames and not report.cancelled:
+        with span("indicators"):
+            latest = _panel_latest(frames)
+        incomplete = latest[["rsi", "macd", "sma"]].isna().any(axis=1)
+        if incomplete.any():
+            report.skipped["insufficient_history"] += int(incomplete.sum())
+        matched = _apply_filters(latest[~incomplete], rsi_lt, macd_gt, sma_lt, sma_gt)
+
+        report.results = [
+            {
+                "symbol": symbol,
+                "rsi": round(float(row.rsi), 2),
+                "macd": round(float(row.macd), 2),
+                "sma": round(float(row.sma), 2),
+                "close": round(float(row.close), 2),
+            }
+            for symbol, row in matched.iterrows()
+        ]
+
+    report.elapsed = time.monotonic() - started
+    return report
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+# Aynı anahtar için eşzamanlı çağrılar tek bir hesaplamayı bekler ve sonucunu paylaşır.
+# Paylaşılan sonuçlar (ör. DataFrame) çağıranlar tarafından yerinde değiştirilmemelidir.
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Stats:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "executed": self.calls - self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._calls),
+        }
+
+
+# Thread'ler arası (ör. bar deposu yenilemeleri)
+class SingleFlight(_Stats):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        _registry[name] = self
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+# Event loop içinde (route seviyesinde)
+class AsyncSingleFlight(_Stats):
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        _registry[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        self.calls += 1
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        # İlk çağıranın isteği iptal edilse bile ortak iş diğerleri için sürer
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+
+_registry: Dict[str, _Stats] = {}
+
+
+def single_flight_stats() -> dict:
+    return {name: flight.stats() for name, flight in _registry.items()}
@@ -1,5 +1,14 @@
 from typing import List
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Tam analizde (ve AI özelliklerinde) kullanılan göstergeler
+ALL_INDICATORS = [
+    "sma", "ema", "rsi", "macd", "z_score", "bollinger",
+    "cci", "adx", "stochastic", "williams", "obv", "atr"
+]
 
 
 # --- Basit Göstergeler ---
@@ -16,11 +25,7 @@ def calculate_ema(df: pd.DataFrame, window: int = 20):
 
 def calculate_rsi(df: pd.DataFrame, window: int = 14):
     df = df.copy()
-    delta = df["Close"].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    df[f"RSI_{window}"] = 100 - (100 / (1 + rs))
+    df[f"RSI_{window}"] = _rsi(df["Close"].diff(), window)
     return df
 
 def calculate_macd(df: pd.DataFrame, short_window=12, long_window=26, signal_window=9):
@@ -51,59 +56,77 @@ def calculate_bollinger(df: pd.DataFrame, window: int = 20):
     return df
 
 
+# --- Vektörel yardımcılar ---
+
+def rolling_mean_deviation(series, window: int):
+    # rolling().apply(lambda) yerine tüm pencereler tek NumPy işleminde (Series ya da sütun başına DataFrame)
+    values = series.to_numpy(dtype="float64")
+    result = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window, axis=0)
+        result[window - 1:] = np.abs(windows - windows.mean(axis=-1, keepdims=True)).mean(axis=-1)
+    if isinstance(series, pd.DataFrame):
+        return pd.DataFrame(result, index=series.index, columns=series.columns)
+    return pd.Series(result, index=series.index)
+
+def on_balance_volume(close: pd.Series, volume: pd.Series) -> pd.Series:
+    # Yön (+1/-1/0) x hacim kümülatif toplamı; ilk bar 0
+    direction = np.sign(close.diff()).fillna(0)
+    return (direction * volume).cumsum()
+
+def _rsi(delta: pd.Series, window: int) -> pd.Series:
+    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+def _true_range(high_low: pd.Series, high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    # ATR: önceki kapanışa göre gerçek aralık (ilk barda yalnızca H-L)
+    prev_close = close.shift(1)
+    return np.fmax(high_low, np.fmax((high - prev_close).abs(), (low - prev_close).abs()))
+
+def _bar_range(high_low: pd.Series, high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+    # ADX bu modülde aynı barın kapanışını kullanır (ATR'deki TR'den farklı)
+    return np.maximum(high_low, np.maximum((high - close).abs(), (low - close).abs()))
+
+def _adx(high: pd.Series, low: pd.Series, tr: pd.Series, window: int) -> pd.Series:
+    up = high.diff()
+    down = low.diff().abs()
+    plus_dm = up.where((up > down) & (up > 0), 0.0)
+    minus_dm = down.where((down > plus_dm) & (down > 0), 0.0)
+    atr = tr.rolling(window=window).mean()
+    plus_di = 100 * (plus_dm.rolling(window=window).mean() / atr)
+    minus_di = 100 * (minus_dm.rolling(window=window).mean() / atr)
+    dx = (abs(plus_di - minus_di) / (plus_di + minus_di)) * 100
+    return dx.rolling(window=window).mean()
+
+
 # --- Gelişmiş Göstergeler ---
 
 def calculate_cci(df: pd.DataFrame, window: int = 20):
     df = df.copy()
     tp = (df["High"] + df["Low"] + df["Close"]) / 3
     ma = tp.rolling(window=window).mean()
-    md = tp.rolling(window=window).apply(lambda x: (abs(x - x.mean())).mean(), raw=True)
+    md = rolling_mean_deviation(tp, window)
     df["CCI"] = (tp - ma) / (0.015 * md)
     return df
 
 
 def calculate_obv(df: pd.DataFrame):
     df = df.copy()
-    obv = [0]
-    for i in range(1, len(df)):
-        if df["Close"].iloc[i] > df["Close"].iloc[i - 1]:
-            obv.append(obv[-1] + df["Volume"].iloc[i])
-        elif df["Close"].iloc[i] < df["Close"].iloc[i - 1]:
-            obv.append(obv[-1] - df["Volume"].iloc[i])
-        else:
-            obv.append(obv[-1])
-    df["OBV"] = obv
+    df["OBV"] = on_balance_volume(df["Close"], df["Volume"])
     return df
 
 def calculate_atr(df: pd.DataFrame, window: int = 14):
     df = df.copy()
-    df["H-L"] = df["High"] - df["Low"]
-    df["H-PC"] = abs(df["High"] - df["Close"].shift(1))
-    df["L-PC"] = abs(df["Low"] - df["Close"].shift(1))
-    tr = df[["H-L", "H-PC", "L-PC"]].max(axis=1)
+    tr = _true_range(df["High"] - df["Low"], df["High"], df["Low"], df["Close"])
     df["ATR"] = tr.rolling(window=window).mean()
-    df.drop(columns=["H-L", "H-PC", "L-PC"], inplace=True)
     return df
 
 def calculate_adx(df: pd.DataFrame, window: int = 14):
     df = df.copy()
-    df["TR"] = df[["High", "Low", "Close"]].apply(
-        lambda row: max(
-            row["High"] - row["Low"],
-            abs(row["High"] - row["Close"]),
-            abs(row["Low"] - row["Close"])
-        ), axis=1
-    )
-    df["+DM"] = df["High"].diff()
-    df["-DM"] = df["Low"].diff().abs()
-    df["+DM"] = df["+DM"].where((df["+DM"] > df["-DM"]) & (df["+DM"] > 0), 0.0)
-    df["-DM"] = df["-DM"].where((df["-DM"] > df["+DM"]) & (df["-DM"] > 0), 0.0)
-    atr = df["TR"].rolling(window=window).mean()
-    plus_di = 100 * (df["+DM"].rolling(window=window).mean() / atr)
-    minus_di = 100 * (df["-DM"].rolling(window=window).mean() / atr)
-    dx = (abs(plus_di - minus_di) / (plus_di + minus_di)) * 100
-    df["ADX"] = dx.rolling(window=window).mean()
-    df.drop(columns=["TR", "+DM", "-DM"], inplace=True)
+    tr = _bar_range(df["High"] - df["Low"], df["High"], df["Low"], df["Close"])
+    df["ADX"] = _adx(df["High"], df["Low"], tr, window)
     return df
 
 def calculate_stochastic(df: pd.DataFrame, k_window: int = 14, d_window: int = 3):
@@ -122,54 +145,148 @@ def calculate_williams_r(df: pd.DataFrame, window: int = 14):
     return df
 
 
+# --- Tek geçişli gösterge hattı ---
+
+# Ara değerler: ad -> (bağımlılıklar, hesap). Her biri analiz başına en fazla bir kez hesaplanır.
+_INTERMEDIATES = {
+    "close": ((), lambda f, v: f["Close"]),
+    "high": ((), lambda f, v: f["High"]),
+    "low": ((), lambda f, v: f["Low"]),
+    "delta": (("close",), lambda f, v: v["close"].diff()),
+    "mean_20": (("close",), lambda f, v: v["close"].rolling(window=20).mean()),
+    "std_20": (("close",), lambda f, v: v["close"].rolling(window=20).std()),
+    "ema_12": (("close",), lambda f, v: v["close"].ewm(span=12, adjust=False).mean()),
+    "ema_26": (("close",), lambda f, v: v["close"].ewm(span=26, adjust=False).mean()),
+    "macd": (("ema_12", "ema_26"), lambda f, v: v["ema_12"] - v["ema_26"]),
+    "macd_signal": (("macd",), lambda f, v: v["macd"].ewm(span=9, adjust=False).mean()),
+    "high_low": (("high", "low"), lambda f, v: v["high"] - v["low"]),
+    "high_14": (("high",), lambda f, v: v["high"].rolling(window=14).max()),
+    "low_14": (("low",), lambda f, v: v["low"].rolling(window=14).min()),
+    "stochastic_k": (("close", "high_14", "low_14"),
+                     lambda f, v: 100 * ((v["close"] - v["low_14"]) / (v["high_14"] - v["low_14"]))),
+    "typical_price": (("high", "low", "close"), lambda f, v: (v["high"] + v["low"] + v["close"]) / 3),
+    "true_range": (("high_low", "high", "low", "close"),
+                   lambda f, v: _true_range(v["high_low"], v["high"], v["low"], v["close"])),
+    "bar_range": (("high_low", "high", "low", "close"),
+                  lambda f, v: _bar_range(v["high_low"], v["high"], v["low"], v["close"])),
+}
+
+
+# Göstergeler: ad -> (bağımlılıklar, [(sütun, hesap)]). Sıra, eski calculate_* zincirinin sütun sırasıdır.
+_INDICATORS = {
+    "sma": (("mean_20",), [("SMA_20", lambda f, v: v["mean_20"])]),
+    "ema": (("close",), [("EMA_20", lambda f, v: v["close"].ewm(span=20, adjust=False).mean())]),
+    "rsi": (("delta",), [("RSI_14", lambda f, v: _rsi(v["delta"], 14))]),
+    "macd": (("macd", "macd_signal"), [
+        ("MACD", lambda f, v: v["macd"]),
+        ("MACD_signal", lambda f, v: v["macd_signal"]),
+        ("MACD_histogram", lambda f, v: v["macd"] - v["macd_signal"]),
+    ]),
+    "z_score": (("close", "mean_20", "std_20"), [
+        ("Z_Score", lambda f, v: (v["close"] - v["mean_20"]) / v["std_20"]),
+    ]),
+    "bollinger": (("mean_20", "std_20"), [
+        ("Bollinger_Mid", lambda f, v: v["mean_20"]),
+        ("Bollinger_Upper", lambda f, v: v["mean_20"] + 2 * v["std_20"]),
+        ("Bollinger_Lower", lambda f, v: v["mean_20"] - 2 * v["std_20"]),
+    ]),
+    "cci": (("typical_price",), [
+        ("CCI", lambda f, v: (v["typical_price"] - v["typical_price"].rolling(window=20).mean())
+                             / (0.015 * rolling_mean_deviation(v["typical_price"], 20))),
+    ]),
+    "adx": (("high", "low", "bar_range"), [("ADX", lambda f, v: _adx(v["high"], v["low"], v["bar_range"], 14))]),
+    "stochastic": (("stochastic_k",), [
+        ("Stochastic_K", lambda f, v: v["stochastic_k"]),
+        ("Stochastic_D", lambda f, v: v["stochastic_k"].rolling(window=3).mean()),
+    ]),
+    "williams": (("close", "high_14", "low_14"), [
+        ("Williams_%R", lambda f, v: -100 * ((v["high_14"] - v["close"]) / (v["high_14"] - v["low_14"]))),
+    ]),
+    "obv": (("close",), [("OBV", lambda f, v: on_balance_volume(v["close"], f["Volume"]))]),
+    "atr": (("true_range",), [("ATR", lambda f, v: v["true_range"].rolling(window=14).mean())]),
+}
+
+# AI modelinin beklediği özel sütun isimleri (yalnızca "atr" seçildiğinde eklenir)
+_AI_ALIASES = [
+    ("SMA_14", "SMA_20"),
+    ("Signal", "MACD_signal"),
+    ("Upper_BB", "Bollinger_Upper"),
+    ("Lower_BB", "Bollinger_Lower"),
+]
+
+
+def _resolve(name: str, frame: pd.DataFrame, values: dict):
+    if name in values:
+        return
+    deps, compute = _INTERMEDIATES[name]
+    for dep in deps:
+        _resolve(dep, frame, values)
+    values[name] = compute(frame, values)
+
+
+def _plan_outputs(selected_indicators: List[str]) -> list:
+    # [(sütun, bağımlılıklar, hesap)]; sıra calculate_* zincirinin sütun sırası.
+    # AI takma adlarında hesap yerine kaynak sütunun adı durur.
+    selected = [name for name in _INDICATORS if name in selected_indicators]
+    outputs = []
+    for name in selected:
+        deps, columns = _INDICATORS[name]
+        outputs.extend((column, deps, compute) for column, compute in columns)
+    if "atr" in selected:
+        produced = {column for column, _, _ in outputs}
+        outputs += [(alias, (), source) for alias, source in _AI_ALIASES if source in produced]
+    return outputs
+
+
+def _evaluate(frame, outputs: list) -> list:
+    # frame: tek sembolün OHLCV tablosu ya da {alan: (zaman x sembol) tablo} paneli
+    values = {}
+    results = {}
+    for column, deps, compute in outputs:
+        if isinstance(compute, str):
+            results[column] = results[compute]
+            continue
+        for dep in deps:
+            _resolve(dep, frame, values)
+        results[column] = compute(frame, values)
+    return [results[column] for column, _, _ in outputs]
+
+
 # --- Master Fonksiyon ---
 
-def calculate_all_indicators(hist: pd.DataFrame, selected_indicators: List[str]) -> pd.DataFrame:
+def calculate_all_indicators(hist: pd.DataFrame, selected_indicators: List[str], inplace: bool = False) -> pd.DataFrame:
     if not selected_indicators:
         selected_indicators = ["sma", "ema", "rsi", "macd", "bollinger", "z_score"]
 
-    if "sma" in selected_indicators:
-        hist = calculate_sma(hist)
-    if "ema" in selected_indicators:
-        hist = calculate_ema(hist)
-    if "rsi" in selected_indicators:
-        hist = calculate_rsi(hist)
-    if "macd" in selected_indicators:
-        hist = calculate_macd(hist)
-    if "z_score" in selected_indicators:
-        hist = calculate_zscore(hist)
-    if "bollinger" in selected_indicators:
-        hist = calculate_bollinger(hist)
-    if "cci" in selected_indicators:
-        hist = calculate_cci(hist)
-    if "adx" in selected_indicators:
-        hist = calculate_adx(hist)
-    if "stochastic" in selected_indicators:
-        hist = calculate_stochastic(hist)
-    if "williams" in selected_indicators:
-        hist = calculate_williams_r(hist)
-    if "obv" in selected_indicators:
-        hist = calculate_obv(hist)
-    if "atr" in selected_indicators:
-        hist = calculate_atr(hist)
-        # AI modelinin beklediği özel süton isimleriyle eşle
-        if "SMA_20" in hist.columns:
-            hist["SMA_14"] = hist["SMA_20"]
-        if "MACD_signal" in hist.columns:
-            hist["Signal"] = hist["MACD_signal"]
-        if "Bollinger_Upper" in hist.columns:
-            hist["Upper_BB"] = hist["Bollinger_Upper"]
-        if "Bollinger_Lower" in hist.columns:
-            hist["Lower_BB"] = hist["Bollinger_Lower"]
-
-    return hist
+    outputs = _plan_outputs(selected_indicators)
+    if not outputs:
+        return hist
+
+    # Tüm çıktılar tek bir önceden ayrılmış blokta toplanır
+    names = [column for column, _, _ in outputs]
+    block = np.empty((len(hist), len(names)), dtype="float64")
+    for i, result in enumerate(_evaluate(hist, outputs)):
+        block[:, i] = np.asarray(result, dtype="float64")
+
+    if inplace:
+        hist[names] = block
+        return hist
+
+    out = pd.DataFrame(block, index=hist.index, columns=names)
+    overlap = hist.columns.intersection(names)
+    return pd.concat([hist.drop(columns=overlap) if len(overlap) else hist, out], axis=1)
 
 
 # --- Signal + Decision ---
 
-def extract_latest_values(hist: pd.DataFrame) -> dict:
-    available_cols = hist.columns
-    latest = hist.iloc[-1]
+def extract_latest_values(hist) -> dict:
+    # hist: gösterge tablosu ya da streaming_indicators.IndicatorState (son değerler)
+    if isinstance(hist, pd.DataFrame):
+        available_cols = hist.columns
+        latest = hist.iloc[-1]
+    else:
+        latest = hist.latest()
+        available_cols = latest.keys()
     field_map = {
         "Close": "close",
         "SMA_20": "sma",
@@ -188,6 +305,8 @@ def extract_latest_values(hist: pd.DataFrame) -> dict:
     return result
 
 def generate_signals(data):
+    if not isinstance(data, dict):
+        data = extract_latest_values(data)
     close = data.get("close")
     signals = {}
     if "macd" in data and "macd_signal" in data:
@@ -0,0 +1,355 @@
+import copy
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.market_data import OHLCV_COLUMNS
+
+NAN = float("nan")
+
+
+# Canlı bar akışı için artımlı göstergeler.
+# stock_analysis.calculate_all_indicators ile aynı sütun isimleri ve aynı tanımlar;
+# sembol başına yalnızca pencere kadar durum tutulur, her yeni bar O(1) ile işlenir
+# (CCI'nin ortalama sapması tanımı gereği O(pencere)).
+
+
+# --- Yapı taşları ---
+
+class _Window:
+    # Son n değerin ortalaması / örneklem std'si (Welford ekle-çıkar). NaN içeren pencere NaN verir.
+    __slots__ = ("n", "values", "nans", "count", "mean", "m2")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.values = deque()
+        self.nans = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, x: float):
+        self.values.append(x)
+        if math.isnan(x):
+            self.nans += 1
+        else:
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+        if len(self.values) > self.n:
+            self._pop(self.values.popleft())
+
+    def _pop(self, x: float):
+        if math.isnan(x):
+            self.nans -= 1
+            return
+        self.count -= 1
+        if self.count == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (x - self.mean), 0.0)
+
+    def clone(self) -> "_Window":
+        other = _Window.__new__(_Window)
+        other.n, other.nans, other.count, other.mean, other.m2 = self.n, self.nans, self.count, self.mean, self.m2
+        other.values = deque(self.values)
+        return other
+
+    def ready(self) -> bool:
+        return len(self.values) == self.n and self.nans == 0
+
+    def avg(self) -> float:
+        return self.mean if self.ready() else NAN
+
+    def std(self) -> float:
+        if not self.ready() or self.n < 2:
+            return NAN
+        return math.sqrt(self.m2 / (self.n - 1))
+
+    def mean_deviation(self) -> float:
+        if not self.ready():
+            return NAN
+        mean = sum(self.values) / self.n
+        return sum(abs(v - mean) for v in self.values) / self.n
+
+
+class _Extreme:
+    # Son n değerin max'ı (ya da min'i): monoton kuyruk, amortize O(1)
+    __slots__ = ("n", "sign", "seen", "candidates", "nan_positions")
+
+    def __init__(self, n: int, maximum: bool = True):
+        self.n = n
+        self.sign = 1.0 if maximum else -1.0
+        self.seen = 0
+        self.candidates = deque()
+        self.nan_positions = deque()
+
+    def push(self, x: float):
+        position = self.seen
+        self.seen += 1
+        if math.isnan(x):
+            self.nan_positions.append(position)
+        else:
+            key = self.sign * x
+            while self.candidates and self.candidates[-1][1] <= key:
+                self.candidates.pop()
+            self.candidates.append((position, key))
+        oldest = self.seen - self.n
+        while self.candidates and self.candidates[0][0] < oldest:
+            self.candidates.popleft()
+        while self.nan_positions and self.nan_positions[0] < oldest:
+            self.nan_positions.popleft()
+
+    def clone(self) -> "_Extreme":
+        other = _Extreme.__new__(_Extreme)
+        other.n, other.sign, other.seen = self.n, self.sign, self.seen
+        other.candidates = deque(self.candidates)
+        other.nan_positions = deque(self.nan_positions)
+        return other
+
+    def value(self) -> float:
+        if self.seen < self.n or self.nan_positions or not self.candidates:
+            return NAN
+        return self.sign * self.candidates[0][1]
+
+
+class _Ema:
+    # ewm(span, adjust=False): ilk geçerli değerle başlar
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = NAN
+
+    def clone(self) -> "_Ema":
+        other = _Ema.__new__(_Ema)
+        other.alpha, other.value = self.alpha, self.value
+        return other
+
+    def push(self, x: float) -> float:
+        if math.isnan(x):
+            return self.value
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+
+def _ratio(a: float, b: float) -> float:
+    # pandas bölme semantiği: x/0 -> ±inf, 0/0 -> NaN
+    if b == 0 or math.isnan(b):
+        if math.isnan(a) or math.isnan(b) or a == 0:
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+# --- Sembol başına durum ---
+
+class IndicatorState:
+    def __init__(self):
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.bars = 0
+        self.prev_close = NAN
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.obv = 0.0
+
+        self.close_20 = _Window(20)
+        self.ema_20 = _Ema(20)
+        self.ema_12 = _Ema(12)
+        self.ema_26 = _Ema(26)
+        self.macd_signal = _Ema(9)
+        self.gain_14 = _Window(14)
+        self.loss_14 = _Window(14)
+        self.true_range_14 = _Window(14)
+        self.bar_range_14 = _Window(14)
+        self.plus_dm_14 = _Window(14)
+        self.minus_dm_14 = _Window(14)
+        self.dx_14 = _Window(14)
+        self.high_14 = _Extreme(14, maximum=True)
+        self.low_14 = _Extreme(14, maximum=False)
+        self.stochastic_k_3 = _Window(3)
+        self.typical_price_20 = _Window(20)
+
+        self.values: Dict[str, float] = {}
+        # Aynı zaman damgalı bar (gün içi güncellenen son bar) gelirse geri dönülecek durum
+        self._before_last: Optional["IndicatorState"] = None
+
+    def update(
+        self, timestamp, open_: float, high: float, low: float, close: float, volume: float, revisable: bool = True
+    ) -> Dict[str, float]:
+        timestamp = pd.Timestamp(timestamp)
+        if self.last_timestamp is not None and timestamp == self.last_timestamp:
+            if self._before_last is None:
+                raise ValueError(f"Bar {timestamp} cannot be revised")
+            # Son barın revizyonu: önceki durumdan yeniden uygula
+            self.__dict__.update(vars(self._before_last))
+        elif self.last_timestamp is not None and timestamp < self.last_timestamp:
+            raise ValueError(f"Out-of-order bar {timestamp} (last {self.last_timestamp})")
+        # Revizyon için barın öncesi saklanır (O(pencere) kopya); geçmiş yüklenirken yalnızca son bar için
+        self._before_last = self._snapshot() if revisable else None
+        self._apply(timestamp, float(open_), float(high), float(low), float(close), float(volume))
+        return self.values
+
+    def _snapshot(self) -> "IndicatorState":
+        state = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, (_Window, _Extreme, _Ema)):
+                setattr(state, name, value.clone())
+        state.values = dict(self.values)
+        state._before_last = None
+        return state
+
+    def _apply(self, timestamp, open_, high, low, close, volume):
+        prev_close, prev_high, prev_low = self.prev_close, self.prev_high, self.prev_low
+        first = self.bars == 0
+
+        # Close tabanlı
+        self.close_20.push(close)
+        mean_20, std_20 = self.close_20.avg(), self.close_20.std()
+        ema_20 = self.ema_20.push(close)
+        macd = self.ema_12.push(close) - self.ema_26.push(close)
+        macd_signal = self.macd_signal.push(macd)
+
+        delta = NAN if first else close - prev_close
+        self.gain_14.push(delta if delta > 0 else 0.0)
+        self.loss_14.push(-delta if delta < 0 else 0.0)
+        rsi = 100 - 100 / (1 + _ratio(self.gain_14.avg(), self.loss_14.avg()))
+
+        if not first and not math.isnan(delta):
+            self.obv += math.copysign(1.0, delta) * volume if delta != 0 else 0.0
+
+        # Aralık tabanlı
+        high_low = high - low
+        if first:
+            true_range = high_low
+        else:
+            true_range = max(high_low, abs(high - prev_close), abs(low - prev_close))
+        self.true_range_14.push(true_range)
+        self.bar_range_14.push(max(high_low, abs(high - close), abs(low - close)))
+
+        up = NAN if first else high - prev_high
+        down = NAN if first else abs(low - prev_low)
+        plus_dm = up if (up > down and up > 0) else 0.0
+        minus_dm = down if (down > plus_dm and down > 0) else 0.0
+        self.plus_dm_14.push(plus_dm)
+        self.minus_dm_14.push(minus_dm)
+        adx_atr = self.bar_range_14.avg()
+        plus_di = 100 * _ratio(self.plus_dm_14.avg(), adx_atr)
+        minus_di = 100 * _ratio(self.minus_dm_14.avg(), adx_atr)
+        self.dx_14.push(_ratio(abs(plus_di - minus_di), plus_di + minus_di) * 100)
+
+        self.high_14.push(high)
+        self.low_14.push(low)
+        high_14, low_14 = self.high_14.value(), self.low_14.value()
+        stochastic_k = 100 * _ratio(close - low_14, high_14 - low_14)
+        self.stochastic_k_3.push(stochastic_k)
+
+        typical_price = (high + low + close) / 3
+        self.typical_price_20.push(typical_price)
+        cci = _ratio(typical_price - self.typical_price_20.avg(), 0.015 * self.typical_price_20.mean_deviation())
+
+        self.values = {
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Volume": volume,
+            "SMA_20": mean_20,
+            "EMA_20": ema_20,
+            "RSI_14": rsi,
+            "MACD": macd,
+            "MACD_signal": macd_signal,
+            "MACD_histogram": macd - macd_signal,
+            "Z_Score": _ratio(close - mean_20, std_20),
+            "Bollinger_Mid": mean_20,
+            "Bollinger_Upper": mean_20 + 2 * std_20,
+            "Bollinger_Lower": mean_20 - 2 * std_20,
+            "CCI": cci,
+            "ADX": self.dx_14.avg(),
+            "Stochastic_K": stochastic_k,
+            "Stochastic_D": self.stochastic_k_3.avg(),
+            "Williams_%R": -100 * _ratio(high_14 - close, high_14 - low_14),
+            "OBV": self.obv,
+            "ATR": self.true_range_14.avg(),
+        }
+
+        self.prev_close, self.prev_high, self.prev_low = close, high, low
+        self.last_timestamp = timestamp
+        self.bars += 1
+
+    def update_frame(self, bars: pd.DataFrame) -> Dict[str, float]:
+        ohlcv = bars.reindex(columns=OHLCV_COLUMNS).to_numpy(dtype="float64")
+        last = len(ohlcv) - 1
+        for i, (timestamp, row) in enumerate(zip(bars.index, ohlcv)):
+            self.update(timestamp, *row, revisable=i == last)
+        return self.values
+
+    def latest(self) -> Dict[str, float]:
+        # extract_latest_values / generate_signals bu sözlüğü DataFrame satırı gibi okur
+        return self.values
+
+    @classmethod
+    def from_history(cls, hist: pd.DataFrame) -> "IndicatorState":
+        state = cls()
+        state.update_frame(hist)
+        return state
+
+
+# (sembol, aralık) -> IndicatorState. Bar deposundan gelen tablo ile eşitlenir:
+# yalnızca son işlenen bardan sonraki (ve revize edilen son) barlar uygulanır.
+class StreamingIndicatorStore:
+    def __init__(self):
+        self._states: Dict[tuple, IndicatorState] = {}
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def _lock(self, key: tuple) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, symbol: str, interval: str = "1d") -> Optional[IndicatorState]:
+        return self._states.get((symbol.upper(), interval))
+
+    def sync(self, symbol: str, interval: str, hist: pd.DataFrame) -> Optional[IndicatorState]:
+        key = (symbol.upper(), interval)
+        if hist.empty:
+            return self._states.get(key)
+
+        with self._lock(key):
+            state = self._states.get(key)
+            index = hist.index
+            if state is None or state.last_timestamp is None or index[0] > state.last_timestamp:
+                # İlk kez ya da arada boşluk var: geçmişten baştan kur
+                state = IndicatorState.from_history(hist)
+            else:
+                start = int(np.searchsorted(index, state.last_timestamp, side="left"))
+                if start < len(index) and index[start] == state.last_timestamp:
+                    last = state.values
+                    row = hist.iloc[start]
+                    unchanged = all(last.get(c) == float(row[c]) for c in OHLCV_COLUMNS)
+                    if unchanged:
+                        start += 1
+                state.update_frame(hist.iloc[start:])
+            self._states[key] = state
+            return state
+
+    def clear(self):
+        with self._guard:
+            self._states.clear()
+
+    def stats(self) -> dict:
+        return {"symbols": len(self._states)}
+
+
+streaming_indicators = StreamingIndicatorStore()
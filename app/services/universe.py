@@ -0,0 +1,45 @@
+import threading
+from typing import List, Optional
+
+from app.database.database import SessionLocal
+from app.logging_config import get_logger
+from app.models.company import Company
+
+logger = get_logger(__name__)
+
+# Ekran tarayıcısı ve zamanlayıcının ortak sembol evreni: companies tablosu (sembol sırasıyla),
+# süreç başına bir kez okunur. Tablo boşsa listeleme dosyası doğrudan okunur.
+
+_lock = threading.Lock()
+_symbols: Optional[List[str]] = None
+
+
+def _load() -> List[str]:
+    db = SessionLocal()
+    try:
+        symbols = [symbol for (symbol,) in db.query(Company.symbol).order_by(Company.symbol)]
+    except Exception as e:
+        logger.warning(f"Could not read companies table: {e}")
+        symbols = []
+    finally:
+        db.close()
+    if not symbols:
+        from app.database.insert_companies import parse_listing
+        logger.warning("companies table is empty; reading the universe from the listing file")
+        symbols = sorted(symbol for symbol, _ in parse_listing())
+    return symbols
+
+
+def universe_symbols() -> List[str]:
+    global _symbols
+    if _symbols is None:
+        with _lock:
+            if _symbols is None:
+                _symbols = _load()
+    return _symbols
+
+
+def invalidate_universe():
+    global _symbols
+    with _lock:
+        _symbols = None
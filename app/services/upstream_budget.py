@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from app.config import settings
+from app.services.market_data import DataProvider
+from app.services.executors import RateLimited
+
+# Dış veri sağlayıcısına (yfinance) giden istekler için ortak bütçe.
+# Her çağrı sembol başına bir jeton ister; jetonlar saniyede rate kadar gelir, burst kadar birikebilir.
+# Bütçe yetmezse çağrı sırasını bekler (istekler zamana yayılır); kuyruk doluysa ya da bekleme
+# max_wait'i aşacaksa beklemeden RateLimited (429) döner.
+
+
+class UpstreamBudget:
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_queue: int = 64,
+        max_wait: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        # GCRA: kuyruğun teorik boşalma anı; şimdiden en fazla burst/rate ileride olabilir
+        self._tat = 0.0
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.granted = 0
+        self.rejected = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self, cost: float = 1.0):
+        with self._lock:
+            now = self.clock()
+            tat = max(self._tat, now) + cost / self.rate
+            wait = max(0.0, tat - self.burst / self.rate - now)
+            if wait > 0 and (self.waiting >= self.max_queue or wait > self.max_wait):
+                self.rejected += 1
+                raise RateLimited(wait, "upstream")
+            # Yer ayrılır; sonraki çağrılar bunun arkasına sıralanır
+            self._tat = tat
+            self.granted += 1
+            if wait > 0:
+                self.waiting += 1
+        if wait > 0:
+            try:
+                self.sleep(wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+                    self.waited_seconds += wait
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.waiting,
+            "granted": self.granted,
+            "rejected": self.rejected,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+class PacedProvider(DataProvider):
+    def __init__(self, provider: DataProvider, budget: UpstreamBudget):
+        self.provider = provider
+        self.budget = budget
+
+    def fetch(self, symbols: List[str], period="3mo", interval="1d", start: Optional[pd.Timestamp] = None,
+              end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        # Büyük gruplar burst'ü aşmayan parçalara bölünür; her parça kendi sırasını bekler
+        step = max(1, int(self.budget.burst))
+        frames = {}
+        for i in range(0, len(symbols), step):
+            chunk = symbols[i:i + step]
+            self.budget.acquire(len(chunk))
+            frames.update(self.provider.fetch(chunk, period=period, interval=interval, start=start, end=end))
+        return frames
+
+
+upstream_budget = UpstreamBudget(
+    rate=settings.upstream_requests_per_second,
+    burst=settings.upstream_burst,
+    max_queue=settings.upstream_max_queue,
+    max_wait=settings.upstream_max_wait,
+)
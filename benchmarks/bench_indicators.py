@@ -0,0 +1,119 @@
+# calculate_obv / calculate_adx / calculate_cci'yi eski (döngülü) sürümleriyle karşılaştırır.
+# Ağ erişimi gerektirmez: python -m benchmarks.bench_indicators
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services import indicators, stock_analysis
+from benchmarks.fixtures import synthetic_ohlcv
+
+TOLERANCE = 1e-6
+
+
+# --- Eski uygulamalar (referans) ---
+
+def legacy_obv(df):
+    obv = [0]
+    for i in range(1, len(df)):
+        if df["Close"].iloc[i] > df["Close"].iloc[i - 1]:
+            obv.append(obv[-1] + df["Volume"].iloc[i])
+        elif df["Close"].iloc[i] < df["Close"].iloc[i - 1]:
+            obv.append(obv[-1] - df["Volume"].iloc[i])
+        else:
+            obv.append(obv[-1])
+    return pd.Series(obv, index=df.index, dtype="float64")
+
+
+def legacy_adx(df, window=14):
+    tr = df[["High", "Low", "Close"]].apply(
+        lambda row: max(
+            row["High"] - row["Low"],
+            abs(row["High"] - row["Close"]),
+            abs(row["Low"] - row["Close"])
+        ), axis=1
+    )
+    plus_dm = df["High"].diff()
+    minus_dm = df["Low"].diff().abs()
+    plus_dm = plus_dm.where((plus_dm > minus_dm) & (plus_dm > 0), 0.0)
+    minus_dm = minus_dm.where((minus_dm > plus_dm) & (minus_dm > 0), 0.0)
+    atr = tr.rolling(window=window).mean()
+    plus_di = 100 * (plus_dm.rolling(window=window).mean() / atr)
+    minus_di = 100 * (minus_dm.rolling(window=window).mean() / atr)
+    dx = (abs(plus_di - minus_di) / (plus_di + minus_di)) * 100
+    return dx.rolling(window=window).mean()
+
+
+def legacy_cci(df, window=20):
+    tp = (df["High"] + df["Low"] + df["Close"]) / 3
+    ma = tp.rolling(window=window).mean()
+    md = tp.rolling(window=window).apply(lambda x: (abs(x - x.mean())).mean(), raw=True)
+    return (tp - ma) / (0.015 * md)
+
+
+# --- Yayındaki uygulamalar (gerilemeler burada görünsün diye doğrudan çağrılır) ---
+
+def shipped_obv(df):
+    return stock_analysis.calculate_obv(df)["OBV"]
+
+
+def shipped_adx(df):
+    return stock_analysis.calculate_adx(df)["ADX"]
+
+
+def shipped_cci(df):
+    return stock_analysis.calculate_cci(df)["CCI"]
+
+
+CASES = [
+    ("obv", legacy_obv, shipped_obv),
+    ("adx", legacy_adx, shipped_adx),
+    ("cci", legacy_cci, shipped_cci),
+]
+
+DATASETS = [
+    ("10y_daily", 2520, "B"),
+    ("1y_hourly", 252 * 7, "h"),
+]
+
+
+def best_of(fn, df, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(df)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def check_outputs(df: pd.DataFrame):
+    # Tam gösterge fonksiyonları da eski çıktılarla eşleşmeli
+    for name, legacy, shipped in CASES:
+        expected, actual = legacy(df), shipped(df)
+        diff = np.nanmax(np.abs(expected.to_numpy() - actual.to_numpy()) / np.maximum(1.0, np.abs(expected.to_numpy())))
+        assert diff <= TOLERANCE, f"{name}: max relative diff {diff}"
+        assert expected.isna().equals(actual.isna()), f"{name}: NaN positions differ"
+
+    full = indicators.add_technical_indicators(df)
+    assert np.allclose(full["OBV"], legacy_obv(df), rtol=TOLERANCE)
+
+
+def run():
+    results = []
+    for label, rows, freq in DATASETS:
+        df = synthetic_ohlcv(rows, freq)
+        check_outputs(df)
+        for name, legacy, shipped in CASES:
+            before = best_of(legacy, df, repeat=3)
+            after = best_of(shipped, df)
+            results.append((label, rows, name, before, after))
+
+    print(f"{'dataset':<12}{'rows':>7}  {'indicator':<20}{'legacy ms':>12}{'new ms':>10}{'speedup':>10}")
+    for label, rows, name, before, after in results:
+        print(f"{label:<12}{rows:>7}  {name:<20}{before * 1e3:>12.2f}{after * 1e3:>10.3f}{before / after:>9.0f}x")
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,35 @@
+# Deterministik sentetik OHLCV verisi (ağ erişimi yok); aynı seed her zaman aynı tabloyu üretir.
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_ohlcv(rows: int, freq: str = "B", seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    spread = np.abs(rng.normal(0, 0.01, rows)) * close
+    open_ = close * (1 + rng.normal(0, 0.003, rows))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Volume": rng.integers(100_000, 5_000_000, rows).astype("float64"),
+    }, index=pd.date_range("2015-01-01", periods=rows, freq=freq, name="Date"))
+
+
+def synthetic_universe(symbols: int, rows: int, freq: str = "B", seed: int = 0) -> Dict[str, pd.DataFrame]:
+    return {f"SYN{i:04d}": synthetic_ohlcv(rows, freq, seed + i) for i in range(symbols)}
+
+
+def plot_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # data_service.get_stock_data_for_plot çıktısıyla aynı biçim
+    df = df.tail(100).copy()
+    df["sma"] = df["Close"].rolling(window=20).mean()
+    df["std"] = df["Close"].rolling(window=20).std()
+    df["bollinger_upper"] = df["sma"] + 2 * df["std"]
+    df["bollinger_lower"] = df["sma"] - 2 * df["std"]
+    df = df.reset_index().rename(columns={"Date": "date", "Close": "close"})
+    return df[["date", "close", "sma", "bollinger_upper", "bollinger_lower"]]
@@ -0,0 +1,220 @@
+# Göstergeler, analiz hattı, model çıkarımı, grafik ve ekran tarayıcısı için çevrimdışı benchmark.
+# Sentetik (deterministik) veriyle çalışır, ağ erişimi gerektirmez. Sonuçlar JSON olarak yazılır
+# ve önceki bir sonuçla karşılaştırılabilir:
+#
+#   python -m benchmarks.suite --out bench.json
+#   python -m benchmarks.suite --compare bench.json --threshold 1.25   # yavaşlama varsa çıkış kodu 1
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from app.services import stock_analysis
+from app.services.indicators import add_technical_indicators
+from app.services.market_data import DataProvider
+from app.services.panel_indicators import latest_indicators
+from app.services.screener_engine import run_screen
+from benchmarks.fixtures import plot_frame, synthetic_ohlcv, synthetic_universe
+
+# Tek sembollük tablo boyutları (bar sayısı)
+SIZES = {
+    "small": 252,      # 1 yıl günlük
+    "medium": 2520,    # 10 yıl günlük
+    "large": 25200,    # ~15 yıl saatlik
+}
+
+# Ekran tarayıcısı: (sembol sayısı, bar sayısı)
+UNIVERSES = {
+    "small": (50, 120),
+    "medium": (500, 120),
+    "large": (3000, 120),
+}
+
+CALCULATE_FUNCTIONS = [
+    ("calculate_sma", stock_analysis.calculate_sma),
+    ("calculate_ema", stock_analysis.calculate_ema),
+    ("calculate_rsi", stock_analysis.calculate_rsi),
+    ("calculate_macd", stock_analysis.calculate_macd),
+    ("calculate_zscore", stock_analysis.calculate_zscore),
+    ("calculate_bollinger", stock_analysis.calculate_bollinger),
+    ("calculate_cci", stock_analysis.calculate_cci),
+    ("calculate_obv", stock_analysis.calculate_obv),
+    ("calculate_atr", stock_analysis.calculate_atr),
+    ("calculate_adx", stock_analysis.calculate_adx),
+    ("calculate_stochastic", stock_analysis.calculate_stochastic),
+    ("calculate_williams_r", stock_analysis.calculate_williams_r),
+]
+
+
+class FrameProvider(DataProvider):
+    # Bellekteki sentetik tabloları sağlayıcı gibi sunar (G/Ç yok, yalnızca tarama maliyeti ölçülür)
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.frames = frames
+
+    def fetch(self, symbols, period="3mo", interval="1d", start=None, end=None):
+        return {s: self.frames[s] for s in symbols if s in self.frames}
+
+
+def measure(fn: Callable, repeat: int, warmup: int = 1) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _train_model(path: str):
+    # Üretimdeki modelle aynı tip/boyutta, sentetik veriyle eğitilmiş orman
+    import joblib
+    from sklearn.ensemble import RandomForestClassifier
+    from app.ml.ai_utils import AI_FEATURES
+    from app.ml.training_pipeline import LABELS, featurize
+
+    parts = [featurize(synthetic_ohlcv(2520, "B", seed)) for seed in range(4)]
+    X = pd.DataFrame(np.concatenate([p[0] for p in parts]), columns=AI_FEATURES)
+    y = np.asarray(LABELS)[np.concatenate([p[1] for p in parts])]
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    model.fit(X, y)
+    joblib.dump(model, path)
+
+
+def build_cases(sizes: List[str], model_dir: str):
+    from app.ml import ai_utils
+    from app.plot.plot_utils import plot_stock_chart
+
+    model_path = os.path.join(model_dir, "bench_model.joblib")
+    _train_model(model_path)
+    ai_utils.MODEL_PATH = model_path
+
+    cases = []
+    for size in sizes:
+        rows = SIZES[size]
+        df = synthetic_ohlcv(rows, "B" if rows <= 2520 else "h")
+        for name, fn in CALCULATE_FUNCTIONS:
+            cases.append((name, size, rows, lambda fn=fn, df=df: fn(df)))
+        cases.append(("calculate_all_indicators", size, rows,
+                      lambda df=df: stock_analysis.calculate_all_indicators(df, stock_analysis.ALL_INDICATORS)))
+        cases.append(("add_technical_indicators", size, rows, lambda df=df: add_technical_indicators(df)))
+
+        featured = stock_analysis.calculate_all_indicators(df, stock_analysis.ALL_INDICATORS)
+        cases.append(("predict_ai_decision", size, rows, lambda featured=featured: ai_utils.predict_ai_decision(featured)))
+
+        plot_data = plot_frame(df)
+        cases.append(("plot_stock_chart", size, len(plot_data), lambda plot_data=plot_data: plot_stock_chart(plot_data, "SYN")))
+
+        symbols, bars = UNIVERSES[size]
+        universe = synthetic_universe(symbols, bars)
+        provider = FrameProvider(universe)
+        cases.append(("run_screen", size, symbols,
+                      lambda universe=universe, provider=provider: run_screen(list(universe), rsi_lt=50, provider=provider)))
+        cases.append(("latest_indicators_panel", size, symbols,
+                      lambda universe=universe: latest_indicators(universe, stock_analysis.ALL_INDICATORS)))
+
+        batch = {s: stock_analysis.calculate_all_indicators(f, stock_analysis.ALL_INDICATORS) for s, f in universe.items()}
+        cases.append(("predict_ai_decisions_batch", size, symbols, lambda batch=batch: ai_utils.predict_ai_decisions(batch)))
+    return cases
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(sizes: List[str], repeat: int, only: Optional[str] = None) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as model_dir:
+        for name, size, n, fn in build_cases(sizes, model_dir):
+            if only and only not in name:
+                continue
+            timings = measure(fn, repeat)
+            results.append({
+                "name": name,
+                "size": size,
+                "n": n,
+                "repeat": repeat,
+                "min_ms": round(min(timings) * 1e3, 4),
+                "median_ms": round(statistics.median(timings) * 1e3, 4),
+                "mean_ms": round(statistics.fmean(timings) * 1e3, 4),
+            })
+            print(f"{name:<30}{size:<8}{n:>7}{results[-1]['median_ms']:>12.3f} ms", flush=True)
+
+    return {
+        "commit": _git_commit(),
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sklearn": sklearn.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    # Medyan süre baseline'ın threshold katını aşan ölçümler
+    previous = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        base = previous.get((result["name"], result["size"]))
+        if base is None or base["median_ms"] <= 0:
+            continue
+        ratio = result["median_ms"] / base["median_ms"]
+        if ratio > threshold:
+            regressions.append({**result, "baseline_ms": base["median_ms"], "ratio": round(ratio, 2)})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline performance benchmarks")
+    parser.add_argument("--sizes", default="small,medium", help=f"Virgülle ayrılmış: {','.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Yalnızca adı bu metni içeren ölçümler")
+    parser.add_argument("--out", help="Sonuç JSON dosyası")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"Unknown sizes: {unknown}")
+
+    report = run(sizes, args.repeat, args.only)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['name']} [{r['size']}]: {r['baseline_ms']} ms -> {r['median_ms']} ms ({r['ratio']}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
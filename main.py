@@ -1,21 +1,27 @@
 from fastapi.middleware.cors import CORSMiddleware
 import sys
 import os
+import logging
 import threading
-import jwt
-from fastapi import FastAPI, Request, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
+import time
+from fastapi import FastAPI, Request, Depends, status
 from fastapi.openapi.utils import get_openapi
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 
 # Yol ayarı
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Config ve loglama
 from app.config import settings
-from app.logging_config import logger
-from app.auth.auth_service import authenticate_user, create_access_token
+from app.logging_config import access_logger, logger, stop_logging
+from app.auth.auth_service import get_current_user
 from app.services.scheduler import start_scheduler
+from app.services.executors import RateLimited, ServerBusy, run_io, shutdown_executors
+from app.services.company_search import company_index
+from app.plot.chart_renderer import shutdown_renderer
+from app.services.history_writer import history_writer
+from app.services.metrics import finish_request, request_duration, server_timing_header, start_request
 
 # App başlat
 app = FastAPI(
@@ -49,6 +55,7 @@ from app.routes.analyze_routes import router as analyze_router
 from app.routes.company_routes import router as company_router
 from app.routes.screener_routes import router as screener_router
 from app.routes.ai_routes import router as ai_router
+from app.routes.metrics_routes import router as metrics_router
 
 app.include_router(stock_router)
 app.include_router(auth_router)
@@ -59,6 +66,7 @@ app.include_router(analyze_router)
 app.include_router(company_router)
 app.include_router(screener_router)
 app.include_router(ai_router)
+app.include_router(metrics_router)
 
 # 🌐 Ana endpoint
 @app.get("/", tags=["General"])
@@ -67,17 +75,9 @@ def root():
     return {"message": f"{settings.app_name} is running."}
 
 # 🔐 Secure örnek
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", scheme_name="JWT")
-
 @app.get("/secure-data", tags=["Auth"])
-def secure_data(token: str = Depends(oauth2_scheme)):
-    try:
-        payload = jwt.decode(token, "very-secret-key", algorithms=["HS256"])
-        username = payload.get("sub")
-        role = payload.get("role")
-        return {"message": f"Hello {username}, your role is {role}."}
-    except jwt.PyJWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token.")
+async def secure_data(current_user: dict = Depends(get_current_user)):
+    return {"message": f"Hello {current_user['username']}, your role is {current_user['role']}."}
 
 # 🛡️ Swagger için token şeması
 def custom_openapi():
@@ -108,18 +108,78 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
-# 📄 Log middleware
+# 📄 Log middleware (örneklenir; hatalı ve yavaş istekler her zaman)
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"New request: {request.method} {request.url}")
+    started = time.perf_counter()
     response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
+    duration = time.perf_counter() - started
+    slow = duration >= settings.log_slow_request_seconds
+    access_logger.log(
+        logging.WARNING if response.status_code >= 500 or slow else logging.INFO,
+        "request",
+        extra={
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "duration_ms": round(duration * 1e3, 1),
+        },
+    )
+    return response
+
+# ⏱️ Aşama süreleri: Server-Timing başlığı + /metrics histogramları
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    token = start_request()
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        total = time.perf_counter() - started
+        timings = finish_request(token)
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        request_duration.observe(total, request.method, route, str(status_code))
+
+    if settings.server_timing_enabled:
+        response.headers["Server-Timing"] = server_timing_header(timings, total)
     return response
 
+# 🚦 Executor kuyruğu doluysa 503 + Retry-After
+@app.exception_handler(ServerBusy)
+async def server_busy_handler(request: Request, exc: ServerBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly."},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+# 🚦 Kullanıcı/global kota ya da dış sağlayıcı bütçesi aşıldı
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Rate limit exceeded, please retry later.", "scope": exc.scope},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # 📅 Scheduler başlat
 @app.on_event("startup")
 async def startup_event():
     threading.Thread(target=start_scheduler, daemon=True).start()
+    # Şirket arama indeksi ilk istekten önce kurulur (başarısız olursa ilk aramada tekrar denenir)
+    try:
+        await run_io(company_index.refresh)
+    except Exception as e:
+        logger.warning(f"Company search index could not be built at startup: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    history_writer.stop()
+    shutdown_executors()
+    shutdown_renderer()
+    stop_logging()
 
 # 📁 Static plots dizini
 if not os.path.exists("app/plots"):
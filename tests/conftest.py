@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (tablolar Base.metadata'ya kaydolur)
+from benchmarks.fixtures import synthetic_ohlcv
+from app.database.database import Base
+from app.services.market_data import LocalFixtureProvider
+
+
+FIXTURE_SYMBOLS = ["SYN0000", "SYN0001", "SYN0002"]
+
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    # Ağ erişimi yok; LocalFixtureProvider'ın okuduğu {symbol}.csv dosyaları sentetik veriden yazılır
+    for i, symbol in enumerate(FIXTURE_SYMBOLS):
+        synthetic_ohlcv(300, seed=i).to_csv(tmp_path / f"{symbol}.csv")
+    return tmp_path
+
+
+@pytest.fixture
+def fixture_provider(fixture_dir):
+    return LocalFixtureProvider(str(fixture_dir))
+
+
+class FakeClock:
+    # Saat ve uyku enjekte edilebilen sınıflar için; sleep saati ileri alır ve süreleri kaydeder
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def db(tmp_path):
+    # Her test kendi SQLite dosyasında; app/database/finance.db'ye dokunulmaz
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
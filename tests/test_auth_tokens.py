@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+
+from app.auth import auth_service, token_cache as token_cache_module, user_store
+from app.auth.token_cache import RevocationList, TokenCache, token_hash
+
+
+@pytest.fixture
+def auth(db, monkeypatch):
+    # Kullanıcılar ve iptal listesi test veritabanında; önbellekler her test için boş
+    factory = sessionmaker(bind=db.get_bind())
+    monkeypatch.setattr(user_store, "SessionLocal", factory)
+    monkeypatch.setattr(token_cache_module, "SessionLocal", factory)
+    monkeypatch.setattr(auth_service, "token_cache", TokenCache())
+    monkeypatch.setattr(auth_service, "revocations", RevocationList(sync_interval=0))
+    user_store.create_user("alp", "1234", role="premium")
+    return auth_service
+
+
+def _token(username="alp", role="premium"):
+    return auth_service.create_access_token({"sub": username, "role": role})
+
+
+def test_token_cache_hits_until_exp():
+    cache = TokenCache()
+    cache.put("live", {"sub": "alp", "exp": time.time() + 60})
+    cache.put("expired", {"sub": "alp", "exp": time.time() - 1})
+
+    assert cache.get("live")["sub"] == "alp"
+    assert cache.get("expired") is None
+    assert cache.get("missing") is None
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2}
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(max_entries=2)
+    cache.put("a", {"exp": time.time() + 60})
+    cache.put("b", {"exp": time.time() + 60})
+    cache.get("a")
+    cache.put("c", {"exp": time.time() + 60})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    cache.discard("a")
+    assert cache.get("a") is None
+
+
+def test_decode_token_verifies_signature_once(auth, monkeypatch):
+    token = _token()
+    calls = []
+    verify = auth.verify_token
+    monkeypatch.setattr(auth, "verify_token", lambda *args: calls.append(args) or verify(*args))
+
+    assert auth.decode_token(token)["sub"] == "alp"
+    assert auth.decode_token(token)["role"] == "premium"
+    assert len(calls) == 1
+    assert auth.token_cache.stats()["hits"] == 1
+
+
+def test_invalid_tokens_are_rejected_and_not_cached(auth):
+    forged = _token()[:-2] + "xx"
+    with pytest.raises(auth.InvalidToken):
+        auth.decode_token(forged)
+
+    # Silinmiş (hiç olmayan) kullanıcının token'ı
+    with pytest.raises(auth.InvalidToken):
+        auth.decode_token(_token(username="ghost"))
+    assert auth.token_cache.stats()["entries"] == 0
+
+
+def test_revoked_token_is_rejected_even_when_cached(auth):
+    token = _token()
+    auth.decode_token(token)
+
+    auth.revoke_token(token)
+
+    with pytest.raises(auth.InvalidToken):
+        auth.decode_token(token)
+    assert auth.decode_token(_token())["sub"] == "alp"
+
+
+def test_revocation_reaches_other_processes_on_sync(auth):
+    token = _token()
+    key = token_hash(token)
+    other = RevocationList(sync_interval=0)
+
+    auth.revoke_token(token)
+    assert not other.is_revoked(key)
+
+    other.sync()
+    assert other.is_revoked(key)
+    assert other.stats()["revoked"] == 1
+
+
+def test_get_current_user(auth):
+    token = _token()
+
+    assert asyncio.run(auth.get_current_user(token)) == {"username": "alp", "role": "premium"}
+
+    auth.revoke_token(token)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth.get_current_user(token))
+    assert exc.value.status_code == 401
@@ -0,0 +1,66 @@
+import pytest
+
+from app.services.company_search import CompanySearchIndex, normalize, trigrams
+
+COMPANIES = [
+    ("AAPL", "Apple Inc."),
+    ("AAPLX", "Apple Leveraged ETF"),
+    ("MSFT", "Microsoft Corporation"),
+    ("GOOGL", "Alphabet Inc."),
+    ("SGE", "Société Générale"),
+    ("APP", "AppLovin Corp"),
+    ("PINE", "Pineapple Holdings"),
+]
+
+
+@pytest.fixture
+def index():
+    return CompanySearchIndex(loader=lambda: COMPANIES)
+
+
+def _symbols(matches):
+    return [m["symbol"] for m in matches]
+
+
+def test_normalize_folds_case_accents_and_punctuation():
+    assert normalize("  Société-Générale, S.A. ") == "societe generale s a"
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_exact_symbol_ranks_first_then_shorter_symbols(index):
+    matches = index.search("aapl")
+
+    assert _symbols(matches) == ["AAPL", "AAPLX"]
+    assert matches[0]["score"] > matches[1]["score"]
+
+
+def test_name_prefix_outranks_substring_and_fuzzy(index):
+    assert _symbols(index.search("apple")) == ["AAPL", "AAPLX", "PINE", "APP"]
+
+
+def test_word_prefix_and_accent_insensitive_match(index):
+    assert _symbols(index.search("generale")) == ["SGE"]
+    assert _symbols(index.search("inc")) == ["AAPL", "GOOGL"]
+
+
+def test_fuzzy_match_tolerates_typos(index):
+    assert _symbols(index.search("Mikrosoft")) == ["MSFT"]
+    assert index.best_match("Alphabit")["symbol"] == "GOOGL"
+
+
+def test_limit_and_empty_queries(index):
+    assert len(index.search("apple", limit=2)) == 2
+    assert index.search("   ") == []
+    assert index.search("zzzz") == []
+    assert index.best_match("zzzz") is None
+
+
+def test_index_is_built_lazily_and_refreshed(index):
+    assert index.stats()["companies"] == 0
+
+    index.search("msft")
+    assert index.stats()["companies"] == len(COMPANIES)
+
+    index.refresh([("NEW", "Brand New Co")])
+    assert _symbols(index.search("brand")) == ["NEW"]
+    assert index.search("msft") == []
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import history_codec as codec
+
+
+def _round_trip(symbol: str, result: dict) -> dict:
+    # Veritabanı satırı yerine aynı alanlara sahip bir nesne
+    row = SimpleNamespace(symbol=symbol, **codec.encode_result(symbol, result))
+    return codec.decode_result(row)
+
+
+FULL_RESULT = {
+    "symbol": "AAPL",
+    "latest": {
+        "close": 190.5, "sma": 185.2, "ema": 186.0, "rsi": 61.3, "macd": 1.2, "macd_signal": 0.9,
+        "z_score": 0.4, "bollinger_upper": 195.0, "bollinger_lower": 175.4,
+    },
+    "signals": {"rsi": "hold", "macd": "buy"},
+    "final_decision": {"signal": "buy", "confidence": 0.72, "votes": {"buy": 5, "sell": 1}},
+    "ai": {"signal": "hold", "confidence": 0.55},
+}
+
+
+def test_full_result_round_trips():
+    assert _round_trip("AAPL", FULL_RESULT) == FULL_RESULT
+
+
+def test_typed_fields_go_to_columns():
+    encoded = codec.encode_result("AAPL", FULL_RESULT)
+
+    assert encoded["rsi"] == 61.3
+    assert encoded["decision"] == "buy"
+    assert encoded["ai_confidence"] == 0.55
+    assert codec.unpack(encoded["payload"]) == {
+        "signals": {"rsi": "hold", "macd": "buy"},
+        "final_decision": {"votes": {"buy": 5, "sell": 1}},
+    }
+
+
+@pytest.mark.parametrize("result", [
+    {"symbol": "MSFT", "latest": {"close": 300.0, "rsi": None, "note": "partial"}},
+    {"symbol": "MSFT", "latest": {"close": "n/a"}, "final_decision": {"confidence": 0.3}},
+    {"symbol": "MSFT", "final_decision": {"signal": "sell", "confidence": "high"}, "ai": None},
+    {"symbol": "msft", "error": "No data", "ai": {"error": "model missing"}},
+    {"symbol": "MSFT", "final_decision": {"signal": "hold"}},
+])
+def test_irregular_results_round_trip(result):
+    assert _round_trip("MSFT", result) == {"latest": {}, **result}
+
+
+def test_indicator_mask_round_trips_and_ignores_unknown_names():
+    mask = codec.encode_indicators(["rsi", "atr", "unknown", "sma"])
+
+    assert codec.decode_indicators(mask) == ["sma", "rsi", "atr"]
+    assert codec.decode_indicators(None) == []
+
+
+def test_unpack_rejects_unknown_format():
+    assert codec.unpack(None) == {}
+    with pytest.raises(ValueError):
+        codec.unpack(bytes([9]) + b"payload")
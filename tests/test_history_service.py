@@ -0,0 +1,77 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.models.analysis_history import AnalysisHistory
+from app.services.history_service import decode_cursor, encode_cursor, get_user_history, history_row
+
+START = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _add(db, username, symbol, created_at):
+    result = {"symbol": symbol, "final_decision": {"signal": "buy", "confidence": 0.6}}
+    db.add(AnalysisHistory(**history_row(username, symbol, ["rsi"], result, created_at=created_at)))
+
+
+@pytest.fixture
+def history(db):
+    # Son iki kayıt aynı zamanda; sıra id ile belirlenir
+    for i in range(5):
+        _add(db, "alp", "AAPL" if i % 2 else "MSFT", START + timedelta(hours=i))
+    _add(db, "alp", "AAPL", START + timedelta(hours=4))
+    _add(db, "demo", "AAPL", START + timedelta(hours=2))
+    db.commit()
+    return db
+
+
+def _all_pages(db, limit, **filters):
+    pages, cursor = [], None
+    while True:
+        records, cursor = get_user_history(db, "alp", limit=limit, fields=["id", "symbol", "created_at"],
+                                           cursor=cursor, **filters)
+        pages.append(records)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trips():
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42)
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_pages_cover_every_record_once(history):
+    pages = _all_pages(history, limit=2)
+
+    assert [len(p) for p in pages] == [2, 2, 2]
+    ids = [r["id"] for page in pages for r in page]
+    assert ids == [6, 5, 4, 3, 2, 1]
+
+
+def test_keyset_page_boundary_on_equal_timestamps(history):
+    first, cursor = get_user_history(history, "alp", limit=1, fields=["id"])
+    second, _ = get_user_history(history, "alp", limit=1, fields=["id"], cursor=cursor)
+
+    assert [first[0]["id"], second[0]["id"]] == [6, 5]
+
+
+def test_filters_apply_across_pages(history):
+    pages = _all_pages(history, limit=1, symbol="aapl")
+    assert [r["symbol"] for page in pages for r in page] == ["AAPL", "AAPL", "AAPL"]
+
+    records, cursor = get_user_history(history, "alp", fields=["id"], start_date=date(2026, 1, 1),
+                                       end_date=date(2026, 1, 1))
+    assert len(records) == 6 and cursor is None
+    records, _ = get_user_history(history, "alp", fields=["id"], start_date=date(2026, 1, 2))
+    assert records == []
+
+
+def test_fields_are_projected(history):
+    records, _ = get_user_history(history, "alp", limit=1, fields=["symbol", "indicators", "decision"])
+
+    assert records == [{"symbol": "AAPL", "indicators": "rsi", "decision": {"signal": "buy", "confidence": 0.6}}]
+    with pytest.raises(ValueError):
+        get_user_history(history, "alp", fields=["password"])
@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.database import insert_companies as loader
+from app.models.company import Company
+from app.models.data_import import DataImport
+
+HEADER = "Symbol,Name,LastSale\n"
+
+
+@pytest.fixture
+def listing(tmp_path):
+    path = tmp_path / "companylist.csv"
+    path.write_text(HEADER + "AAPL,Apple Inc.,1\nMSFT, Microsoft Corporation ,2\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def load(db, monkeypatch):
+    # insert_companies kendi oturumunu açar; test veritabanına yönlendirilir
+    monkeypatch.setattr(loader, "SessionLocal", sessionmaker(bind=db.get_bind()))
+
+    def run(path, force=False):
+        result = loader.insert_companies(str(path), force=force)
+        db.expire_all()
+        return result
+    return run
+
+
+def _companies(db):
+    return dict(db.query(Company.symbol, Company.name).order_by(Company.symbol).all())
+
+
+def test_parse_listing_strips_and_skips_duplicates(tmp_path):
+    path = tmp_path / "listing.csv"
+    path.write_text(HEADER + "AAPL,Apple Inc.,1\nAAPL,Apple Duplicate,1\n,No Symbol,1\nEMPTY,,1\n", encoding="utf-8")
+
+    assert loader.parse_listing(str(path)) == [("AAPL", "Apple Inc.")]
+
+
+def test_first_load_inserts_and_records_hash(db, load, listing):
+    result = load(listing)
+
+    assert result["status"] == "loaded" and result["rows"] == 2
+    assert _companies(db) == {"AAPL": "Apple Inc.", "MSFT": "Microsoft Corporation"}
+    record = db.get(DataImport, "companylist.csv")
+    assert record.content_hash == loader.file_hash(str(listing))
+    assert record.rows == 2
+
+
+def test_unchanged_listing_is_skipped(db, load, listing):
+    load(listing)
+    db.query(Company).filter(Company.symbol == "AAPL").update({"name": "Edited"})
+    db.commit()
+
+    assert load(listing) == {"source": "companylist.csv", "status": "unchanged", "rows": 2}
+    assert _companies(db)["AAPL"] == "Edited"
+
+    assert load(listing, force=True)["status"] == "loaded"
+    assert _companies(db)["AAPL"] == "Apple Inc."
+
+
+def test_changed_listing_is_upserted(db, load, listing):
+    load(listing)
+    listing.write_text(HEADER + "AAPL,Apple Inc. (New),1\nMSFT,Microsoft Corporation,2\nNVDA,NVIDIA Corp,3\n",
+                       encoding="utf-8")
+
+    result = load(listing)
+
+    assert result["rows"] == 3
+    assert _companies(db) == {
+        "AAPL": "Apple Inc. (New)",
+        "MSFT": "Microsoft Corporation",
+        "NVDA": "NVIDIA Corp",
+    }
+    assert db.query(Company).count() == 3
+
+
+def test_upsert_spans_multiple_chunks(db, load, listing, monkeypatch):
+    monkeypatch.setattr(loader, "CHUNK_SIZE", 2)
+    listing.write_text(HEADER + "".join(f"S{i:03d},Company {i},1\n" for i in range(7)), encoding="utf-8")
+
+    load(listing)
+
+    assert len(_companies(db)) == 7
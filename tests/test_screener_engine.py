@@ -0,0 +1,111 @@
+import threading
+import time
+
+from app.services.executors import RateLimited
+from app.services.market_data import DataProvider
+from app.services.screener_engine import run_screen
+from tests.conftest import FIXTURE_SYMBOLS
+
+
+class SlowProvider(DataProvider):
+    def __init__(self, inner, delay):
+        self.inner = inner
+        self.delay = delay
+
+    def fetch(self, symbols, period="3mo", interval="1d", start=None, end=None):
+        time.sleep(self.delay)
+        return self.inner.fetch(symbols, period, interval, start, end)
+
+
+class ThrottledProvider(DataProvider):
+    # İlk `failures` çağrı bütçe hatası verir, sonrakiler asıl sağlayıcıya gider
+    def __init__(self, inner, failures, retry_after):
+        self.inner = inner
+        self.failures = failures
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def fetch(self, symbols, period="3mo", interval="1d", start=None, end=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RateLimited(self.retry_after, scope="upstream")
+        return self.inner.fetch(symbols, period, interval, start, end)
+
+
+def test_run_screen_returns_latest_indicators(fixture_provider):
+    report = run_screen(FIXTURE_SYMBOLS, provider=fixture_provider, batch_size=2)
+
+    assert report.scanned == 3
+    assert sorted(r["symbol"] for r in report.results) == FIXTURE_SYMBOLS
+    for row in report.results:
+        assert 0 <= row["rsi"] <= 100
+        assert row["close"] > 0
+    assert not report.skipped
+    assert report.retry_after is None
+
+
+def test_run_screen_applies_filters(fixture_provider):
+    everything = run_screen(FIXTURE_SYMBOLS, provider=fixture_provider)
+    # En düşük iki RSI'nın ortası: yalnızca en düşük RSI'lı sembol kalmalı
+    lowest = sorted(r["rsi"] for r in everything.results)
+    threshold = (lowest[0] + lowest[1]) / 2
+
+    report = run_screen(FIXTURE_SYMBOLS, rsi_lt=threshold, provider=fixture_provider)
+
+    assert [r["symbol"] for r in report.results] == [
+        r["symbol"] for r in everything.results if r["rsi"] < threshold
+    ]
+    assert len(report.results) == 1
+
+
+def test_run_screen_counts_missing_symbols_as_no_data(fixture_provider):
+    report = run_screen(FIXTURE_SYMBOLS + ["MISSING"], provider=fixture_provider)
+
+    assert len(report.results) == 3
+    assert report.skipped == {"no_data": 1}
+    assert report.to_dict()["skipped"] == 1
+
+
+def test_run_screen_deadline_returns_partial_report(fixture_provider):
+    provider = SlowProvider(fixture_provider, delay=1.0)
+
+    started = time.monotonic()
+    report = run_screen(FIXTURE_SYMBOLS, provider=provider, deadline=0.2)
+
+    assert time.monotonic() - started < 1.0
+    assert report.timed_out
+    assert report.results == []
+    assert report.skipped == {"deadline": 3}
+
+
+def test_run_screen_cancelled(fixture_provider):
+    cancel = threading.Event()
+    cancel.set()
+
+    report = run_screen(FIXTURE_SYMBOLS, provider=SlowProvider(fixture_provider, 0.5), cancel_event=cancel)
+
+    assert report.cancelled
+    assert report.results == []
+    assert report.skipped == {"cancelled": 3}
+
+
+def test_run_screen_reports_rate_limited_batches(fixture_provider):
+    provider = ThrottledProvider(fixture_provider, failures=10, retry_after=30)
+
+    report = run_screen(FIXTURE_SYMBOLS, provider=provider, batch_size=2, deadline=0.3)
+
+    assert report.timed_out
+    assert report.skipped == {"rate_limited": 3}
+    assert 29 <= report.retry_after <= 30
+    assert report.to_dict()["retry_after"] == report.retry_after
+
+
+def test_run_screen_retries_throttled_batch(fixture_provider):
+    provider = ThrottledProvider(fixture_provider, failures=1, retry_after=0.1)
+
+    report = run_screen(FIXTURE_SYMBOLS, provider=provider, deadline=5)
+
+    assert provider.calls == 2
+    assert len(report.results) == 3
+    assert not report.skipped
+    assert report.retry_after is None
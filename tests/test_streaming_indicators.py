@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import synthetic_ohlcv
+from app.services.history_codec import INDICATOR_BITS
+from app.services.stock_analysis import calculate_all_indicators
+from app.services.streaming_indicators import IndicatorState, StreamingIndicatorStore
+
+
+@pytest.fixture(scope="module")
+def hist():
+    return synthetic_ohlcv(300, seed=7)
+
+
+@pytest.fixture(scope="module")
+def batch(hist):
+    return calculate_all_indicators(hist.copy(), list(INDICATOR_BITS))
+
+
+def _assert_matches(values: dict, row: pd.Series):
+    columns = list(values)
+    np.testing.assert_allclose(
+        [values[c] for c in columns], row[columns].to_numpy(dtype="float64"), rtol=1e-9, atol=1e-9, equal_nan=True
+    )
+
+
+def test_streaming_matches_batch_on_every_bar(hist, batch):
+    state = IndicatorState()
+
+    for timestamp, row in hist.iterrows():
+        values = state.update(timestamp, *row.to_numpy())
+        _assert_matches(values, batch.loc[timestamp])
+
+    assert state.bars == len(hist)
+
+
+def test_revised_last_bar_matches_batch(hist):
+    state = IndicatorState.from_history(hist.iloc[:-1])
+    last = hist.index[-1]
+    state.update(last, *hist.iloc[-1].to_numpy())
+
+    # Gün içi güncelleme: aynı zaman damgalı bar yeni fiyatlarla tekrar gelir
+    revised = hist.copy()
+    revised.loc[last, ["High", "Close"]] = revised.loc[last, "High"] * 1.05
+    values = state.update(last, *revised.iloc[-1].to_numpy())
+
+    expected = calculate_all_indicators(revised.copy(), list(INDICATOR_BITS))
+    _assert_matches(values, expected.iloc[-1])
+    assert state.bars == len(hist)
+
+
+def test_out_of_order_and_unrevisable_bars_are_rejected(hist):
+    state = IndicatorState.from_history(hist.iloc[:50])
+
+    with pytest.raises(ValueError):
+        state.update(hist.index[10], *hist.iloc[10].to_numpy())
+
+    state.update(hist.index[50], *hist.iloc[50].to_numpy(), revisable=False)
+    with pytest.raises(ValueError):
+        state.update(hist.index[50], *hist.iloc[50].to_numpy())
+
+
+def test_store_sync_applies_only_new_bars(hist, batch):
+    store = StreamingIndicatorStore()
+    first = store.sync("syn", "1d", hist.iloc[:200])
+    bars_before = first.bars
+
+    state = store.sync("SYN", "1d", hist.iloc[150:])
+
+    assert state is first
+    assert state.bars - bars_before == 100
+    _assert_matches(state.latest(), batch.iloc[-1])
+    assert store.stats() == {"symbols": 1}
+
+
+def test_store_rebuilds_after_gap(hist):
+    store = StreamingIndicatorStore()
+    store.sync("SYN", "1d", hist.iloc[:100])
+
+    state = store.sync("SYN", "1d", hist.iloc[120:])
+
+    assert state.bars == len(hist) - 120
+    assert state.last_timestamp == hist.index[-1]
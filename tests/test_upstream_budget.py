@@ -0,0 +1,101 @@
+import pytest
+
+from app.services.executors import RateLimited
+from app.services.market_data import DataProvider
+from app.services.upstream_budget import PacedProvider, UpstreamBudget
+
+
+def _budget(clock, **kwargs):
+    return UpstreamBudget(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_burst_is_granted_without_waiting(clock):
+    budget = _budget(clock, rate=4, burst=4)
+
+    for _ in range(4):
+        budget.acquire()
+
+    assert clock.sleeps == []
+    assert budget.stats()["granted"] == 4
+
+
+def test_requests_beyond_burst_are_queued_in_order(clock):
+    budget = _budget(clock, rate=4, burst=4)
+    budget.acquire(4)
+
+    sleeps = []
+    budget.sleep = sleeps.append
+    budget.acquire()
+    budget.acquire()
+    budget.acquire(2)
+
+    # Saat ilerlemeden gelen çağrılar öncekilerin arkasına sıralanır
+    assert sleeps == [0.25, 0.5, 1.0]
+    assert budget.stats()["waited_seconds"] == 1.75
+
+
+def test_budget_refills_at_rate(clock):
+    budget = _budget(clock, rate=4, burst=4)
+    budget.acquire(4)
+
+    clock.advance(0.5)
+    budget.acquire(2)
+    assert clock.sleeps == []
+
+    budget.acquire()
+    assert clock.sleeps == [0.25]
+
+
+def test_wait_longer_than_max_wait_is_rejected(clock):
+    budget = _budget(clock, rate=4, burst=4, max_wait=1.0)
+    budget.acquire(4)
+
+    with pytest.raises(RateLimited) as exc:
+        budget.acquire(20)
+    assert exc.value.scope == "upstream"
+    assert exc.value.retry_after == 5
+
+    # Reddedilen çağrı yer ayırmaz
+    budget.acquire()
+    assert clock.sleeps == [0.25]
+    assert budget.stats()["rejected"] == 1
+
+
+def test_full_queue_is_rejected(clock):
+    budget = _budget(clock, rate=4, burst=1, max_queue=1)
+    budget.acquire()
+    errors = []
+
+    def sleep(seconds):
+        # İlk çağrı beklerken gelen ikinci çağrı kuyruğu dolu bulur
+        try:
+            budget.acquire()
+        except RateLimited as e:
+            errors.append(e)
+        clock.sleep(seconds)
+
+    budget.sleep = sleep
+    budget.acquire()
+
+    assert len(errors) == 1
+    assert budget.stats()["queue_depth"] == 0
+    assert budget.stats()["rejected"] == 1
+
+
+class RecordingProvider(DataProvider):
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, symbols, period="3mo", interval="1d", start=None, end=None):
+        self.calls.append(list(symbols))
+        return {}
+
+
+def test_paced_provider_splits_by_burst(clock):
+    inner = RecordingProvider()
+    provider = PacedProvider(inner, _budget(clock, rate=2, burst=2))
+
+    provider.fetch(["A", "B", "C", "D", "E"])
+
+    assert inner.calls == [["A", "B"], ["C", "D"], ["E"]]
+    assert clock.sleeps == [1.0, 0.5]